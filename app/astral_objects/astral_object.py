@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from app.transport.transport import RequestsTransport
+from .payload import RequestTemplate
+from .batch import send_many
 
 
 class AstralObject(ABC):
@@ -9,17 +12,38 @@ class AstralObject(ABC):
     abstract methods for posting and deleting objects. It also is
     provides a function to assure the correctness in form for
     the provided data for those methods.
+
+    Subclasses declare how they map to the API once, through class attributes:
+
+    Attributes:
+        endpoint (str): The API endpoint of the object (e.g. 'soloons').
+        attribute (str or None): The name of the attribute carried by the object
+            (e.g. 'color'), None if it has none.
+        values (list): The allowed values of the attribute.
+        map_type (int): The type of the object in the current map of the API.
+        depends_on (tuple): Lowercase names of the objects that must be adjacent
+            to this one for it to be placed.
     """
 
-    def __init__(self, candidate_id):
+    endpoint = None
+    attribute = None
+    values = []
+    map_type = None
+    depends_on = ()
+
+    def __init__(self, candidate_id, transport=None):
         """
         Initialize an AstralObject instance.
 
         Args:
             candidate_id (str): The unique identifier for the crossmint's candidate.
+            transport (Transport, optional): How requests are sent to the API.
+                Defaults to a `RequestsTransport`.
         """
         self.name = "AstralObject"
         self.candidate_id = candidate_id
+        self.transport = transport or RequestsTransport()
+        self._templates = {}
 
     @abstractmethod
     def post(self, rows_columns_tuple):
@@ -74,3 +98,88 @@ class AstralObject(ABC):
             assert (
                 item[-1] in in_list
             ), f"The last argument of the tuple {item} must be one of {in_list}."
+
+    def template(self, action):
+        """
+        Return the request template of an action, building it on first use.
+
+        Args:
+            action (str): Either 'post' or 'delete'.
+
+        Returns:
+            RequestTemplate: The template of the action for this candidate.
+        """
+        template = self._templates.get(action)
+        if template is None:
+            template = RequestTemplate(type(self), action, self.candidate_id)
+            self._templates[action] = template
+        return template
+
+    def validate_batch(self, items, action="post"):
+        """
+        Validate every tuple of a batch before sending any of them.
+
+        Args:
+            items (iterable): The tuples that will be passed to `post` or `delete`.
+            action (str, optional): Either 'post' or 'delete'.
+
+        Raises:
+            AssertionError: If any tuple is invalid, listing the first ones.
+        """
+        self.template(action).validate(items)
+
+    def send_prepared(self, template, body):
+        """
+        Send a request built from a template, skipping validation and encoding.
+
+        Args:
+            template (RequestTemplate): The template the body was built with.
+            body (bytes): The encoded JSON body, from `template.body`.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails with an HTTP error.
+        """
+        response = self.transport.send(template.method, template.url, body)
+        response.raise_for_status()
+        return response
+
+    def post_many(self, items, concurrency=1, max_retries=5, backoff=1.0):
+        """
+        Post a batch of objects, reporting the outcome of each instead of raising.
+
+        Args:
+            items (iterable): The tuples, as passed to `post`. Generators are
+                consumed lazily.
+            concurrency (int, optional): Maximum number of requests in flight at once.
+            max_retries (int, optional): Maximun number of tries per item.
+            backoff (float, optional): Base of the backoff after a 429, in seconds.
+
+        Returns:
+            BatchResult: The success, status, attempts and latency of every item.
+
+        Raises:
+            AssertionError: If a list or tuple of items holds invalid ones.
+        """
+        return send_many(self, "post", items, concurrency, max_retries, backoff)
+
+    def delete_many(self, items, concurrency=1, max_retries=5, backoff=1.0):
+        """
+        Delete a batch of objects, reporting the outcome of each instead of raising.
+
+        Args:
+            items (iterable): The (row, column) tuples, as passed to `delete`.
+                Generators are consumed lazily.
+            concurrency (int, optional): Maximum number of requests in flight at once.
+            max_retries (int, optional): Maximun number of tries per item.
+            backoff (float, optional): Base of the backoff after a 429, in seconds.
+
+        Returns:
+            BatchResult: The success, status, attempts and latency of every item.
+
+        Raises:
+            AssertionError: If a list or tuple of items holds invalid ones.
+        """
+        return send_many(self, "delete", items, concurrency, max_retries, backoff)
@@ -0,0 +1,154 @@
+import time
+import logging
+
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+logger = logging.getLogger(__name__)
+
+
+class ItemResult(
+    namedtuple("ItemResult", ["success", "status", "attempts", "latency"])
+):
+    """
+    The outcome of one item of a batch.
+
+    Attributes:
+        success (bool): Whether the API accepted the request.
+        status (int or None): The HTTP status of the last response, None if
+            no response was received (invalid item or connection error).
+        attempts (int): Number of requests sent, 0 for an invalid item.
+        latency (float): Time spent on the item, retries included, in seconds.
+    """
+
+    __slots__ = ()
+
+
+class BatchResult:
+    """
+    The outcome of every item of a batch, in the order of the items.
+
+    Outcomes are stored in typed arrays (a few bytes per item) rather than
+    one object per item; indexing returns an `ItemResult`.
+    """
+
+    def __init__(self):
+        self.success = array("b")
+        self.status = array("H")
+        self.attempts = array("H")
+        self.latency = array("f")
+
+    def __len__(self):
+        return len(self.success)
+
+    def __getitem__(self, index):
+        status = self.status[index]
+        return ItemResult(
+            bool(self.success[index]),
+            status or None,
+            self.attempts[index],
+            self.latency[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def succeeded(self):
+        """
+        int: Number of items accepted by the API.
+        """
+        return sum(self.success)
+
+    def failures(self):
+        """
+        Return the positions of the items that failed.
+
+        Returns:
+            list: Indexes of the failed items, in the order of the batch.
+        """
+        return [index for index, success in enumerate(self.success) if not success]
+
+    def _add(self):
+        self.success.append(0)
+        self.status.append(0)
+        self.attempts.append(0)
+        self.latency.append(0.0)
+        return len(self.success) - 1
+
+    def _set(self, index, success, status, attempts, latency):
+        self.success[index] = success
+        self.status[index] = status or 0
+        self.attempts[index] = attempts
+        self.latency[index] = latency
+
+
+def send_many(instance, action, items, concurrency=1, max_retries=5, backoff=1.0):
+    """
+    Send one request per item of a batch through the transport of an astral object.
+
+    A batch given as a sequence is validated as a whole before anything is
+    sent. Other iterables, such as generators, are consumed lazily, with at
+    most twice `concurrency` items pending, and their invalid items are
+    reported as failures without being sent. Requests answered with 429 are
+    retried after `backoff * 2**attempt` seconds; any other error fails the item.
+
+    Args:
+        instance (AstralObject): The astral object sending the requests.
+        action (str): Either 'post' or 'delete'.
+        items (iterable): The tuples, as passed to `post` or `delete`.
+        concurrency (int, optional): Maximum number of requests in flight at once.
+        max_retries (int, optional): Maximun number of tries per item.
+        backoff (float, optional): Base of the exponential backoff, in seconds.
+
+    Returns:
+        BatchResult: The outcome of every item.
+
+    Raises:
+        AssertionError: If a sequence of items holds invalid ones.
+    """
+    template = instance.template(action)
+    if isinstance(items, Sequence):
+        template.validate(items)
+    result = BatchResult()
+
+    def run(index, item):
+        started = time.monotonic()
+        if not template.is_valid(item):
+            logger.error(f"Invalid item {item} for {action} on {template.url}")
+            result._set(index, False, None, 0, 0.0)
+            return
+        body = template.body(*item)
+        status = None
+        attempts = 0
+        for attempt in range(max_retries):
+            attempts += 1
+            try:
+                response = instance.transport.send(template.method, template.url, body)
+                status = response.status_code
+            except Exception as e:
+                logger.error(f"Could not {action} {item}: {e}")
+                status = None
+                break
+            if status != 429 or attempt == max_retries - 1:
+                break
+            time.sleep(backoff * 2**attempt)
+        success = status is not None and status < 400
+        result._set(index, success, status, attempts, time.monotonic() - started)
+
+    if concurrency <= 1:
+        for item in items:
+            run(result._add(), item)
+        return result
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= 2 * concurrency:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.add(pool.submit(run, result._add(), item))
+    return result
@@ -1,5 +1,6 @@
 import requests
 from .astral_object import AstralObject
+from app.transport.transport import api_url
 
 
 class Cometh(AstralObject):
@@ -11,15 +12,20 @@ class Cometh(AstralObject):
     """
 
     directions = ["up", "down", "right", "left"]
+    endpoint = "comeths"
+    attribute = "direction"
+    values = directions
+    map_type = 2
 
-    def __init__(self, candidate_id):
+    def __init__(self, candidate_id, transport=None):
         """
         Initialize a Cometh instance.
 
         Args:
             candidate_id (str): The unique identifier for the crossmint's candidate.
+            transport (Transport, optional): How requests are sent to the API.
         """
-        super().__init__(candidate_id)
+        super().__init__(candidate_id, transport)
         self.name = "Cometh"
 
     def post(self, rows_columns_tuple):
@@ -38,8 +44,7 @@ class Cometh(AstralObject):
             Exception: If any other unexpected error occurs.
         """
         self.check_tuples(rows_columns_tuple, 3, self.directions)
-        url = "https://challenge.crossmint.io/api/comeths"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
@@ -47,7 +52,7 @@ class Cometh(AstralObject):
             "direction": rows_columns_tuple[2],
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.transport.request("post", url, payload)
         try:
             response.raise_for_status()
             print("Success")
@@ -73,15 +78,14 @@ class Cometh(AstralObject):
         """
         # self.check_tuples(rows_columns_tuple, 3, self.directions)
         self.check_tuples(rows_columns_tuple, 2)
-        url = "https://challenge.crossmint.io/api/comeths"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
             "column": rows_columns_tuple[1],
         }
 
-        response = requests.delete(url, json=payload, headers=headers)
+        response = self.transport.request("delete", url, payload)
         try:
             response.raise_for_status()  # Raises HTTPError for bad responses
             print("Success")
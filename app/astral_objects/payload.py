@@ -0,0 +1,112 @@
+import json
+
+from app.transport.transport import api_url
+
+
+class RequestTemplate:
+    """
+    A precomputed request for one action on one astral object type.
+
+    The URL and the encoded JSON body are built once per endpoint and per
+    attribute value, leaving only the row and column to be formatted into
+    the body of each request. Bodies are byte-for-byte what `post` and
+    `delete` send, without building a payload dictionary or encoding it.
+    """
+
+    def __init__(self, cls, action, candidate_id):
+        """
+        Initializes a RequestTemplate instance.
+
+        Args:
+            cls (type): The AstralObject subclass of the requests.
+            action (str): Either 'post' or 'delete'.
+            candidate_id (str): The unique identifier for the crossmint's candidate.
+        """
+        self.method = action
+        self.url = api_url(cls.endpoint)
+        self.attribute = cls.attribute if action == "post" else None
+        self.values = list(cls.values) if self.attribute else []
+        self.length = 3 if self.attribute else 2
+
+        prefix = '{"candidateId": %s, "row": ' % json.dumps(candidate_id)
+        prefix = prefix.replace("%", "%%") + '%d, "column": %d'
+        if self.attribute:
+            self.templates = {
+                value: (
+                    prefix
+                    + f', "{self.attribute}": {json.dumps(value).replace("%", "%%")}}}'
+                ).encode()
+                for value in self.values
+            }
+        else:
+            self.templates = {None: (prefix + "}").encode()}
+        self.allowed = frozenset(self.templates)
+
+    def body(self, row, column, value=None):
+        """
+        Encode the JSON body of a request.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            value (str, optional): The attribute of the object, for posts of
+                objects carrying one.
+
+        Returns:
+            bytes: The encoded JSON body.
+
+        Raises:
+            AssertionError: If the row or column is not an integer, or the value
+                is not one of the allowed values.
+        """
+        if type(row) is not int or type(column) is not int:
+            raise AssertionError(
+                f"The row and column of the tuple {(row, column, value)[:self.length]} must be integers."
+            )
+        try:
+            template = self.templates[value]
+        except KeyError:
+            raise AssertionError(
+                f"The last argument of the tuple {(row, column, value)} must be one of {self.values}."
+            )
+        return template % (row, column)
+
+    def is_valid(self, item):
+        """
+        Check a single tuple.
+
+        Args:
+            item (tuple): The tuple to check, as passed to `post` or `delete`.
+
+        Returns:
+            bool: Whether a body can be built from the tuple.
+        """
+        return (
+            type(item) is tuple
+            and len(item) == self.length
+            and type(item[0]) is int
+            and type(item[1]) is int
+            and (self.length == 2 or item[2] in self.allowed)
+        )
+
+    def validate(self, items):
+        """
+        Validate a whole batch of tuples before any request is sent.
+
+        Args:
+            items (iterable): The tuples to validate, as passed to `post` or `delete`.
+
+        Raises:
+            AssertionError: If any tuple is not a tuple of integers (and, for
+                objects carrying an attribute, an allowed value) of the right length.
+                The message counts the invalid tuples and shows the first ones.
+        """
+        is_valid = self.is_valid
+        invalid = [item for item in items if not is_valid(item)]
+        if invalid:
+            expected = f"({', '.join(['row', 'column', self.attribute][:self.length])})"
+            raise AssertionError(
+                f"{len(invalid)} invalid tuples, expected {expected}"
+                + (f" with {self.attribute} in {self.values}" if self.attribute else "")
+                + f": {invalid[:5]}"
+            )
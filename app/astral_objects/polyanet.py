@@ -1,5 +1,6 @@
 import requests
 from .astral_object import AstralObject
+from app.transport.transport import api_url
 
 
 class Polyanet(AstralObject):
@@ -9,14 +10,18 @@ class Polyanet(AstralObject):
     A Polyanet can be posted or deleted.
     """
 
-    def __init__(self, candidate_id):
+    endpoint = "polyanets"
+    map_type = 0
+
+    def __init__(self, candidate_id, transport=None):
         """
         Initialize a Polyanet instance.
 
         Args:
             candidate_id (str): The unique identifier for the crossmint's candidate.
+            transport (Transport, optional): How requests are sent to the API.
         """
-        super().__init__(candidate_id)
+        super().__init__(candidate_id, transport)
         self.name = "Polyanet"
 
     def post(self, rows_columns_tuple):
@@ -34,15 +39,14 @@ class Polyanet(AstralObject):
             Exception: If any other unexpected error occurs.
         """
         self.check_tuples(rows_columns_tuple, 2)
-        url = "https://challenge.crossmint.io/api/polyanets"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
             "column": rows_columns_tuple[1],
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.transport.request("post", url, payload)
         try:
             response.raise_for_status()
             print("Success")
@@ -67,15 +71,14 @@ class Polyanet(AstralObject):
             Exception: If an unexpected error occurs.
         """
         self.check_tuples(rows_columns_tuple, 2)
-        url = "https://challenge.crossmint.io/api/polyanets"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
             "column": rows_columns_tuple[1],
         }
 
-        response = requests.delete(url, json=payload, headers=headers)
+        response = self.transport.request("delete", url, payload)
         try:
             response.raise_for_status()  # Raises HTTPError for bad responses
             print("Success")
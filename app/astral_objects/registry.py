@@ -0,0 +1,197 @@
+import importlib
+
+from collections import namedtuple
+
+
+SPACE = "SPACE"
+
+# Astral object types known to the application, as "module:Class" paths. A new
+# type is added by declaring its class (see `AstralObject`) and registering it
+# here; the classes are only imported when the registry is first used.
+DEFAULT_TYPES = (
+    "app.astral_objects.polyanet:Polyanet",
+    "app.astral_objects.soloon:Soloon",
+    "app.astral_objects.cometh:Cometh",
+)
+
+
+class OperationDescriptor(
+    namedtuple(
+        "OperationDescriptor",
+        ["token", "name", "cls", "endpoint", "field", "value", "code"],
+    )
+):
+    """
+    Everything needed to place the object described by one goal token.
+
+    Attributes:
+        token (str): The goal token (e.g. 'RED_SOLOON').
+        name (str): The lowercase class name of the object (e.g. 'soloon').
+        cls (type): The AstralObject subclass of the object.
+        endpoint (str): The API endpoint of the object (e.g. 'soloons').
+        field (str or None): The name of the attribute in the payload (e.g. 'color').
+        value (str or None): The value of the attribute (e.g. 'red').
+        code (int): A small integer identifying the token, 'SPACE' being 0.
+    """
+
+    __slots__ = ()
+
+    def args(self, row, column):
+        """
+        Build the tuple passed to the object's `post` method.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            tuple: (row, column, value), or (row, column) without attribute.
+        """
+        if self.value is None:
+            return (row, column)
+        return (row, column, self.value)
+
+
+class ObjectRegistry:
+    """
+    The registry of astral object types and of the goal tokens describing them.
+
+    Every registered type contributes its plain token (e.g. 'SOLOON') and one
+    token per allowed attribute value (e.g. 'RED_SOLOON'). All of them are
+    precomputed into a single table, so a goal token is resolved to a ready
+    to use `OperationDescriptor` with one dictionary lookup.
+    """
+
+    def __init__(self, class_paths=()):
+        """
+        Initializes an ObjectRegistry instance.
+
+        Args:
+            class_paths (iterable, optional): "module:Class" paths of the types to register.
+        """
+        self.class_paths = list(class_paths)
+        self._reset()
+
+    def register(self, class_path):
+        """
+        Register an astral object type.
+
+        Args:
+            class_path (str): The "module:Class" path of an AstralObject subclass.
+        """
+        self.class_paths.append(class_path)
+        self._reset()
+
+    @property
+    def types(self):
+        """
+        dict: The registered classes by lowercase class name, in registration order.
+        """
+        if self._types is None:
+            types = {}
+            for class_path in self.class_paths:
+                module, name = class_path.split(":")
+                cls = getattr(importlib.import_module(module), name)
+                types[cls.__name__.lower()] = cls
+            self._map_types = {cls.map_type: cls for cls in types.values()}
+            self._types = types
+        return self._types
+
+    @property
+    def tokens(self):
+        """
+        dict: Every valid goal token other than 'SPACE', mapped to its `OperationDescriptor`.
+        """
+        if self._tokens is None:
+            tokens = {}
+            for name, cls in self.types.items():
+                plain = name.upper()
+                values = [None] + list(cls.values if cls.attribute else [])
+                for value in values:
+                    token = f"{value.upper()}_{plain}" if value else plain
+                    tokens[token] = OperationDescriptor(
+                        token,
+                        name,
+                        cls,
+                        cls.endpoint,
+                        cls.attribute,
+                        value,
+                        len(tokens) + 1,
+                    )
+            self._tokens = tokens
+        return self._tokens
+
+    @property
+    def codes(self):
+        """
+        dict: Every valid goal token mapped to its integer code, 'SPACE' being 0.
+        """
+        if self._codes is None:
+            codes = {SPACE: 0}
+            codes.update(
+                {token: descriptor.code for token, descriptor in self.tokens.items()}
+            )
+            self._codes = codes
+        return self._codes
+
+    def descriptor(self, token):
+        """
+        Resolve a goal token.
+
+        Args:
+            token (str): A goal token such as 'POLYANET' or 'RED_SOLOON'.
+
+        Returns:
+            OperationDescriptor: The descriptor of the token.
+
+        Raises:
+            ValueError: If the token is 'SPACE' or unknown.
+        """
+        try:
+            return self.tokens[token]
+        except KeyError:
+            raise ValueError(f"No astral object for token {token}")
+
+    def map_cell_token(self, cell):
+        """
+        Translate a cell of the current map of the API into a goal token.
+
+        Args:
+            cell (dict or None): The cell, e.g. None or {'type': 1, 'color': 'blue'}.
+
+        Returns:
+            str: The matching goal token (e.g. 'SPACE', 'BLUE_SOLOON').
+
+        Raises:
+            ValueError: If the cell has an unknown object type.
+        """
+        if cell is None:
+            return SPACE
+        self.types  # Make sure the map types are loaded
+        cls = self._map_types.get(cell.get("type"))
+        if cls is None:
+            raise ValueError(f"Unknown object in current map: {cell}")
+        if cls.attribute and cell.get(cls.attribute):
+            return f"{cell[cls.attribute].upper()}_{cls.__name__.upper()}"
+        return cls.__name__.upper()
+
+    def dependencies(self):
+        """
+        Return the types other types depend on.
+
+        Returns:
+            set: Lowercase names of the types that must be placed before, and
+                removed after, the types depending on them.
+        """
+        return {
+            dependency for cls in self.types.values() for dependency in cls.depends_on
+        }
+
+    def _reset(self):
+        self._types = None
+        self._map_types = None
+        self._tokens = None
+        self._codes = None
+
+
+REGISTRY = ObjectRegistry(DEFAULT_TYPES)
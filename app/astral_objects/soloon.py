@@ -1,5 +1,6 @@
 import requests
 from .astral_object import AstralObject
+from app.transport.transport import api_url
 
 
 class Soloon(AstralObject):
@@ -11,15 +12,21 @@ class Soloon(AstralObject):
     """
 
     colors = ["blue", "red", "purple", "white"]
+    endpoint = "soloons"
+    attribute = "color"
+    values = colors
+    map_type = 1
+    depends_on = ("polyanet",)
 
-    def __init__(self, candidate_id):
+    def __init__(self, candidate_id, transport=None):
         """
         Initialize a Soloon instance.
 
         Args:
             candidate_id (str): The unique identifier for the crossmint's candidate.
+            transport (Transport, optional): How requests are sent to the API.
         """
-        super().__init__(candidate_id)
+        super().__init__(candidate_id, transport)
         self.name = "Soloon"
 
     def post(self, rows_columns_tuple):
@@ -38,8 +45,7 @@ class Soloon(AstralObject):
             Exception: If any other unexpected error occurs.
         """
         self.check_tuples(rows_columns_tuple, 3, self.colors)
-        url = "https://challenge.crossmint.io/api/soloons"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
@@ -47,7 +53,7 @@ class Soloon(AstralObject):
             "color": rows_columns_tuple[2],
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.transport.request("post", url, payload)
         try:
             response.raise_for_status()
             print("Success")
@@ -73,14 +79,13 @@ class Soloon(AstralObject):
             Exception: If an unexpected error occurs.
         """
         self.check_tuples(rows_columns_tuple, 2)
-        url = "https://challenge.crossmint.io/api/soloons"
-        headers = {"Content-Type": "application/json"}
+        url = api_url(self.endpoint)
         payload = {
             "candidateId": self.candidate_id,
             "row": rows_columns_tuple[0],
             "column": rows_columns_tuple[1],
         }
-        response = requests.delete(url, json=payload, headers=headers)
+        response = self.transport.request("delete", url, payload)
         try:
             response.raise_for_status()  # Raises HTTPError for bad responses
             print("Success")
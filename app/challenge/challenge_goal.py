@@ -1,41 +1,148 @@
 import os
-import time
+import json
 import logging
 import requests
+import numpy as np
 
 from dotenv import load_dotenv
 from .class_identifier import ClassIdentifier
+from app.astral_objects.registry import REGISTRY
+from app.transport.transport import RequestsTransport, api_url
+from . import megaverse_state
+from .metrics import RunMetrics
+from .planner import Plan
+from .executor import ExecutionReport, Operation, OperationExecutor
+from .pipeline import Pipeline, Stage, combine_stats
+from .deadline import DeadlineBudget
+from .lanes import Lane, LaneScheduler
 
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def plan_row(row_index, items, keep):
+    """
+    Plan the posts of one row of a goal map, the plan stage of a solve.
+
+    Args:
+        row_index (int): The index of the row.
+        items (list): The goal tokens of the row.
+        keep (callable): Whether the object of a descriptor is posted.
+
+    Yields:
+        Operation: A post for every kept astral object of the row, skipping
+            'SPACE' and unknown tokens.
+    """
+    tokens = REGISTRY.tokens
+    for col_index, item in enumerate(items):
+        descriptor = tokens.get(item)
+        if descriptor is not None and keep(descriptor):
+            yield Operation(
+                "post", descriptor.name, row_index, col_index, descriptor.value
+            )
+
+
 class ChallengeGoal:
     """
     A class to manage and solve the challenges provided by crossmint by interacting with a goal map.
 
     The `ChallengeGoal` class retrieves a goal map and identifies
-    and instantiates objects to solve the specified challenges. It includes
-    mechanisms for retrying API requests when rate-limited.
+    and instantiates objects to solve the specified challenges. Requests are
+    sent through an `OperationExecutor`, which bounds concurrency, limits the
+    request rate and retries requests when rate-limited.
+
+    Challenges are solved by a pipeline of stages running concurrently: the
+    goal source, planning the operations of every row, scheduling them on their
+    instances, executing them and recording their outcome. With a deadline, the
+    operations are planned cluster by cluster instead (see `Plan.clusters`) and
+    only the clusters that can finish in time are admitted. With lanes, every
+    endpoint is dispatched from its own queue by a `LaneScheduler`.
+
+    With a region, solving, verifying, converging and resetting only touch the
+    cells of that part of the megaverse (see `Region`).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrency=1,
+        rate_limit=None,
+        transport=None,
+        metrics=None,
+        trace=None,
+        queue_size=64,
+        deadline=None,
+        lanes=None,
+        region=None,
+    ):
         """
         Initializes a ChallengeGoal instance.
 
+        Args:
+            concurrency (int, optional): Maximum number of requests in flight at once.
+            rate_limit (float, optional): Maximum requests per second, None for unlimited.
+            transport (Transport, optional): How requests are sent to the API, shared
+                with the astral objects. Defaults to a `RequestsTransport`.
+            metrics (RunMetrics, optional): Where the run is recorded, shared with
+                the transport if needed. A new one is created when not given.
+            trace (TraceWriter, optional): Where every request sent is traced.
+            queue_size (int, optional): Maximum number of items waiting between two
+                stages of the solve pipeline.
+            deadline (float, optional): The `time.monotonic()` instant solves must
+                be finished by, None for no deadline.
+            lanes (list, optional): `Lane` settings of the endpoints. When given,
+                solves dispatch every endpoint from its own lane; endpoints without
+                settings get a lane with `concurrency` and no rate limit.
+            region (Region, optional): The part of the megaverse to work on, None
+                for all of it.
+
         Attributes:
             class_id (ClassIdentifier or None): The ClassIdentifier instance used for dynamic class discovery.
             classes (dict or None): A dictionary of discovered classes.
             goal_map (list or None): The retrieved goal map representing the challenge to solve.
+            current_map (list or None): The last retrieved content of the candidate's megaverse.
             candidate_id (str): Thecrossmint's candidate id loaded from the environment.
             initialized (dict): A dictionary of initialized objects by their class names.
+            transport (Transport): How requests are sent to the API.
+            metrics (RunMetrics): The request and operation counters of the run.
+            executor (OperationExecutor): Runs the post and delete operations.
+            stage_stats (list): The `StageStats` of the stages of the last solve.
+            lane_stats (dict): The `Lane.stats` of every lane of the last solve.
+            report (ExecutionReport or None): The outcome of the current or last
+                solve, updated as operations finish.
+            planned (int): Operations of the current or last solve planned so far.
+            total (int or None): Operations of the current or last solve in all,
+                None until its goal map is read.
+            solving (bool): Whether a solve is running, and may plan more operations.
+            repairs (ExecutionReport): The repairs of the last `converge`,
+                with those skipped at the deadline.
         """
         self.class_id = None
         self.classes = None
         self.goal_map = None
+        self.current_map = None
         self.candidate_id = os.getenv("CANDIDATE_ID")
         self.initialized = {}
+        self.transport = transport or RequestsTransport()
+        self.metrics = metrics or RunMetrics()
+        self.executor = OperationExecutor(
+            self._get_instance,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            metrics=self.metrics,
+            trace=trace,
+        )
+        self.queue_size = queue_size
+        self.deadline = deadline
+        self.lanes = lanes
+        self.region = region
+        self.stage_stats = []
+        self.lane_stats = {}
+        self.report = None
+        self.planned = 0
+        self.total = None
+        self.solving = False
+        self.repairs = ExecutionReport()
 
     def get_goal_map(self):
         """
@@ -50,9 +157,9 @@ class ChallengeGoal:
             requests.exceptions.HTTPError: If the HTTP request returns an error.
             Exception: For other issues that may occur during the request.
         """
-        url = f"https://challenge.crossmint.io/api/map/{self.candidate_id}/goal"
+        url = api_url(f"map/{self.candidate_id}/goal")
         try:
-            response = requests.get(url)
+            response = self.transport.request("get", url)
             response.raise_for_status()
 
             goal_map = response.json()
@@ -66,6 +173,483 @@ class ChallengeGoal:
             print("An error occurred:", err)
             raise
 
+    def load_goal_map(self, path):
+        """
+        Load the goal map from a JSON file instead of the external API.
+
+        The file may contain either the API response (an object with a 'goal' key)
+        or the goal map itself.
+
+        Args:
+            path (str): The JSON file to read.
+
+        Returns:
+            list: The loaded goal map.
+        """
+        with open(path) as file:
+            goal_map = json.load(file)
+        self.goal_map = goal_map["goal"] if isinstance(goal_map, dict) else goal_map
+        return self.goal_map
+
+    def get_current_map(self):
+        """
+        Retrieve the current state of the candidate's megaverse from the external API.
+
+        Returns:
+            list: The content of the current map, where every cell is either None
+                or a dict describing the object placed there.
+
+        Raises:
+            requests.exceptions.HTTPError: If the HTTP request returns an error.
+            Exception: For other issues that may occur during the request.
+        """
+        url = api_url(f"map/{self.candidate_id}")
+        try:
+            response = self.transport.request("get", url)
+            response.raise_for_status()
+
+            self.current_map = response.json()["map"]["content"]
+            return self.current_map
+        except requests.exceptions.HTTPError as err:
+            print("HTTP Error:", err)
+            raise
+        except Exception as err:
+            print("An error occurred:", err)
+            raise
+
+    def verify(self):
+        """
+        Compare the current megaverse against the goal map.
+
+        Fetches the current map and compares it with the goal map in a single
+        vectorized pass. With a region, only its cells are compared, along with
+        the objects just outside it that objects inside it depend on.
+
+        Returns:
+            list: A list of (row, column, expected, actual) tuples, one for every
+                cell whose current state does not match the goal.
+        """
+        content = self.get_current_map()
+        if self.region is None:
+            goal = megaverse_state.encode_tokens(self.goal_map)
+            pieces = [(0, 0, goal, megaverse_state.encode_current(content), None)]
+        else:
+            pieces = [
+                (
+                    window.top,
+                    window.left,
+                    goal,
+                    megaverse_state.encode_current(window.window(content)),
+                    inner | supports,
+                )
+                for window, goal, inner, supports in self.region.windows(self.goal_map)
+            ]
+        mismatched = []
+        for top, left, goal, current, cells in pieces:
+            for row, col in megaverse_state.mismatches(goal, current):
+                if cells is None or cells[row, col]:
+                    mismatched.append(
+                        (
+                            top + int(row),
+                            left + int(col),
+                            megaverse_state.decode(goal[row, col]),
+                            megaverse_state.decode(current[row, col]),
+                        )
+                    )
+        return mismatched
+
+    def converge(self, max_rounds=3, max_ret=5):
+        """
+        Repair the megaverse until it matches the goal map or the rounds run out.
+
+        Each round verifies the current state, logs the remaining mismatch count
+        and re-queues only the mismatched cells: wrong objects are deleted first and
+        missing ones are posted afterwards, polyanets before the objects that
+        depend on them. With a `deadline`, no round starts once it has passed,
+        repairs are only admitted while the live throughput says they can finish
+        in time and the state is not verified again after the deadline. The
+        repairs, including those skipped, are kept in `repairs`.
+
+        Args:
+            max_rounds (int, optional): Maximum number of repair rounds.
+            max_ret (int, optional): Maximun number of tries per request.
+
+        Returns:
+            list: The (row, column, expected, actual) tuples of the cells that still
+                do not match the goal. An empty list means the run converged.
+        """
+        budget = None
+        if self.deadline is not None:
+            budget = DeadlineBudget(self.deadline)
+        self.repairs = ExecutionReport()
+        remaining = self.verify()
+        logger.info(f"Verification: {len(remaining)} mismatched cells")
+        for round_number in range(1, max_rounds + 1):
+            if not remaining:
+                break
+            if budget is not None and budget.expired():
+                logger.warning(
+                    f"Deadline reached before convergence round {round_number}"
+                )
+                break
+            report = self._repair(remaining, max_ret, budget)
+            self.repairs.merge(report)
+            if budget is not None and (report.skipped or budget.expired()):
+                logger.warning(
+                    f"Deadline reached during convergence round {round_number}, "
+                    f"{len(report.skipped)} repairs skipped"
+                )
+                break
+            remaining = self.verify()
+            logger.info(
+                f"Convergence round {round_number}: {len(remaining)} mismatched cells remaining"
+            )
+        if remaining:
+            logger.error(f"Megaverse did not converge, stubborn cells: {remaining}")
+        return remaining
+
+    def reset(self, max_ret=5):
+        """
+        Delete every object of the candidate's megaverse.
+
+        Reads the current map and deletes only the occupied cells through the
+        operation executor: soloons and comeths first, then the polyanets they
+        depend on. With a region, only the objects inside it are deleted.
+
+        Args:
+            max_ret (int, optional): Maximun number of tries per request.
+
+        Returns:
+            ExecutionReport: The outcome of the deletes. Failed deletes are
+                reported instead of raised.
+        """
+        content = self.get_current_map()
+        if self.region is None:
+            pieces = [(0, 0, content, None)]
+        else:
+            rows = len(content)
+            columns = len(content[0]) if rows else 0
+            pieces = [
+                (rectangle.top, rectangle.left, rectangle.window(content), owned)
+                for rectangle, owned in self.region.pieces(rows, columns)
+            ]
+        occupied = []
+        for top, left, cells, owned in pieces:
+            current = megaverse_state.current_to_tokens(cells)
+            occupied += [
+                (top + row, left + col, token)
+                for row, col, token in self._cells(current)
+                if token != megaverse_state.SPACE and (owned is None or owned[row, col])
+            ]
+        report = self.executor.run_phases(
+            self._phases(occupied, "delete", dependencies_first=False), max_ret
+        )
+        logger.info(
+            f"Reset: deleted {report.succeeded} objects in {report.elapsed:.1f}s "
+            f"({report.throughput:.1f} objects/s), {len(report.failed)} failures"
+        )
+        for operation, error in report.failed:
+            logger.error(f"Could not {operation.describe()}: {error}")
+        return report
+
+    def _repair(self, cells, max_ret, budget=None):
+        """
+        Re-queue the given mismatched cells.
+
+        Failures are logged and left for the next verification round instead of
+        aborting the repair. With a `DeadlineBudget`, the operations are run in
+        small batches, each one only if the budget admits it; the others are
+        reported as skipped.
+
+        Args:
+            cells (list): The (row, column, expected, actual) tuples to repair.
+            max_ret (int): Maximun number of tries per request.
+            budget (DeadlineBudget, optional): The time left for the repairs.
+
+        Returns:
+            ExecutionReport: The outcome of the repairs.
+        """
+        deletes = [
+            (row, col, actual)
+            for row, col, expected, actual in cells
+            if actual != megaverse_state.SPACE
+        ]
+        posts = [
+            (row, col, expected)
+            for row, col, expected, actual in cells
+            if expected != megaverse_state.SPACE
+        ]
+        # Objects depending on a polyanet go away first and come back last.
+        phases = self._phases(deletes, "delete", dependencies_first=False)
+        phases += self._phases(posts, "post", dependencies_first=True)
+        if budget is None:
+            report = self.executor.run_phases(phases, max_ret)
+        else:
+            report = ExecutionReport()
+            size = 2 * self.executor.concurrency
+            for operations in phases:
+                for start in range(0, len(operations), size):
+                    batch = operations[start : start + size]
+                    if not budget.admit(len(batch)):
+                        report.skipped.extend(batch)
+                        continue
+                    try:
+                        report.merge(self.executor.run(batch, max_ret))
+                    finally:
+                        budget.finished(len(batch))
+        for operation, error in report.failed:
+            logger.error(f"Could not {operation.describe()}: {error}")
+        return report
+
+    def _cells(self, grid):
+        """
+        Iterate over the cells of a grid of goal tokens.
+
+        Args:
+            grid (list): A list of rows of goal tokens.
+
+        Yields:
+            tuple: (row, column, token) for every cell.
+        """
+        for row_index, row in enumerate(grid):
+            for col_index, item in enumerate(row):
+                yield row_index, col_index, item
+
+    def _phases(self, cells, action, dependencies_first):
+        """
+        Split cells into two dependency-safe phases of operations.
+
+        Objects other objects depend on (e.g. polyanets, needed next to soloons)
+        go in one phase and the rest in the other.
+
+        Args:
+            cells (list): (row, column, token) tuples of the cells to act on.
+            action (str): Either 'post' or 'delete'.
+            dependencies_first (bool): Whether the depended on objects go in the first phase.
+
+        Returns:
+            list: Two lists of operations, to be run one after the other.
+        """
+        dependencies = REGISTRY.dependencies()
+        required, others = [], []
+        for row, col, token in cells:
+            descriptor = REGISTRY.descriptor(token)
+            operation = Operation(action, descriptor.name, row, col, descriptor.value)
+            (required if descriptor.name in dependencies else others).append(operation)
+        return [required, others] if dependencies_first else [others, required]
+
+    def _get_instance(self, name):
+        """
+        Return the cached astral object instance for a class name, creating it if needed.
+
+        Args:
+            name (str): The lowercase class name.
+
+        Returns:
+            AstralObject: The instance used to post or delete objects of that class.
+        """
+        if self.class_id is None:
+            self.class_id = ClassIdentifier()
+            self.classes = self.class_id.get_class_info()
+        if name not in self.initialized:
+            instance = self.class_id.create_instance(
+                name, candidate_id=self.candidate_id
+            )
+            instance.transport = self.transport
+            self.initialized[name] = instance
+        return self.initialized[name]
+
+    def _solve(self, keep, max_ret=5, fail_fast=True):
+        """
+        Post the objects of the goal map through the solve pipeline.
+
+        The goal map is fetched by the source stage when none was loaded. Every
+        stage runs in its own thread, the execute stage in `concurrency` threads,
+        and they are connected by queues of `queue_size` items, so a run holds a
+        constant number of operations in memory whatever the size of the map.
+        The objects other objects depend on (e.g. polyanets) are all placed by a
+        first run of the pipeline and the others by a second one, so a soloon is
+        never sent before the polyanet next to it is placed. The statistics of
+        the stages, over both runs, are kept in `stage_stats`.
+
+        With a `deadline`, the goal map is planned in dependency-complete
+        clusters, smallest first, and a cluster is only admitted while the live
+        throughput says it can finish in time. Operations not admitted, or still
+        queued when the deadline passes, are reported as skipped; failures are
+        reported instead of raised.
+
+        With `lanes`, the goal map is also planned in clusters, so a polyanet is
+        always queued before the soloons next to it. The schedule stage queues
+        every operation in the lane of its endpoint and the execute stage takes
+        them back from the `LaneScheduler`, which decides which lane goes next.
+        The counters of the lanes are kept in `lane_stats`.
+
+        With a `region`, only its cells are planned, in clusters, along with the
+        objects outside it that objects on its boundary depend on.
+
+        Args:
+            keep (callable): Whether the object of a descriptor is posted.
+            max_ret (int, optional): Maximun number of tries per request.
+            fail_fast (bool, optional): Stop at the first failed operation and
+                raise its error instead of reporting it.
+
+        Returns:
+            ExecutionReport: The outcome of the posts.
+
+        Raises:
+            Exception: The error of the first failed operation, when `fail_fast` is
+                set and there is no deadline.
+        """
+        tokens = REGISTRY.tokens
+        report = self.report = ExecutionReport()
+        self.planned = 0
+        self.total = None
+        self.solving = True
+        budget = None
+        if self.deadline is not None:
+            budget = DeadlineBudget(self.deadline)
+            fail_fast = False
+        scheduler = None
+        workers = self.executor.concurrency
+        if self.lanes is not None:
+            lanes = list(self.lanes)
+            names = {lane.name for lane in lanes}
+            lanes += [
+                Lane(name, concurrency=self.executor.concurrency)
+                for name in REGISTRY.types
+                if name not in names
+            ]
+            scheduler = LaneScheduler(lanes, queue_size=self.queue_size)
+            workers = scheduler.concurrency
+
+        def goal_map():
+            if self.goal_map is None:
+                return self.get_goal_map()
+            return self.goal_map
+
+        kept = [token for token, descriptor in tokens.items() if keep(descriptor)]
+        dependencies = REGISTRY.dependencies()
+
+        def source():
+            rows = goal_map()
+            if self.total is None:
+                self.total = sum(row.count(token) for row in rows for token in kept)
+            return enumerate(rows)
+
+        def phase(first):
+            def kept_in_phase(descriptor):
+                return keep(descriptor) and (descriptor.name in dependencies) == first
+
+            def plan(row):
+                return plan_row(*row, kept_in_phase)
+
+            return plan
+
+        def cluster_source():
+            if self.region is None:
+                full = Plan.from_goal_map(goal_map())
+            else:
+                full = Plan.from_region(goal_map(), self.region)
+            self.total = int(
+                np.isin(full.codes, [tokens[token].code for token in kept]).sum()
+            )
+            for cluster in full.clusters():
+                operations = []
+                for index in cluster:
+                    descriptor = tokens[megaverse_state.decode(full.codes[index])]
+                    if keep(descriptor):
+                        operations.append(
+                            Operation(
+                                "post",
+                                descriptor.name,
+                                int(full.rows[index]),
+                                int(full.columns[index]),
+                                descriptor.value,
+                            )
+                        )
+                if operations:
+                    yield operations
+
+        def admit(operations):
+            if budget is None or budget.admit(len(operations)):
+                return operations
+            self.planned += len(operations)
+            report.skipped.extend(operations)
+
+        def schedule(operation):
+            self.planned += 1
+            instance = self._get_instance(operation.name)
+            if scheduler is None:
+                return ((operation, instance),)
+            # The execute stage takes whichever operation the lanes dispatch next
+            scheduler.put(operation, instance)
+            return (None,)
+
+        def execute(scheduled):
+            if scheduler is not None:
+                scheduled = scheduler.take()
+                if scheduled is None:
+                    return None
+            operation, instance = scheduled
+            try:
+                if budget is not None and budget.expired():
+                    return ((operation, None, True),)
+                try:
+                    self.executor.execute(operation, max_ret, instance)
+                except Exception as e:
+                    if fail_fast:
+                        raise
+                    return ((operation, e, False),)
+                return ((operation, None, False),)
+            finally:
+                if scheduler is not None:
+                    scheduler.done(operation)
+
+        def record(outcome):
+            operation, error, skipped = outcome
+            if budget is not None:
+                budget.finished()
+            if skipped:
+                report.skipped.append(operation)
+            elif error is None:
+                report.succeeded += 1
+            else:
+                report.failed.append((operation, error))
+
+        clustered = (
+            budget is not None or scheduler is not None or self.region is not None
+        )
+        if clustered:
+            runs = [(cluster_source, admit)]
+        else:
+            runs = [(source, phase(True))]
+            if any(tokens[token].name not in dependencies for token in kept):
+                runs.append((source, phase(False)))
+        pipelines = []
+        try:
+            for goal_source, plan in runs:
+                pipeline = Pipeline(
+                    [
+                        Stage("goal source", goal_source),
+                        Stage("plan", plan),
+                        Stage("schedule", schedule),
+                        Stage("execute", execute, workers=workers),
+                        Stage("record", record),
+                    ],
+                    queue_size=self.queue_size,
+                )
+                pipelines.append(pipeline)
+                pipeline.run()
+        finally:
+            self.solving = False
+            if scheduler is not None:
+                scheduler.close()
+                self.lane_stats = scheduler.stats()
+            self.stage_stats = combine_stats([pipeline.stats for pipeline in pipelines])
+            if self.stage_stats:
+                report.elapsed = self.stage_stats[0].elapsed
+        return report
+
     def solve_challengue_1(self, max_ret=5):
         """
         Solve Challenge 1 by posting objects based on the goal map.
@@ -75,49 +659,20 @@ class ChallengeGoal:
 
         Args:
             max_ret (int, optional): Maximun number of tries.
+
+        Returns:
+            ExecutionReport: The outcome of the posts.
+
         Raises:
             Exception: If an item fails to post after the maximum retries.
         """
         self.class_id = ClassIdentifier()
         self.classes = self.class_id.get_class_info()
-        max_retries = max_ret
-        for row_index, row in enumerate(self.goal_map):
-            for col_index, item in enumerate(row):
-                if item.lower() in self.classes:
-                    if item.lower() not in self.initialized:
-                        item_def = self.class_id.create_instance(
-                            item.lower(), candidate_id=self.candidate_id
-                        )
-                        self.initialized[item.lower()] = item_def
-                    # print(item.lower())
-                    # self.initialized[item.lower()].post((row_index, col_index))
-                    for attempt in range(max_retries):
-                        try:
-                            logger.info(
-                                f"Posting item '{item.lower()}' at position ({row_index}, {col_index})"
-                            )
-                            self.initialized[item.lower()].post((row_index, col_index))
-                            break  # Exit retry loop on success
-                        except requests.exceptions.HTTPError as e:
-                            if e.response.status_code == 429:
-                                wait_time = 2**attempt
-                                logger.warning(
-                                    f"Rate limit reached. Retrying in {wait_time} seconds..."
-                                )
-                                time.sleep(wait_time)
-                            else:
-                                logger.error(f"HTTP Error occurred: {e}")
-                                raise
-                        except Exception as e:
-                            logger.error(f"An unexpected error occurred: {e}")
-                            raise
-                    else:
-                        logger.error(
-                            f"Failed to post item '{item.lower()}' after {max_retries} retries."
-                        )
-                        raise Exception(
-                            "Max retries exceeded for rate-limited requests."
-                        )
+        return self._solve(
+            lambda descriptor: descriptor.value is None
+            and descriptor.name in self.classes,
+            max_ret,
+        )
 
     def solve_challengue_2(self, max_ret=5):
         """
@@ -130,58 +685,12 @@ class ChallengeGoal:
         Args:
             max_ret (int, optional): Maximun number of tries.
 
+        Returns:
+            ExecutionReport: The outcome of the posts.
+
         Raises:
             Exception: If an item fails to post after the maximum retries.
         """
         self.class_id = ClassIdentifier()
         self.classes = self.class_id.get_class_info()
-        max_retries = max_ret
-        for row_index, row in enumerate(self.goal_map):
-            for col_index, item in enumerate(row):
-                if "_" in item:
-                    attribute, name = [x.lower() for x in item.split("_")]
-                else:
-                    attribute, name = [None, item.lower()]
-                if name in self.classes:
-                    if name not in self.initialized:
-                        item_def = self.class_id.create_instance(
-                            name, candidate_id=self.candidate_id
-                        )
-                        self.initialized[name] = item_def
-                    # print(item.lower())
-                    # self.initialized[item.lower()].post((row_index, col_index))
-                    for attempt in range(max_retries):
-                        try:
-                            if attribute:
-                                logger.info(
-                                    f"Posting item '{name}' at position ({row_index}, {col_index}) with attribute {attribute}"
-                                )
-                                self.initialized[name].post(
-                                    (row_index, col_index, attribute)
-                                )
-                            else:
-                                logger.info(
-                                    f"Posting item '{name}' at position ({row_index}, {col_index})"
-                                )
-                                self.initialized[name].post((row_index, col_index))
-                            break  # Exit retry loop on success
-                        except requests.exceptions.HTTPError as e:
-                            if e.response.status_code == 429:
-                                wait_time = 2**attempt
-                                logger.warning(
-                                    f"Rate limit reached. Retrying in {wait_time} seconds..."
-                                )
-                                time.sleep(wait_time)
-                            else:
-                                logger.error(f"HTTP Error occurred: {e}")
-                                raise
-                        except Exception as e:
-                            logger.error(f"An unexpected error occurred: {e}")
-                            raise
-                    else:
-                        logger.error(
-                            f"Failed to post item '{name}' after {max_retries} retries."
-                        )
-                        raise Exception(
-                            "Max retries exceeded for rate-limited requests."
-                        )
+        return self._solve(lambda descriptor: descriptor.name in self.classes, max_ret)
@@ -0,0 +1,7 @@
+# Challenges solved by `ChallengeGoal`, mapped to the name of the method solving
+# them. Kept static so the command line can validate a challenge number without
+# importing `ChallengeGoal` and the network stack it depends on.
+SUPPORTED_CHALLENGES = {
+    1: "solve_challengue_1",
+    2: "solve_challengue_2",
+}
@@ -1,39 +1,37 @@
-from app.astral_objects.astral_object import AstralObject
+from app.astral_objects.registry import REGISTRY
 
 
 class ClassIdentifier:
     """
-    A utility class to dynamically identify subclasses of AstralObject and manage their instances.
+    A utility class to identify the registered subclasses of AstralObject and manage their instances.
 
-    This class is responsible for discovering all subclasses of `AstralObject` at runtime,
-    storing them in a dictionary, and providing mechanisms to retrieve information
-    about them or create instances dynamically.
+    This class is responsible for collecting the subclasses of `AstralObject`
+    registered in the object registry, storing them in a dictionary, and
+    providing mechanisms to retrieve information about them or create
+    instances dynamically.
     """
 
     def __init__(self):
         """
         Initializes the ClassIdentifier instance.
 
-        Discovers all subclasses of `AstralObject` and stores them in a dictionary
-        with their lowercase names as keys.
+        Collects the registered subclasses of `AstralObject` and stores them in a
+        dictionary with their lowercase names as keys.
         """
         self.class_dict = self._identify_classes()
 
     def _identify_classes(self):
         """
-        Identify all subclasses of AstralObject.
+        Identify all registered subclasses of AstralObject.
 
-        Find all direct subclasses of `AstralObject` and maps their lowercase class names to their class objects.
+        Reads the types declared in the object registry, so discovery does not
+        depend on which modules happen to be imported.
 
         Returns:
             dict: A dictionary where keys are lowercase class names (str) and values
                 are the corresponding class objects for later use.
         """
-        class_dict = {}
-        for subclass in AstralObject.__subclasses__():
-            # print(f"Found subclass: {subclass.__name__}")
-            class_dict[subclass.__name__.lower()] = subclass
-        return class_dict
+        return dict(REGISTRY.types)
 
     def get_class_info(self):
         """
@@ -0,0 +1,118 @@
+import time
+import threading
+
+from collections import deque
+
+
+class DeadlineBudget:
+    """
+    Decides whether more work can still finish before a deadline.
+
+    The throughput is measured live, over the operations finished during the
+    last `window` seconds. New work is admitted while the operations already
+    admitted and not finished yet, plus the new ones, can be finished at that
+    throughput before the deadline. Without an estimate (before the first
+    operation finishes) only one batch is admitted at a time, and admitting
+    the next one waits until it finishes or the deadline passes.
+
+    Once some work is refused no more is admitted, so work admitted later can
+    never overtake it.
+    """
+
+    def __init__(self, deadline, window=10.0, clock=time.monotonic):
+        """
+        Initializes a DeadlineBudget instance.
+
+        Args:
+            deadline (float): The instant the work must be finished by, on the `clock` scale.
+            window (float, optional): Seconds of finished operations the throughput is measured on.
+            clock (callable, optional): Returns the current time, in seconds.
+        """
+        self.deadline = deadline
+        self.window = window
+        self.clock = clock
+        self.pending = 0
+        self.closed = False
+        self.started = None
+        self.finishes = deque()
+        self.condition = threading.Condition()
+
+    def remaining(self):
+        """
+        float: Seconds left before the deadline, 0 once it has passed.
+        """
+        return max(0.0, self.deadline - self.clock())
+
+    def expired(self):
+        """
+        Whether the deadline has passed.
+
+        Returns:
+            bool: True once no time remains.
+        """
+        return self.clock() >= self.deadline
+
+    def throughput(self):
+        """
+        Estimate the current throughput.
+
+        Returns:
+            float or None: Operations finished per second over the last window,
+                None before the first operation finishes.
+        """
+        with self.condition:
+            return self._throughput(self.clock())
+
+    def admit(self, count):
+        """
+        Decide whether some more operations can be started.
+
+        Args:
+            count (int): The number of operations to start.
+
+        Returns:
+            bool: True if they were admitted; they must then be reported with
+                `finished` once they succeed, fail or are skipped.
+        """
+        with self.condition:
+            now = self.clock()
+            if self.started is None:
+                self.started = now
+            throughput = self._throughput(now)
+            while throughput is None and self.pending and now < self.deadline:
+                self.condition.wait(min(self.deadline - now, 0.1))
+                now = self.clock()
+                throughput = self._throughput(now)
+            if not self.closed:
+                left = self.deadline - now
+                if throughput is None:
+                    self.closed = left <= 0
+                else:
+                    self.closed = (self.pending + count) / throughput > left
+            if self.closed:
+                return False
+            self.pending += count
+            return True
+
+    def finished(self, count=1):
+        """
+        Report admitted operations as finished.
+
+        Args:
+            count (int, optional): The number of finished operations.
+        """
+        with self.condition:
+            now = self.clock()
+            self.pending -= count
+            self.finishes.extend([now] * count)
+            self.condition.notify_all()
+
+    def _throughput(self, now):
+        while self.finishes and self.finishes[0] < now - self.window:
+            self.finishes.popleft()
+        if not self.finishes:
+            return None
+        span = min(self.window, now - self.started)
+        if span <= 0:
+            return None
+        return len(self.finishes) / span
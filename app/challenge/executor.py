@@ -0,0 +1,463 @@
+import json
+import time
+import logging
+import threading
+import requests
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from app.astral_objects.astral_object import AstralObject
+from app.transport.circuit_breaker import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+
+class Operation(
+    namedtuple("Operation", ["action", "name", "row", "column", "attribute"])
+):
+    """
+    A single 'post' or 'delete' request on one cell of the megaverse.
+
+    Attributes:
+        action (str): Either 'post' or 'delete'.
+        name (str): The lowercase class name of the astral object (e.g. 'soloon').
+        row (int): The row of the cell.
+        column (int): The column of the cell.
+        attribute (str or None): The color or direction of the object, if any.
+    """
+
+    __slots__ = ()
+
+    @property
+    def args(self):
+        """
+        tuple: The tuple passed to the astral object's `post` or `delete` method.
+        """
+        if self.attribute and self.action == "post":
+            return (self.row, self.column, self.attribute)
+        return (self.row, self.column)
+
+    def describe(self):
+        """
+        Describe the operation for log messages.
+
+        Returns:
+            str: A human readable description of the operation.
+        """
+        description = (
+            f"{self.action} item '{self.name}' at position ({self.row}, {self.column})"
+        )
+        if self.attribute and self.action == "post":
+            description += f" with attribute {self.attribute}"
+        return description
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket limiting how many requests are sent per second.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Initializes a RateLimiter instance.
+
+        Args:
+            rate (float): Number of requests allowed per second.
+            burst (int, optional): Number of requests that may be sent back to back.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a request may be sent.
+        """
+        while True:
+            wait_time = self.try_acquire()
+            if not wait_time:
+                return
+            time.sleep(wait_time)
+
+    def try_acquire(self):
+        """
+        Take a token if one is available, without blocking.
+
+        Returns:
+            float: 0 if a request may be sent now, otherwise the seconds until
+                the next token.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def state(self):
+        """
+        Read the state of the bucket without taking a token.
+
+        The read does not take the lock, so it never delays a request; the
+        values may be a moment out of date.
+
+        Returns:
+            dict: The 'rate', the 'burst', the 'tokens' available now and the
+                'wait' in seconds before the next request may be sent.
+        """
+        tokens = min(
+            self.burst, self.tokens + (time.monotonic() - self.updated) * self.rate
+        )
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": tokens,
+            "wait": max(0.0, (1 - tokens) / self.rate),
+        }
+
+
+class ExecutionReport:
+    """
+    The outcome of running a batch of operations.
+
+    Attributes:
+        succeeded (int): Number of completed operations.
+        failed (list): (operation, error) tuples of the operations that failed.
+        skipped (list): The operations not attempted, e.g. when a deadline was reached.
+        elapsed (float): Wall time of the run, in seconds.
+    """
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = []
+        self.skipped = []
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """
+        float: Completed operations per second.
+        """
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other):
+        """
+        Add the outcome of another report to this one.
+
+        Args:
+            other (ExecutionReport): The report to merge.
+        """
+        self.succeeded += other.succeeded
+        self.failed.extend(other.failed)
+        self.skipped.extend(other.skipped)
+        self.elapsed += other.elapsed
+
+    def remaining(self):
+        """
+        Return the operations still to be done: the skipped and the failed ones.
+
+        Returns:
+            list: The operations, skipped ones first.
+        """
+        return self.skipped + [operation for operation, _ in self.failed]
+
+    def save_manifest(self, path):
+        """
+        Write the operations still to be done to a JSON file.
+
+        Every entry holds the fields of the operation and, for failed ones, the
+        error they failed with.
+
+        Args:
+            path (str): Where the manifest is written.
+        """
+        entries = [dict(operation._asdict(), error=None) for operation in self.skipped]
+        entries += [
+            dict(operation._asdict(), error=str(error))
+            for operation, error in self.failed
+        ]
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "succeeded": self.succeeded,
+                    "skipped": len(self.skipped),
+                    "failed": len(self.failed),
+                    "operations": entries,
+                },
+                file,
+                indent=1,
+            )
+
+
+class OperationExecutor:
+    """
+    Runs operations against the API with bounded concurrency and a shared rate limit.
+
+    Every operation is retried with exponential backoff while the API answers
+    with 429 (Too Many Requests). Any other error fails the operation, and an
+    operation rejected by an open circuit breaker fails at once without
+    waiting for any backoff.
+
+    Operations on astral objects go through the request templates of the
+    objects: their body is encoded once, before the first try, and batches
+    given as lists are validated as a whole before anything is sent.
+    """
+
+    def __init__(
+        self, get_instance, concurrency=1, rate_limit=None, metrics=None, trace=None
+    ):
+        """
+        Initializes an OperationExecutor instance.
+
+        Args:
+            get_instance (callable): Returns the astral object instance for a lowercase class name.
+            concurrency (int, optional): Maximum number of operations in flight at once.
+            rate_limit (float, optional): Maximum requests per second, None for unlimited.
+            metrics (RunMetrics, optional): Where requests and operations are recorded.
+            trace (TraceWriter, optional): Where every request is traced.
+
+        Attributes:
+            in_flight (int): Operations being executed right now.
+            backing_off (int): Operations waiting to be retried after a 429.
+        """
+        self.get_instance = get_instance
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.metrics = metrics
+        self.trace = trace
+        self.in_flight = 0
+        self.backing_off = 0
+        self.lock = threading.Lock()
+
+    def execute(self, operation, max_retries=5, instance=None):
+        """
+        Run a single operation, retrying while it is rate-limited.
+
+        Args:
+            operation (Operation): The operation to run.
+            max_retries (int, optional): Maximun number of tries.
+            instance (AstralObject, optional): The instance to use, resolved from
+                the operation name when not given.
+
+        Raises:
+            requests.exceptions.HTTPError: If the request fails with a status other than 429.
+            CircuitOpenError: If the circuit of the endpoint is open.
+            Exception: If the request keeps being rate-limited after the maximum retries.
+        """
+        with self.lock:
+            self.in_flight += 1
+        try:
+            self._execute(operation, max_retries, instance)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _execute(self, operation, max_retries, instance):
+        if instance is None:
+            instance = self.get_instance(operation.name)
+        if isinstance(instance, AstralObject):
+            template = instance.template(operation.action)
+            try:
+                body = template.body(*operation.args)
+            except AssertionError as e:
+                logger.error(f"Invalid operation {operation.describe()}: {e}")
+                self._record_operation(False)
+                raise
+
+            def action(args):
+                return instance.send_prepared(template, body).status_code
+
+            size = len(body)
+        else:
+            action = getattr(instance, operation.action)
+            size = 0
+        description = operation.describe()
+        for attempt in range(max_retries):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                logger.info(f"Trying to {description}")
+                status = action(operation.args)
+                self._record_request(
+                    time.monotonic() - started, status, operation, attempt, size
+                )
+                self._record_operation(True)
+                return
+            except requests.exceptions.HTTPError as e:
+                status = getattr(e.response, "status_code", None)
+                self._record_request(
+                    time.monotonic() - started, status, operation, attempt, size
+                )
+                if status == 429:
+                    wait_time = 2**attempt
+                    logger.warning(
+                        f"Rate limit reached. Retrying in {wait_time} seconds..."
+                    )
+                    with self.lock:
+                        self.backing_off += 1
+                    try:
+                        time.sleep(wait_time)
+                    finally:
+                        with self.lock:
+                            self.backing_off -= 1
+                else:
+                    logger.error(f"HTTP Error occurred: {e}")
+                    self._record_operation(False)
+                    raise
+            except CircuitOpenError as e:
+                logger.warning(f"Could not {description}: {e}")
+                self._record_operation(False)
+                raise
+            except Exception as e:
+                logger.error(f"An unexpected error occurred: {e}")
+                if self.trace is not None:
+                    self._trace(
+                        time.monotonic() - started, None, operation, attempt, size
+                    )
+                self._record_operation(False)
+                raise
+        logger.error(f"Failed to {description} after {max_retries} retries.")
+        self._record_operation(False)
+        raise Exception("Max retries exceeded for rate-limited requests.")
+
+    def run(self, operations, max_retries=5, fail_fast=False):
+        """
+        Run a batch of operations.
+
+        Operations are pulled lazily from the iterable, so at most a few times
+        `concurrency` of them are pending at once whatever the batch size. A
+        list or tuple of operations is validated before any of them is sent;
+        other operations are validated as they are pulled and an invalid one
+        fails with an AssertionError.
+
+        Args:
+            operations (iterable): The operations to run.
+            max_retries (int, optional): Maximun number of tries per operation.
+            fail_fast (bool, optional): Stop at the first failed operation and
+                raise its error instead of reporting it.
+
+        Returns:
+            ExecutionReport: The outcome of the batch.
+
+        Raises:
+            AssertionError: If a list or tuple of operations holds invalid ones.
+            Exception: The error of the first failed operation, when `fail_fast` is set.
+        """
+        if isinstance(operations, (list, tuple)):
+            self.validate(operations)
+        report = ExecutionReport()
+        started = time.monotonic()
+        try:
+            if self.concurrency <= 1:
+                self._run_serial(operations, max_retries, fail_fast, report)
+            else:
+                self._run_concurrent(operations, max_retries, fail_fast, report)
+        finally:
+            report.elapsed = time.monotonic() - started
+        return report
+
+    def validate(self, operations):
+        """
+        Validate a batch of operations on astral objects before sending any of them.
+
+        Args:
+            operations (iterable): The operations to validate.
+
+        Raises:
+            AssertionError: If any operation is invalid.
+        """
+        batches = {}
+        for operation in operations:
+            key = (operation.name, operation.action)
+            batches.setdefault(key, []).append(operation.args)
+        for (name, action), items in batches.items():
+            instance = self.get_instance(name)
+            if isinstance(instance, AstralObject):
+                instance.validate_batch(items, action)
+
+    def run_phases(self, phases, max_retries=5):
+        """
+        Run several batches one after the other.
+
+        Every phase finishes before the next one starts, which keeps operations
+        that depend on each other (e.g. a soloon and its polyanet) in a safe order.
+
+        Args:
+            phases (list): A list of iterables of operations.
+            max_retries (int, optional): Maximun number of tries per operation.
+
+        Returns:
+            ExecutionReport: The merged outcome of all the phases.
+        """
+        report = ExecutionReport()
+        for operations in phases:
+            report.merge(self.run(operations, max_retries))
+        return report
+
+    def _run_serial(self, operations, max_retries, fail_fast, report):
+        for operation in operations:
+            try:
+                self.execute(operation, max_retries)
+                report.succeeded += 1
+            except Exception as e:
+                if fail_fast:
+                    raise
+                report.failed.append((operation, e))
+
+    def _run_concurrent(self, operations, max_retries, fail_fast, report):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = {}
+            iterator = iter(operations)
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < 2 * self.concurrency:
+                    operation = next(iterator, None)
+                    if operation is None:
+                        exhausted = True
+                        break
+                    instance = self.get_instance(operation.name)
+                    future = pool.submit(self.execute, operation, max_retries, instance)
+                    pending[future] = operation
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    operation = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        report.succeeded += 1
+                        continue
+                    if fail_fast:
+                        for other in pending:
+                            other.cancel()
+                        raise error
+                    report.failed.append((operation, error))
+
+    def _record_request(self, latency, status, operation, attempt, size):
+        if self.metrics is not None:
+            self.metrics.record_request(latency, status, operation.name)
+        if self.trace is not None:
+            self._trace(latency, status, operation, attempt, size)
+
+    def _trace(self, latency, status, operation, attempt, size):
+        self.trace.record(
+            time.time() - latency,
+            operation.action,
+            operation.name,
+            operation.row,
+            operation.column,
+            status if isinstance(status, int) else None,
+            attempt + 1,
+            latency,
+            size,
+        )
+
+    def _record_operation(self, success):
+        if self.metrics is not None:
+            self.metrics.record_operation(success)
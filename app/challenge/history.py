@@ -0,0 +1,172 @@
+import os
+import json
+import math
+import time
+import logging
+
+from collections import namedtuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class Seed(
+    namedtuple(
+        "Seed", ["concurrency", "rate_limit", "timeout", "endpoint_rates", "runs"]
+    )
+):
+    """
+    Settings for a new run, derived from the history of earlier runs.
+
+    Attributes:
+        concurrency (int or None): Requests in flight at once, None when unknown.
+        rate_limit (float or None): Requests per second, None when the API never
+            rate-limited the earlier runs.
+        timeout (float or None): Seconds a write may take, None when unknown.
+        endpoint_rates (dict): Requests per second of every endpoint that was
+            rate-limited, by name.
+        runs (int): The number of earlier runs the settings come from.
+    """
+
+    __slots__ = ()
+
+
+class RunHistory:
+    """
+    A local store of the metrics of earlier runs, used to seed new runs.
+
+    Every run appends one JSON line with its settings and `RunMetrics.summary`.
+    Recent runs of the same candidate are averaged with weights halving every
+    `half_life` seconds, and runs older than `max_age` are ignored, so a new
+    run starts close to the limits the API showed lately instead of
+    rediscovering them through 429s.
+    """
+
+    # Share of the observed rate ceiling a seeded run aims at.
+    HEADROOM = 0.9
+    # Seeded timeouts are this many times the 99th latency percentile.
+    TIMEOUT_FACTOR = 4
+    MIN_TIMEOUT = 1.0
+    MAX_CONCURRENCY = 64
+
+    def __init__(self, path, half_life=86400.0, max_age=7 * 86400.0, clock=time.time):
+        """
+        Initializes a RunHistory instance.
+
+        Args:
+            path (str): The JSON lines file of the history.
+            half_life (float, optional): Seconds after which a run weighs half as much.
+            max_age (float, optional): Seconds after which a run is ignored.
+            clock (callable, optional): Returns the current wall-clock time, in seconds.
+        """
+        self.path = path
+        self.half_life = half_life
+        self.max_age = max_age
+        self.clock = clock
+
+    def record(self, candidate_id, summary, concurrency, rate_limit=None, timeout=None):
+        """
+        Append a finished run to the history.
+
+        Args:
+            candidate_id (str): The candidate the run worked for.
+            summary (dict): The `RunMetrics.summary` of the run.
+            concurrency (int): The concurrency the run used.
+            rate_limit (float, optional): The rate limit the run used.
+            timeout (float, optional): The write timeout the run used.
+        """
+        entry = {
+            "time": self.clock(),
+            "candidate": candidate_id,
+            "settings": {
+                "concurrency": concurrency,
+                "rate_limit": rate_limit,
+                "timeout": timeout,
+            },
+            "summary": summary,
+        }
+        with open(self.path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+
+    def runs(self, candidate_id):
+        """
+        Read the recent runs of a candidate.
+
+        Lines that cannot be read are skipped.
+
+        Args:
+            candidate_id (str): The candidate.
+
+        Returns:
+            list: (weight, entry) tuples, newest first, for every run younger
+                than `max_age`.
+        """
+        if not os.path.exists(self.path):
+            return []
+        now = self.clock()
+        runs = []
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                    age = now - entry["time"]
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping unreadable run history line: {line!r}")
+                    continue
+                if entry.get("candidate") != candidate_id or age > self.max_age:
+                    continue
+                runs.append((0.5 ** (max(age, 0.0) / self.half_life), entry))
+        runs.sort(key=lambda run: -run[1]["time"])
+        return runs
+
+    def seed(self, candidate_id):
+        """
+        Derive the settings of a new run from the recent runs of a candidate.
+
+        The rate limit aims just under the decayed mean of the rate ceilings
+        observed, the concurrency is what that rate needs at the median
+        latency (or the concurrency used so far when no ceiling was seen), and
+        the timeout leaves room over the 99th latency percentile.
+
+        Args:
+            candidate_id (str): The candidate.
+
+        Returns:
+            Seed or None: The settings, None without recent runs.
+        """
+        runs = self.runs(candidate_id)
+        if not runs:
+            return None
+
+        def mean(value):
+            pairs = [(weight, value(entry)) for weight, entry in runs]
+            pairs = [(weight, v) for weight, v in pairs if v is not None]
+            total = sum(weight for weight, _ in pairs)
+            return sum(weight * v for weight, v in pairs) / total if total else None
+
+        ceiling = mean(lambda entry: entry["summary"].get("rate_ceiling"))
+        latency = mean(lambda entry: entry["summary"].get("latency_p50"))
+        p99 = mean(lambda entry: entry["summary"].get("latency_p99"))
+        rate_limit = ceiling * self.HEADROOM if ceiling else None
+        if rate_limit and latency:
+            concurrency = math.ceil(rate_limit * latency)
+        else:
+            concurrency = mean(lambda entry: entry["settings"].get("concurrency"))
+        if concurrency is not None:
+            concurrency = min(self.MAX_CONCURRENCY, max(1, int(round(concurrency))))
+        timeout = max(self.MIN_TIMEOUT, p99 * self.TIMEOUT_FACTOR) if p99 else None
+
+        endpoint_rates = {}
+        names = {
+            name for _, entry in runs for name in entry["summary"].get("endpoints", {})
+        }
+        for name in sorted(names):
+            rate = mean(
+                lambda entry: entry["summary"]
+                .get("endpoints", {})
+                .get(name, {})
+                .get("rate_ceiling")
+            )
+            if rate:
+                endpoint_rates[name] = rate * self.HEADROOM
+        return Seed(concurrency, rate_limit, timeout, endpoint_rates, len(runs))
@@ -0,0 +1,228 @@
+import threading
+
+from collections import deque
+from app.astral_objects.registry import REGISTRY
+from .executor import RateLimiter
+
+
+class Lane:
+    """
+    The work queue of one kind of astral object, i.e. of one API endpoint.
+
+    A lane has its own concurrency and rate limit, so a throttled or slow
+    endpoint only holds back its own operations.
+    """
+
+    def __init__(self, name, concurrency=1, rate_limit=None, weight=1.0):
+        """
+        Initializes a Lane instance.
+
+        Args:
+            name (str): The lowercase class name of its objects (e.g. 'soloon').
+            concurrency (int, optional): Maximum number of its operations in flight at once.
+            rate_limit (float, optional): Maximum requests per second, None for unlimited.
+            weight (float, optional): Its share of the dispatches when several lanes
+                have work ready.
+        """
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.rate_limit = rate_limit
+        self.weight = weight
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.queue = deque()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.dispatched = 0
+        self.virtual = 0.0
+
+    def stats(self):
+        """
+        Return the counters of the lane.
+
+        Returns:
+            dict: The 'dispatched' operations and the 'peak_in_flight' concurrency.
+        """
+        return {"dispatched": self.dispatched, "peak_in_flight": self.peak_in_flight}
+
+
+class LaneScheduler:
+    """
+    A weighted fair scheduler dispatching operations from one lane per endpoint.
+
+    Operations are queued in the lane of their object and taken by a shared
+    pool of workers. Each take dispatches from the lane with the least work
+    served relative to its weight among the lanes with an operation ready, a
+    free slot under their concurrency and a token under their rate limit, so
+    every endpoint is kept busy up to its own limits.
+
+    An operation on an object depending on another type (e.g. a soloon) is
+    not ready while an operation on a neighbouring object of that type (e.g. a
+    polyanet) is queued or in flight, whatever its lane.
+    """
+
+    def __init__(self, lanes, queue_size=64):
+        """
+        Initializes a LaneScheduler instance.
+
+        Args:
+            lanes (list): The `Lane` instances whose settings are used; the
+                scheduler works on copies of them. Objects without a lane get
+                one with the default settings.
+            queue_size (int, optional): Maximum number of operations queued per lane.
+        """
+        self.lanes = {
+            lane.name: Lane(lane.name, lane.concurrency, lane.rate_limit, lane.weight)
+            for lane in lanes
+        }
+        self.queue_size = queue_size
+        self.depends_on = {
+            name: set(cls.depends_on) for name, cls in REGISTRY.types.items()
+        }
+        self.dependencies = REGISTRY.dependencies()
+        self.supports = {}
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def lane(self, name):
+        """
+        Return the lane of a kind of object, creating it if needed.
+
+        Args:
+            name (str): The lowercase class name of the object.
+
+        Returns:
+            Lane: Its lane.
+        """
+        if name not in self.lanes:
+            self.lanes[name] = Lane(name)
+        return self.lanes[name]
+
+    @property
+    def concurrency(self):
+        """
+        int: The number of operations that may be in flight at once over all lanes.
+        """
+        return sum(lane.concurrency for lane in self.lanes.values())
+
+    def put(self, operation, instance):
+        """
+        Queue an operation in its lane, waiting while the lane is full.
+
+        Args:
+            operation (Operation): The operation.
+            instance (AstralObject): The instance sending it.
+        """
+        with self.condition:
+            lane = self.lane(operation.name)
+            while len(lane.queue) >= self.queue_size and not self.closed:
+                self.condition.wait()
+            if not lane.queue and not lane.in_flight:
+                # A lane back from idle starts level with the busy ones
+                active = [
+                    other.virtual
+                    for other in self.lanes.values()
+                    if other.queue or other.in_flight
+                ]
+                if active:
+                    lane.virtual = max(lane.virtual, min(active))
+            lane.queue.append((operation, instance))
+            if operation.name in self.dependencies:
+                cell = (operation.row, operation.column)
+                self.supports.setdefault(cell, []).append(operation.name)
+            self.condition.notify_all()
+
+    def take(self):
+        """
+        Wait for the next operation to dispatch.
+
+        Every operation taken must be reported with `done` once finished.
+
+        Returns:
+            tuple or None: (operation, instance), None once the scheduler is closed.
+        """
+        with self.condition:
+            while not self.closed:
+                wait = None
+                ready = []
+                for lane in self.lanes.values():
+                    if lane.queue and lane.in_flight < lane.concurrency:
+                        index = self._first_ready(lane)
+                        if index is not None:
+                            ready.append((lane.virtual, lane.name, lane, index))
+                for _, _, lane, index in sorted(ready):
+                    delay = lane.limiter.try_acquire() if lane.limiter else 0.0
+                    if delay:
+                        wait = delay if wait is None else min(wait, delay)
+                        continue
+                    return self._dispatch(lane, index)
+                self.condition.wait(wait)
+            return None
+
+    def done(self, operation):
+        """
+        Report a taken operation as finished, successfully or not.
+
+        Args:
+            operation (Operation): The operation.
+        """
+        with self.condition:
+            self.lanes[operation.name].in_flight -= 1
+            if operation.name in self.dependencies:
+                cell = (operation.row, operation.column)
+                names = self.supports[cell]
+                names.remove(operation.name)
+                if not names:
+                    del self.supports[cell]
+            self.condition.notify_all()
+
+    def close(self):
+        """
+        Wake every waiting worker; `take` returns None from then on.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def stats(self):
+        """
+        Return the counters of every lane.
+
+        Returns:
+            dict: The `Lane.stats` of every lane, by name.
+        """
+        with self.condition:
+            return {name: lane.stats() for name, lane in self.lanes.items()}
+
+    def _first_ready(self, lane):
+        required = self.depends_on.get(lane.name)
+        if not required or not self.supports:
+            return 0
+        for index, (operation, _) in enumerate(lane.queue):
+            row, column = operation.row, operation.column
+            neighbours = (
+                (row - 1, column),
+                (row + 1, column),
+                (row, column - 1),
+                (row, column + 1),
+            )
+            if not any(
+                name in required
+                for cell in neighbours
+                for name in self.supports.get(cell, ())
+            ):
+                return index
+        return None
+
+    def _dispatch(self, lane, index):
+        if index:
+            lane.queue.rotate(-index)
+            item = lane.queue.popleft()
+            lane.queue.rotate(index)
+        else:
+            item = lane.queue.popleft()
+        lane.virtual += 1 / lane.weight
+        lane.in_flight += 1
+        lane.peak_in_flight = max(lane.peak_in_flight, lane.in_flight)
+        lane.dispatched += 1
+        self.condition.notify_all()
+        return item
@@ -0,0 +1,133 @@
+import numpy as np
+
+from app.astral_objects.registry import REGISTRY, SPACE
+
+
+# The code of 'SPACE', whatever types are registered
+SPACE_CODE = 0
+
+# The goal tokens indexed by code, with the registry codes they were built from
+_code_tokens = (None, None)
+
+
+def token_codes():
+    """
+    Return every valid goal token mapped to its integer code.
+
+    The codes follow the registry, so types registered after import are known.
+
+    Returns:
+        dict: The code of every goal token, 'SPACE' being 0.
+    """
+    return REGISTRY.codes
+
+
+def code_tokens():
+    """
+    Return the goal tokens indexed by their code.
+
+    The array is rebuilt whenever a type is registered.
+
+    Returns:
+        numpy.ndarray: A 1D object array, the token of code `i` at index `i`.
+    """
+    global _code_tokens
+    codes = REGISTRY.codes
+    if _code_tokens[0] is not codes:
+        _code_tokens = (
+            codes,
+            np.array(sorted(codes, key=codes.get), dtype=object),
+        )
+    return _code_tokens[1]
+
+
+def encode_tokens(grid):
+    """
+    Encode a grid of goal tokens into an integer array.
+
+    Each row is translated with a single dictionary lookup per cell, which is
+    much cheaper than building and sorting an array of strings on large maps.
+
+    Args:
+        grid (list): A list of rows, each one a list of goal tokens.
+
+    Returns:
+        numpy.ndarray: A 2D uint8 array with the code of each cell.
+
+    Raises:
+        ValueError: If the grid contains an unknown token.
+    """
+    codes = token_codes()
+    code = codes.__getitem__
+    try:
+        return np.array([list(map(code, row)) for row in grid], dtype=np.uint8)
+    except KeyError:
+        unknown = sorted(
+            {str(token) for row in grid for token in row if token not in codes}
+        )
+        raise ValueError(f"Unknown goal tokens: {unknown}")
+
+
+def current_to_tokens(content):
+    """
+    Translate the content of the current map into goal tokens.
+
+    Args:
+        content (list): The 'content' field of the current map, where each cell
+            is either None or a dict such as {'type': 1, 'color': 'blue'}.
+
+    Returns:
+        list: A list of rows of goal tokens (e.g. 'SPACE', 'BLUE_SOLOON').
+
+    Raises:
+        ValueError: If a cell has an unknown object type.
+    """
+    return [[REGISTRY.map_cell_token(cell) for cell in row] for row in content]
+
+
+def encode_current(content):
+    """
+    Encode the content of the current map into an integer array.
+
+    Args:
+        content (list): The 'content' field of the current map.
+
+    Returns:
+        numpy.ndarray: A 2D uint8 array using the same codes as `encode_tokens`.
+    """
+    return encode_tokens(current_to_tokens(content))
+
+
+def mismatches(goal, current):
+    """
+    Compare the encoded goal and current states cell by cell.
+
+    Args:
+        goal (numpy.ndarray): The encoded goal map.
+        current (numpy.ndarray): The encoded current map.
+
+    Returns:
+        numpy.ndarray: An (N, 2) array with the (row, column) of every cell
+            whose current state differs from the goal.
+
+    Raises:
+        ValueError: If both maps do not have the same shape.
+    """
+    if goal.shape != current.shape:
+        raise ValueError(
+            f"Goal map shape {goal.shape} does not match current map shape {current.shape}."
+        )
+    return np.argwhere(goal != current)
+
+
+def decode(code):
+    """
+    Translate an integer code back into its goal token.
+
+    Args:
+        code (int): A code produced by `encode_tokens`.
+
+    Returns:
+        str: The matching goal token.
+    """
+    return code_tokens()[code]
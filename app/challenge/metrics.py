@@ -0,0 +1,314 @@
+import json
+import math
+import time
+import threading
+
+from collections import deque
+
+
+class LatencyHistogram:
+    """
+    A thread-safe histogram of request latencies with logarithmic buckets.
+
+    Buckets grow by a constant factor from `minimum` up to `maximum`, so
+    percentiles are accurate to a few percent whatever the latency scale,
+    while memory stays constant however many samples are recorded.
+    """
+
+    def __init__(self, minimum=0.001, maximum=120.0, growth=1.1):
+        """
+        Initializes an empty LatencyHistogram instance.
+
+        Args:
+            minimum (float, optional): Upper bound of the first bucket, in seconds.
+            maximum (float, optional): Latencies above this value share the last bucket.
+            growth (float, optional): Ratio between the bounds of consecutive buckets.
+        """
+        self.minimum = minimum
+        self.growth = growth
+        size = int(math.ceil(math.log(maximum / minimum, growth))) + 2
+        self.bounds = [minimum * growth**index for index in range(size)]
+        self.counts = [0] * size
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency):
+        """
+        Add a latency sample.
+
+        Args:
+            latency (float): The latency, in seconds.
+        """
+        if latency <= self.minimum:
+            index = 0
+        else:
+            index = int(math.ceil(math.log(latency / self.minimum, self.growth)))
+            index = min(index, len(self.counts) - 1)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+
+    def percentile(self, percentile):
+        """
+        Estimate a latency percentile.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            float or None: The upper bound of the bucket holding the percentile,
+                in seconds, or None if no sample was recorded.
+        """
+        with self.lock:
+            counts = list(self.counts)
+            total = self.count
+        if not total:
+            return None
+        target = total * percentile / 100
+        seen = 0
+        for bound, count in zip(self.bounds, counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.bounds[-1]
+
+
+class RateCeiling:
+    """
+    Estimates the request rate at which the API starts rate-limiting.
+
+    Every throttled (429) request samples the rate of the requests accepted
+    over the last `window` seconds, and the ceiling is the mean of those
+    samples. Requests throttled during the first window are not sampled, as
+    the burst of a fresh start would overstate the rate.
+    """
+
+    def __init__(self, window=5.0, clock=time.monotonic):
+        """
+        Initializes a RateCeiling instance.
+
+        Args:
+            window (float, optional): Seconds of requests the rate is measured on.
+            clock (callable, optional): Returns the current time, in seconds.
+        """
+        self.window = window
+        self.clock = clock
+        self.started = None
+        self.accepted = deque()
+        self.samples = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, throttled):
+        """
+        Add a request.
+
+        Args:
+            throttled (bool): Whether the API answered with 429.
+        """
+        now = self.clock()
+        with self.lock:
+            if self.started is None:
+                self.started = now
+            if not throttled:
+                self.accepted.append(now)
+            while self.accepted and self.accepted[0] < now - self.window:
+                self.accepted.popleft()
+            if throttled and now - self.started >= self.window:
+                self.samples += 1
+                self.total += len(self.accepted) / self.window
+
+    @property
+    def ceiling(self):
+        """
+        float or None: Requests per second at which 429s were answered, None
+        if none was.
+        """
+        with self.lock:
+            return self.total / self.samples if self.samples else None
+
+
+class EndpointMetrics:
+    """
+    The request counters of one endpoint of the API.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty EndpointMetrics instance.
+        """
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.ceiling = RateCeiling()
+
+    def summary(self, elapsed):
+        """
+        Summarize the requests of the endpoint.
+
+        Args:
+            elapsed (float): Seconds the run has lasted.
+
+        Returns:
+            dict: The counters, the achieved requests per second, the error rate,
+                the rate ceiling and the latency percentiles of the endpoint.
+        """
+        succeeded = self.requests - self.rate_limited - self.errors
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "requests_per_second": succeeded / elapsed if elapsed else 0.0,
+            "rate_ceiling": self.ceiling.ceiling,
+            "latency_p50": self.latency.percentile(50),
+            "latency_p95": self.latency.percentile(95),
+            "latency_p99": self.latency.percentile(99),
+        }
+
+
+class RunMetrics:
+    """
+    Collects the request and operation counters of a run.
+
+    A run is made of operations (placing or removing one object), and every
+    operation may need several requests when the API rate-limits them. The
+    summary of a finished run can be saved and later used to calibrate
+    estimates for new runs. Counters may be recorded from several threads.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty RunMetrics instance.
+
+        Attributes:
+            started (float): Monotonic time at which the run started.
+            operations (int): Number of finished operations.
+            failures (int): Number of operations that could not be completed.
+            requests (int): Number of requests sent to the API.
+            rate_limited (int): Number of requests rejected with a 429 status.
+            latency_total (float): Sum of the latency of every request, in seconds.
+            latency (LatencyHistogram): The distribution of request latencies.
+            events (dict): Counters of notable events (e.g. circuit breaker transitions).
+            ceiling (RateCeiling): The request rate at which the API rate-limits.
+            endpoints (dict): The `EndpointMetrics` of every endpoint, by name.
+        """
+        self.started = time.monotonic()
+        self.operations = 0
+        self.failures = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.latency_total = 0.0
+        self.latency = LatencyHistogram()
+        self.events = {}
+        self.ceiling = RateCeiling()
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def record_request(self, latency, status=None, endpoint=None):
+        """
+        Record a request sent to the API.
+
+        Args:
+            latency (float): Time spent waiting for the response, in seconds.
+            status (int, optional): The HTTP status of the response, if any.
+            endpoint (str, optional): The endpoint of the request (e.g. 'soloon').
+        """
+        self.latency.record(latency)
+        self.ceiling.record(status == 429)
+        with self.lock:
+            self.requests += 1
+            self.latency_total += latency
+            if status == 429:
+                self.rate_limited += 1
+            if endpoint is None:
+                return
+            if endpoint not in self.endpoints:
+                self.endpoints[endpoint] = EndpointMetrics()
+            stats = self.endpoints[endpoint]
+            stats.requests += 1
+            if status == 429:
+                stats.rate_limited += 1
+            elif isinstance(status, int) and status >= 400:
+                stats.errors += 1
+        stats.latency.record(latency)
+        stats.ceiling.record(status == 429)
+
+    def record_operation(self, success):
+        """
+        Record a finished operation.
+
+        Args:
+            success (bool): Whether the operation was completed.
+        """
+        with self.lock:
+            self.operations += 1
+            if not success:
+                self.failures += 1
+
+    def record_event(self, name):
+        """
+        Count a notable event of the run.
+
+        Args:
+            name (str): The name of the event (e.g. 'circuit_open').
+        """
+        with self.lock:
+            self.events[name] = self.events.get(name, 0) + 1
+
+    def summary(self):
+        """
+        Summarize the run.
+
+        Returns:
+            dict: The counters of the run, its elapsed time and the derived
+                throughput and latency mean and percentiles, the rate ceiling,
+                the event counters and the summary of every endpoint.
+        """
+        elapsed = time.monotonic() - self.started
+        with self.lock:
+            endpoints = dict(self.endpoints)
+        return {
+            "operations": self.operations,
+            "failures": self.failures,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "elapsed": elapsed,
+            "latency_mean": (
+                self.latency_total / self.requests if self.requests else 0.0
+            ),
+            "operations_per_second": self.operations / elapsed if elapsed else 0.0,
+            "latency_p50": self.latency.percentile(50),
+            "latency_p95": self.latency.percentile(95),
+            "latency_p99": self.latency.percentile(99),
+            "rate_ceiling": self.ceiling.ceiling,
+            "events": dict(self.events),
+            "endpoints": {
+                name: stats.summary(elapsed) for name, stats in endpoints.items()
+            },
+        }
+
+    def save(self, path):
+        """
+        Write the summary of the run to a JSON file.
+
+        Args:
+            path (str): The destination file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    @staticmethod
+    def load(path):
+        """
+        Read a summary previously written by `save`.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            dict: The saved summary.
+        """
+        with open(path) as file:
+            return json.load(file)
@@ -0,0 +1,227 @@
+import time
+import queue
+import threading
+
+from collections import namedtuple
+
+
+# Marks the end of the items of a queue
+_DONE = object()
+# Seconds between two checks of the stop flag while waiting on a queue
+_POLL = 0.05
+
+
+class StageStats(
+    namedtuple(
+        "StageStats",
+        ["name", "workers", "items_in", "items_out", "busy", "blocked", "elapsed"],
+    )
+):
+    """
+    How busy one stage of a pipeline was during a run.
+
+    Attributes:
+        name (str): The name of the stage.
+        workers (int): Number of threads running the stage.
+        items_in (int): Number of items the stage consumed.
+        items_out (int): Number of items the stage produced.
+        busy (float): Seconds spent in the stage function, over all its workers.
+        blocked (float): Seconds spent waiting for room in the next queue.
+        elapsed (float): Wall time of the run, in seconds.
+    """
+
+    __slots__ = ()
+
+    @property
+    def utilization(self):
+        """
+        float: The fraction of the run its workers spent working, between 0 and 1.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.busy / (self.elapsed * self.workers)
+
+
+def combine_stats(runs):
+    """
+    Add up the statistics of several runs of the same stages.
+
+    Args:
+        runs (list): The `Pipeline.stats` of every run.
+
+    Returns:
+        list: One `StageStats` per stage, counting every run.
+    """
+    runs = [stats for stats in runs if stats]
+    if len(runs) == 1:
+        return runs[0]
+    return [
+        StageStats(
+            stages[0].name,
+            stages[0].workers,
+            sum(stage.items_in for stage in stages),
+            sum(stage.items_out for stage in stages),
+            sum(stage.busy for stage in stages),
+            sum(stage.blocked for stage in stages),
+            sum(stage.elapsed for stage in stages),
+        )
+        for stages in zip(*runs)
+    ]
+
+
+class Stage:
+    """
+    One step of a `Pipeline`, run by one or several threads.
+
+    The function of a stage takes one item and returns (or yields) the items
+    passed to the next stage, none or several of them. The first stage is the
+    source of the run: its function takes no argument, returns all the items
+    of the run and is called once, so it always runs in a single thread.
+    """
+
+    def __init__(self, name, function, workers=1):
+        """
+        Initializes a Stage instance.
+
+        Args:
+            name (str): The name of the stage, used in its statistics.
+            function (callable): The work of the stage.
+            workers (int, optional): Number of threads running the stage.
+        """
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """
+    Stages running concurrently, connected by bounded queues.
+
+    Every stage runs in its own threads and hands its items to the next one
+    through a queue holding at most `queue_size` items. A stage producing
+    faster than the next one consumes blocks on the full queue, so memory stays
+    constant however many items flow through the pipeline, and a slow request
+    no longer stalls the stages before it.
+
+    The first error raised by a stage stops every stage and is raised by `run`.
+    """
+
+    def __init__(self, stages, queue_size=64):
+        """
+        Initializes a Pipeline instance.
+
+        Args:
+            stages (list): The `Stage` instances, the source first.
+            queue_size (int, optional): Maximum number of items waiting between two stages.
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats = []
+
+    def run(self):
+        """
+        Run the stages until the source is exhausted and every item went through.
+
+        Returns:
+            list: The `StageStats` of every stage, in order.
+
+        Raises:
+            Exception: The first error raised by a stage.
+        """
+        queues = [queue.Queue(self.queue_size) for _ in self.stages[1:]]
+        stopped = threading.Event()
+        lock = threading.Lock()
+        errors = []
+        counters = [[0, 0, 0.0, 0.0] for _ in self.stages]
+        workers = [1] + [stage.workers for stage in self.stages[1:]]
+        running = list(workers)
+
+        def put(index, item):
+            # Returns how long the put waited for room
+            if index >= len(queues):
+                return 0.0
+            started = time.perf_counter()
+            while not stopped.is_set():
+                try:
+                    queues[index].put(item, timeout=_POLL)
+                    break
+                except queue.Full:
+                    pass
+            return time.perf_counter() - started
+
+        def get(index):
+            while not stopped.is_set():
+                try:
+                    return queues[index].get(timeout=_POLL)
+                except queue.Empty:
+                    pass
+            return _DONE
+
+        def work(index, stage):
+            items_in = items_out = 0
+            busy = blocked = 0.0
+            try:
+                source = index == 0
+                while not stopped.is_set():
+                    started = time.perf_counter()
+                    if source:
+                        outputs = stage.function()
+                    else:
+                        item = get(index - 1)
+                        if item is _DONE:
+                            break
+                        started = time.perf_counter()
+                        outputs = stage.function(item)
+                        items_in += 1
+                    busy += time.perf_counter() - started
+                    if outputs is None:
+                        continue
+                    iterator = iter(outputs)
+                    while not stopped.is_set():
+                        started = time.perf_counter()
+                        output = next(iterator, _DONE)
+                        busy += time.perf_counter() - started
+                        if output is _DONE:
+                            break
+                        blocked += put(index, output)
+                        items_out += 1
+                    if source:
+                        break
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                stopped.set()
+            finally:
+                with lock:
+                    counter = counters[index]
+                    counter[0] += items_in
+                    counter[1] += items_out
+                    counter[2] += busy
+                    counter[3] += blocked
+                    running[index] -= 1
+                    last = running[index] == 0
+                # The last worker of a stage tells every worker of the next one
+                if last and index + 1 < len(self.stages):
+                    for _ in range(workers[index + 1]):
+                        put(index, _DONE)
+
+        threads = [
+            threading.Thread(
+                target=work, args=(index, stage), name=f"pipeline-{stage.name}"
+            )
+            for index, stage in enumerate(self.stages)
+            for _ in range(workers[index])
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        self.stats = [
+            StageStats(stage.name, count, *counter, elapsed)
+            for stage, count, counter in zip(self.stages, workers, counters)
+        ]
+        if errors:
+            raise errors[0]
+        return self.stats
@@ -0,0 +1,251 @@
+import numpy as np
+
+from . import megaverse_state
+from app.astral_objects.registry import REGISTRY
+
+
+class Plan:
+    """
+    The set of operations needed to build a goal map on an empty megaverse.
+
+    Operations are stored as parallel numpy arrays (row, column, token code)
+    so plans for very large maps can be built and inspected without creating
+    one Python object per cell.
+    """
+
+    def __init__(self, rows, columns, codes):
+        """
+        Initializes a Plan instance.
+
+        Args:
+            rows (numpy.ndarray): Row index of every operation.
+            columns (numpy.ndarray): Column index of every operation.
+            codes (numpy.ndarray): Token code (see `megaverse_state`) of every operation.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.codes = codes
+
+    @classmethod
+    def from_goal_map(cls, goal_map):
+        """
+        Build the plan for a goal map.
+
+        Args:
+            goal_map (list): A list of rows, each one a list of goal tokens.
+
+        Returns:
+            Plan: One operation per cell that is not 'SPACE', in row-major order.
+
+        Raises:
+            ValueError: If the goal map contains an unknown token.
+        """
+        codes = megaverse_state.encode_tokens(goal_map)
+        rows, columns = np.nonzero(codes != megaverse_state.SPACE_CODE)
+        return cls(rows, columns, codes[rows, columns])
+
+    @classmethod
+    def from_region(cls, goal_map, region):
+        """
+        Build the plan for the cells of a region of a goal map.
+
+        Only the rectangles of the region (and a one cell margin) are read from
+        the goal map. Objects outside the region that objects inside it depend
+        on are planned too (see `Region.windows`).
+
+        Args:
+            goal_map (list): A list of rows, each one a list of goal tokens.
+            region (Region): The region.
+
+        Returns:
+            Plan: One operation per cell that is not 'SPACE', piece by piece.
+
+        Raises:
+            ValueError: If the goal map contains an unknown token.
+        """
+        rows, columns, codes = [], [], []
+        for window, goal, inner, supports in region.windows(goal_map):
+            cells = (inner | supports) & (goal != megaverse_state.SPACE_CODE)
+            window_rows, window_columns = np.nonzero(cells)
+            rows.append(window_rows + window.top)
+            columns.append(window_columns + window.left)
+            codes.append(goal[cells])
+        rows = np.concatenate([np.zeros(0, dtype=np.int64)] + rows)
+        columns = np.concatenate([np.zeros(0, dtype=np.int64)] + columns)
+        codes = np.concatenate([np.zeros(0, dtype=np.uint8)] + codes)
+        return cls(rows, columns, codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def counts(self):
+        """
+        Count the operations of the plan per object kind.
+
+        Returns:
+            dict: A dictionary mapping lowercase class names (e.g. 'soloon') to
+                their number of operations. Kinds without operations are omitted.
+        """
+        per_code = np.bincount(self.codes, minlength=len(megaverse_state.token_codes()))
+        counts = {}
+        for descriptor in REGISTRY.tokens.values():
+            if per_code[descriptor.code]:
+                counts[descriptor.name] = counts.get(descriptor.name, 0) + int(
+                    per_code[descriptor.code]
+                )
+        return counts
+
+    def clusters(self):
+        """
+        Group the operations of the plan into dependency-complete clusters.
+
+        Every object depending on another type (e.g. a soloon) joins the
+        cluster of one of its neighbours of that type (e.g. a polyanet), so a
+        cluster is an object other objects depend on followed by its dependents.
+        Objects with no such neighbour and objects no one depends on (e.g.
+        comeths) form clusters of their own.
+
+        Returns:
+            list: One array of operation indexes per cluster, the object depended
+                on first. Smaller clusters come first, ties in plan order.
+        """
+        count = len(self)
+        if not count:
+            return []
+        indexes = np.arange(count)
+        key = indexes.copy()
+        # Cells are looked up by a sorted integer key, so the cost does not
+        # depend on how far apart the operations are.
+        stride = int(self.columns.max()) + 3
+        cells = (self.rows.astype(np.int64) + 1) * stride + self.columns + 1
+        anchors = np.isin(self.codes, _codes(REGISTRY.dependencies()))
+        for name, cls in REGISTRY.types.items():
+            if not cls.depends_on:
+                continue
+            support = indexes[anchors & np.isin(self.codes, _codes(cls.depends_on))]
+            dependents = indexes[np.isin(self.codes, _codes([name])) & ~anchors]
+            if not len(support) or not len(dependents):
+                continue
+            support = support[np.argsort(cells[support], kind="stable")]
+            found = np.full(len(dependents), -1, dtype=np.int64)
+            for step in (-stride, -1, stride, 1):
+                wanted = cells[dependents] + step
+                position = np.searchsorted(cells[support], wanted)
+                position = np.minimum(position, len(support) - 1)
+                neighbour = np.where(
+                    cells[support[position]] == wanted, support[position], -1
+                )
+                found = np.where(found >= 0, found, neighbour)
+            key[dependents] = np.where(found >= 0, found, dependents)
+        sizes = np.bincount(key, minlength=count)[key]
+        order = np.lexsort((indexes, indexes != key, key, sizes))
+        return np.split(order, np.flatnonzero(np.diff(key[order])) + 1)
+
+    def operations(self):
+        """
+        Iterate over the operations of the plan.
+
+        Yields:
+            tuple: (row, column, token) for every operation, in plan order.
+        """
+        for row, col, code in zip(self.rows, self.columns, self.codes):
+            yield int(row), int(col), megaverse_state.decode(code)
+
+
+def _codes(names):
+    """
+    Return the token codes of every token of the given object types.
+    """
+    return [
+        descriptor.code
+        for descriptor in REGISTRY.tokens.values()
+        if descriptor.name in names
+    ]
+
+
+class CostModel:
+    """
+    Estimates how long a plan takes to run against the API.
+
+    The model assumes every request takes `latency` seconds, that up to
+    `concurrency` requests are in flight at once and that the API accepts at
+    most `rate_limit` requests per second. Rate-limited requests are accounted
+    for through `retry_ratio`, the extra requests sent per operation.
+    """
+
+    def __init__(self, latency=0.5, rate_limit=None, concurrency=1, retry_ratio=0.0):
+        """
+        Initializes a CostModel instance.
+
+        Args:
+            latency (float, optional): Seconds spent per request.
+            rate_limit (float, optional): Maximum requests per second, None for unlimited.
+            concurrency (int, optional): Number of requests in flight at once.
+            retry_ratio (float, optional): Extra requests per operation due to retries.
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.concurrency = concurrency
+        self.retry_ratio = retry_ratio
+
+    @classmethod
+    def from_metrics(cls, summary, rate_limit=None, concurrency=1):
+        """
+        Calibrate a model from the metrics of an earlier run.
+
+        The latency is the mean latency of the requests of that run, which does
+        not depend on the concurrency it used, so the estimate scales with the
+        `concurrency` of the new run. Summaries without a mean latency fall back
+        to the elapsed time per request, as if that run was serial.
+
+        Args:
+            summary (dict): A summary produced by `RunMetrics.summary`.
+            rate_limit (float, optional): Maximum requests per second, None for unlimited.
+            concurrency (int, optional): Number of requests in flight at once.
+
+        Returns:
+            CostModel: The calibrated model.
+
+        Raises:
+            ValueError: If the summary does not contain any request.
+        """
+        if not summary.get("requests") or not summary.get("operations"):
+            raise ValueError(
+                "The metrics do not contain any request to calibrate from."
+            )
+        return cls(
+            latency=(
+                summary.get("latency_mean") or summary["elapsed"] / summary["requests"]
+            ),
+            rate_limit=rate_limit,
+            concurrency=concurrency,
+            retry_ratio=summary["requests"] / summary["operations"] - 1,
+        )
+
+    def requests(self, operations):
+        """
+        Estimate the number of requests needed for a number of operations.
+
+        Args:
+            operations (int): The number of operations.
+
+        Returns:
+            int: The estimated number of requests.
+        """
+        return int(round(operations * (1 + self.retry_ratio)))
+
+    def estimate(self, operations):
+        """
+        Estimate the wall time needed for a number of operations.
+
+        Args:
+            operations (int): The number of operations.
+
+        Returns:
+            float: The estimated wall time, in seconds.
+        """
+        requests = self.requests(operations)
+        seconds = requests * self.latency / self.concurrency
+        if self.rate_limit:
+            seconds = max(seconds, requests / self.rate_limit)
+        return seconds
@@ -0,0 +1,245 @@
+import numpy as np
+
+from collections import namedtuple
+from app.astral_objects.registry import REGISTRY
+from . import megaverse_state
+from .planner import _codes
+from .simulator import adjacent
+
+
+class Rectangle(namedtuple("Rectangle", ["top", "bottom", "left", "right"])):
+    """
+    A block of cells, from row `top` to `bottom` and column `left` to `right`.
+
+    Bounds follow Python slices: the end is excluded and None leaves the side
+    open, up to the edge of the megaverse.
+
+    Attributes:
+        top (int or None): The first row.
+        bottom (int or None): The row after the last one.
+        left (int or None): The first column.
+        right (int or None): The column after the last one.
+    """
+
+    __slots__ = ()
+
+    def clip(self, rows, columns):
+        """
+        Bound the rectangle to a megaverse.
+
+        Args:
+            rows (int): Number of rows of the megaverse.
+            columns (int): Number of columns of the megaverse.
+
+        Returns:
+            Rectangle: The rectangle with every bound set and inside the megaverse.
+        """
+        top, bottom, _ = slice(self.top, self.bottom).indices(rows)
+        left, right, _ = slice(self.left, self.right).indices(columns)
+        return Rectangle(top, max(top, bottom), left, max(left, right))
+
+    def grow(self, margin, rows, columns):
+        """
+        Widen a clipped rectangle on every side, within the megaverse.
+
+        Returns:
+            Rectangle: The widened rectangle.
+        """
+        return Rectangle(
+            max(0, self.top - margin),
+            min(rows, self.bottom + margin),
+            max(0, self.left - margin),
+            min(columns, self.right + margin),
+        )
+
+    @property
+    def empty(self):
+        """
+        bool: Whether a clipped rectangle holds no cell.
+        """
+        return self.bottom <= self.top or self.right <= self.left
+
+    def window(self, grid):
+        """
+        Slice the cells of a clipped rectangle out of a grid.
+
+        Args:
+            grid (list): A list of rows.
+
+        Returns:
+            list: The rows of the rectangle, each one cut to its columns.
+        """
+        return [row[self.left : self.right] for row in grid[self.top : self.bottom]]
+
+
+class Region:
+    """
+    A part of the megaverse made of one or several rectangles.
+
+    Working on a region only slices the rectangles (plus a one cell margin)
+    out of the goal and current maps, so its cost grows with the size of the
+    region, not of the megaverse. Cells covered by several rectangles belong
+    to the first one.
+    """
+
+    def __init__(self, rectangles):
+        """
+        Initializes a Region instance.
+
+        Args:
+            rectangles (list): `Rectangle` instances or (top, bottom, left, right) tuples.
+        """
+        self.rectangles = [Rectangle(*rectangle) for rectangle in rectangles]
+
+    @staticmethod
+    def parse(text):
+        """
+        Parse a rectangle given as 'ROWS[,COLUMNS]'.
+
+        Rows and columns are slices, e.g. '10:20,30:40', '100:' or '5', and an
+        empty part selects every row or column.
+
+        Args:
+            text (str): The rectangle.
+
+        Returns:
+            Rectangle: The parsed rectangle.
+
+        Raises:
+            ValueError: If the text is not a rectangle.
+        """
+        parts = text.split(",")
+        if len(parts) > 2:
+            raise ValueError(f"Invalid region {text!r}, expected ROWS[,COLUMNS]")
+        bounds = []
+        for part in parts + [""] * (2 - len(parts)):
+            part = part.strip()
+            if ":" in part:
+                start, stop = part.split(":")
+                bounds += [int(start) if start else None, int(stop) if stop else None]
+            elif part:
+                bounds += [int(part), int(part) + 1]
+            else:
+                bounds += [None, None]
+        return Rectangle(*bounds)
+
+    def pieces(self, rows, columns):
+        """
+        Split the region into disjoint parts of its rectangles.
+
+        Args:
+            rows (int): Number of rows of the megaverse.
+            columns (int): Number of columns of the megaverse.
+
+        Yields:
+            tuple: (rectangle, owned), a clipped non-empty rectangle and a
+                boolean array of its shape telling which of its cells are not
+                covered by an earlier rectangle.
+        """
+        earlier = []
+        for rectangle in self.rectangles:
+            rectangle = rectangle.clip(rows, columns)
+            if rectangle.empty:
+                continue
+            owned = np.ones(
+                (rectangle.bottom - rectangle.top, rectangle.right - rectangle.left),
+                dtype=bool,
+            )
+            for other in earlier:
+                owned[self._overlap(rectangle, other)] = False
+            earlier.append(rectangle)
+            yield rectangle, owned
+
+    def mask(self, window, rows, columns):
+        """
+        Tell which cells of a window of the megaverse are in the region.
+
+        Args:
+            window (Rectangle): A clipped rectangle.
+            rows (int): Number of rows of the megaverse.
+            columns (int): Number of columns of the megaverse.
+
+        Returns:
+            numpy.ndarray: A boolean array of the shape of the window.
+        """
+        mask = np.zeros(
+            (window.bottom - window.top, window.right - window.left), dtype=bool
+        )
+        for rectangle in self.rectangles:
+            rectangle = rectangle.clip(rows, columns)
+            overlap = self._overlap(window, rectangle)
+            mask[overlap] = True
+        return mask
+
+    def windows(self, goal_map):
+        """
+        Slice the goal map around every piece of the region.
+
+        Args:
+            goal_map (list): A list of rows of goal tokens.
+
+        Yields:
+            tuple: (window, goal, inner, supports) for every piece: the piece
+                grown by one cell on every side, the goal codes of that window,
+                a boolean array of the cells of the piece and a boolean array
+                of the supports outside the region its objects need (see
+                `boundary_supports`) not already yielded by an earlier piece.
+
+        Raises:
+            ValueError: If the goal map contains an unknown token.
+        """
+        rows = len(goal_map)
+        columns = len(goal_map[0]) if rows else 0
+        seen = set()
+        for rectangle, owned in self.pieces(rows, columns):
+            window = rectangle.grow(1, rows, columns)
+            goal = megaverse_state.encode_tokens(window.window(goal_map))
+            inner = np.zeros(goal.shape, dtype=bool)
+            top, left = rectangle.top - window.top, rectangle.left - window.left
+            inner[top : top + owned.shape[0], left : left + owned.shape[1]] = owned
+            supports = boundary_supports(goal, inner, self.mask(window, rows, columns))
+            for row, column in np.argwhere(supports):
+                cell = (window.top + int(row), window.left + int(column))
+                if cell in seen:
+                    supports[row, column] = False
+                seen.add(cell)
+            yield window, goal, inner, supports
+
+    def __repr__(self):
+        return f"Region({self.rectangles})"
+
+    @staticmethod
+    def _overlap(window, other):
+        # The cells of `other` as slices of `window`, empty when they do not meet
+        top = min(max(other.top, window.top), window.bottom) - window.top
+        bottom = min(max(other.bottom, window.top), window.bottom) - window.top
+        left = min(max(other.left, window.left), window.right) - window.left
+        right = min(max(other.right, window.left), window.right) - window.left
+        return slice(top, max(top, bottom)), slice(left, max(left, right))
+
+
+def boundary_supports(goal, inner, region):
+    """
+    Find the objects outside a region that objects inside it depend on.
+
+    An object of the region depending on another type (e.g. a soloon) and
+    with no neighbour of that type inside the region needs its neighbours of
+    that type just outside it (e.g. a polyanet across the boundary).
+
+    Args:
+        goal (numpy.ndarray): The goal codes of a window of the megaverse.
+        inner (numpy.ndarray): Boolean array of the cells of the window considered.
+        region (numpy.ndarray): Boolean array of the cells of the window in the region.
+
+    Returns:
+        numpy.ndarray: Boolean array of the supports needed outside the region.
+    """
+    needed = np.zeros(goal.shape, dtype=bool)
+    for name, cls in REGISTRY.types.items():
+        if not cls.depends_on:
+            continue
+        supports = np.isin(goal, _codes(cls.depends_on))
+        dependents = np.isin(goal, _codes([name])) & inner
+        needy = dependents & ~adjacent(supports & region)
+        needed |= adjacent(needy) & supports & ~region
+    return needed
@@ -0,0 +1,293 @@
+import numpy as np
+
+from collections import namedtuple
+from . import megaverse_state
+from app.astral_objects.registry import REGISTRY
+
+
+class Violation(namedtuple("Violation", ["step", "row", "column", "token", "rule"])):
+    """
+    A rule of the megaverse broken by a goal map or a plan.
+
+    Attributes:
+        step (int or None): The phase of the plan breaking the rule, None for a goal map.
+        row (int): The row of the cell.
+        column (int): The column of the cell.
+        token (str): The goal token of the object (e.g. 'RED_SOLOON').
+        rule (str): A description of the broken rule.
+    """
+
+    __slots__ = ()
+
+
+def adjacent(mask):
+    """
+    Find the cells with at least one of their four neighbours set in a mask.
+
+    Args:
+        mask (numpy.ndarray): A 2D boolean array.
+
+    Returns:
+        numpy.ndarray: A 2D boolean array of the same shape.
+    """
+    result = np.zeros_like(mask)
+    result[1:, :] |= mask[:-1, :]
+    result[:-1, :] |= mask[1:, :]
+    result[:, 1:] |= mask[:, :-1]
+    result[:, :-1] |= mask[:, 1:]
+    return result
+
+
+class MegaverseSimulator:
+    """
+    An in-process megaverse applying goal maps and plans without calling the API.
+
+    The state is a 2D array of token codes (see `megaverse_state`). Rules come
+    from the registry: an object type with `depends_on` must be placed next to
+    (above, below, left or right of) an object of one of those types, and an
+    object carrying an attribute must use one of its allowed values. Checks are
+    done on whole arrays, so large maps are simulated in milliseconds.
+    """
+
+    def __init__(self, rows, columns, state=None):
+        """
+        Initializes a MegaverseSimulator instance.
+
+        Args:
+            rows (int): Number of rows of the megaverse.
+            columns (int): Number of columns of the megaverse.
+            state (numpy.ndarray, optional): The initial token codes, an empty
+                megaverse when not given.
+        """
+        if state is None:
+            state = np.zeros((rows, columns), dtype=np.uint8)
+        self.state = state
+        types = REGISTRY.types
+        self.rules = []
+        for name, cls in types.items():
+            if not cls.depends_on:
+                continue
+            codes = self._codes(name)
+            required = self._codes(*cls.depends_on)
+            self.rules.append(
+                (
+                    codes,
+                    required,
+                    f"{name} must be next to {' or '.join(cls.depends_on)}",
+                )
+            )
+        self.dependencies = self._codes(*REGISTRY.dependencies())
+        # The plain token of a type carrying an attribute (e.g. 'SOLOON') has no value
+        self.attribute_rules = [
+            (descriptor.code, f"{descriptor.name} must have a {descriptor.field}")
+            for descriptor in REGISTRY.tokens.values()
+            if descriptor.field and descriptor.value is None
+        ]
+        self.operation_codes = {
+            (descriptor.name, descriptor.value): descriptor.code
+            for descriptor in REGISTRY.tokens.values()
+        }
+
+    @classmethod
+    def from_current(cls, content):
+        """
+        Build a simulator starting from the current map of the API.
+
+        Args:
+            content (list): The 'content' field of the current map.
+
+        Returns:
+            MegaverseSimulator: A simulator holding the current state.
+        """
+        state = megaverse_state.encode_current(content)
+        return cls(*state.shape, state=state)
+
+    def check(self):
+        """
+        Check the current state against the adjacency and attribute rules.
+
+        Returns:
+            list: The violations of the current state, with a None step.
+        """
+        return self._adjacency(self.state, self.state, None) + self._attributes(
+            self.state, None
+        )
+
+    def apply_goal(self, goal_map):
+        """
+        Replace the state with a goal map and check it.
+
+        The solver places the objects other objects depend on first, so only
+        the final layout matters.
+
+        Args:
+            goal_map (list): A list of rows of goal tokens.
+
+        Returns:
+            list: The violations of the goal map.
+
+        Raises:
+            ValueError: If the goal map contains an unknown token or does not
+                have the shape of the megaverse.
+        """
+        goal = megaverse_state.encode_tokens(goal_map)
+        if goal.shape != self.state.shape:
+            raise ValueError(
+                f"Goal map of shape {goal.shape} for a megaverse of shape {self.state.shape}"
+            )
+        self.state = goal
+        return self.check()
+
+    def apply_plan(self, plan):
+        """
+        Apply a `Plan` the way the solver sends it.
+
+        The objects other objects depend on are posted in a first phase and
+        the others in a second one.
+
+        Args:
+            plan (Plan): The plan to apply.
+
+        Returns:
+            list: The violations of the plan, with the index of their phase.
+        """
+        first = np.isin(plan.codes, self.dependencies)
+        violations = []
+        for step, mask in enumerate((first, ~first)):
+            violations.extend(
+                self._apply(step, plan.rows[mask], plan.columns[mask], plan.codes[mask])
+            )
+        return violations
+
+    def apply_phases(self, phases):
+        """
+        Apply a plan of operations phase by phase, the way `run_phases` sends it.
+
+        The operations of a phase run concurrently, so a post is only backed by
+        the objects present when its phase starts and not deleted by it. An
+        object left without support by a delete is reported too. Invalid
+        operations (out of the megaverse, unknown object or attribute) are
+        reported and skipped.
+
+        Args:
+            phases (list): A list of lists of operations.
+
+        Returns:
+            list: The violations of the plan, with the index of their phase.
+        """
+        violations = []
+        rows_count, columns_count = self.state.shape
+        for step, operations in enumerate(phases):
+            count = len(operations)
+            rows = np.fromiter((o.row for o in operations), np.int64, count)
+            columns = np.fromiter((o.column for o in operations), np.int64, count)
+            # Deletes leave 'SPACE' (0), unknown posts are marked with -1
+            codes = np.fromiter(
+                (
+                    (
+                        self.operation_codes.get((o.name, o.attribute), -1)
+                        if o.action == "post"
+                        else 0
+                    )
+                    for o in operations
+                ),
+                np.int16,
+                count,
+            )
+            inside = (
+                (rows >= 0)
+                & (rows < rows_count)
+                & (columns >= 0)
+                & (columns < columns_count)
+            )
+            valid = inside & (codes >= 0)
+            for index in np.flatnonzero(~valid):
+                operation = operations[index]
+                violations.append(
+                    Violation(
+                        step,
+                        operation.row,
+                        operation.column,
+                        f"{operation.attribute or ''} {operation.name}".strip(),
+                        (
+                            "unknown object"
+                            if inside[index]
+                            else "outside of the megaverse"
+                        ),
+                    )
+                )
+            violations.extend(
+                self._apply(
+                    step, rows[valid], columns[valid], codes[valid].astype(np.uint8)
+                )
+            )
+        return violations
+
+    def tokens(self):
+        """
+        Return the state as goal tokens.
+
+        Returns:
+            list: A list of rows of goal tokens.
+        """
+        return megaverse_state.code_tokens()[self.state].tolist()
+
+    def _codes(self, *names):
+        return np.array(
+            [
+                descriptor.code
+                for descriptor in REGISTRY.tokens.values()
+                if descriptor.name in names
+            ],
+            dtype=np.uint8,
+        )
+
+    def _apply(self, step, rows, columns, codes):
+        before = self.state
+        after = before.copy()
+        after[rows, columns] = codes
+        # Posts of a phase are only backed by what existed before it
+        placed = np.zeros(before.shape, dtype=bool)
+        placed[rows[codes != 0], columns[codes != 0]] = True
+        # Deleted objects back nothing from the start of their phase, and the
+        # objects left next to them are checked again
+        removed = (before != 0) & (after == 0)
+        support = np.where(removed, 0, before)
+        checked = placed | (adjacent(removed) & (after != 0))
+        self.state = after
+        return self._adjacency(after, support, step, checked) + self._attributes(
+            after, step, placed
+        )
+
+    def _adjacency(self, placed, support, step, only=None):
+        violations = []
+        for codes, required, rule in self.rules:
+            orphans = np.isin(placed, codes) & ~adjacent(np.isin(support, required))
+            if only is not None:
+                orphans &= only
+            orphans = np.argwhere(orphans)
+            violations.extend(
+                Violation(
+                    step,
+                    int(row),
+                    int(column),
+                    megaverse_state.decode(placed[row, column]),
+                    rule,
+                )
+                for row, column in orphans
+            )
+        return violations
+
+    def _attributes(self, placed, step, only=None):
+        violations = []
+        for code, rule in self.attribute_rules:
+            missing = placed == code
+            if only is not None:
+                missing &= only
+            violations.extend(
+                Violation(
+                    step, int(row), int(column), megaverse_state.decode(code), rule
+                )
+                for row, column in np.argwhere(missing)
+            )
+        return violations
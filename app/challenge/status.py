@@ -0,0 +1,164 @@
+import json
+import time
+import logging
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatusServer:
+    """
+    Serves the progress of a running challenge as JSON on a local HTTP port.
+
+    A sampler thread reads the counters of the challenge every `interval`
+    seconds, encodes them once and swaps the result in as a single reference.
+    Requests only send the last encoded snapshot, so however often the status
+    is polled, the solver's state is read once per interval.
+
+    `GET /status` returns the cells of the current solve in all, planned so
+    far, done, failed, skipped and remaining, the operations finished per
+    second over the last interval, the operations in flight and waiting for a
+    retry after a 429, the state of the rate limiter and the latency
+    percentiles.
+    """
+
+    def __init__(self, challenge, port=0, host="127.0.0.1", interval=1.0):
+        """
+        Initializes a StatusServer instance.
+
+        Args:
+            challenge (ChallengeGoal): The challenge whose progress is served.
+            port (int, optional): Port to listen on, 0 picks a free one.
+            host (str, optional): Address to listen on, local only by default.
+            interval (float, optional): Seconds between two snapshots.
+        """
+        self.challenge = challenge
+        self.interval = interval
+        self.body = b"{}"
+        self.last = None
+        self.stopped = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.threads = []
+
+    @property
+    def url(self):
+        """
+        str: The URL of the status.
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/status"
+
+    def start(self):
+        """
+        Take a first snapshot and start serving in background threads.
+
+        Returns:
+            StatusServer: The server itself.
+        """
+        self.sample()
+        self.threads = [
+            threading.Thread(target=self._sample_forever, name="status-sampler"),
+            threading.Thread(target=self.httpd.serve_forever, name="status-server"),
+        ]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+        return self
+
+    def close(self):
+        """
+        Stop sampling and serving.
+        """
+        self.stopped.set()
+        if self.threads:
+            self.httpd.shutdown()
+            for thread in self.threads:
+                thread.join()
+        self.httpd.server_close()
+
+    def sample(self):
+        """
+        Take a snapshot of the progress and publish it.
+
+        Returns:
+            dict: The snapshot.
+        """
+        challenge = self.challenge
+        metrics = challenge.metrics
+        executor = challenge.executor
+        now = time.monotonic()
+        operations = metrics.operations
+        throughput = 0.0
+        if self.last is not None and now > self.last[0]:
+            throughput = (operations - self.last[1]) / (now - self.last[0])
+        self.last = (now, operations)
+
+        report = challenge.report
+        total = challenge.total
+        done = failed = skipped = 0
+        if report is not None:
+            done, failed, skipped = (
+                report.succeeded,
+                len(report.failed),
+                len(report.skipped),
+            )
+        limiter = executor.rate_limiter
+        snapshot = {
+            "elapsed": now - metrics.started,
+            "cells": {
+                "total": total,
+                "planned": challenge.planned,
+                "done": done,
+                "failed": failed,
+                "skipped": skipped,
+                "remaining": (
+                    None if total is None else total - done - failed - skipped
+                ),
+                "solving": challenge.solving,
+            },
+            "operations": operations,
+            "throughput": throughput,
+            "in_flight": executor.in_flight,
+            "retry_queue": executor.backing_off,
+            "requests": metrics.requests,
+            "rate_limited": metrics.rate_limited,
+            "rate_limiter": limiter.state() if limiter else None,
+            "latency": {
+                "p50": metrics.latency.percentile(50),
+                "p95": metrics.latency.percentile(95),
+                "p99": metrics.latency.percentile(99),
+            },
+        }
+        self.body = json.dumps(snapshot).encode()
+        return snapshot
+
+    def _sample_forever(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Could not sample the status: {e}")
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/status"):
+                    self.send_error(404)
+                    return
+                body = server.body
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,209 @@
+import json
+import struct
+import logging
+import threading
+import numpy as np
+
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CMTRACE1"
+ACTIONS = ("post", "delete")
+
+# One fixed-width little-endian record per request, 29 bytes
+RECORD = struct.Struct("<dBBIIHBfI")
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("action", "u1"),
+        ("endpoint", "u1"),
+        ("row", "<u4"),
+        ("column", "<u4"),
+        ("status", "<u2"),
+        ("attempt", "u1"),
+        ("latency", "<f4"),
+        ("bytes", "<u4"),
+    ]
+)
+
+
+class TraceWriter:
+    """
+    An append-only binary trace with one fixed-width record per request.
+
+    Every record holds the wall time the request started, its action and
+    endpoint, its cell, the HTTP status (0 without a response), the attempt
+    number, the latency in seconds and the size of the body sent. Recording
+    only appends a tuple to a queue; a background thread packs the records
+    and writes them in batches. When a write fails the error is logged, no
+    more records are kept and `close` raises it.
+    """
+
+    def __init__(self, path, endpoints, flush_interval=0.5):
+        """
+        Initializes a TraceWriter instance and starts its background thread.
+
+        Args:
+            path (str): Where the trace is written.
+            endpoints (list): Names of the endpoints (e.g. 'soloon'); the
+                records store their index in this list, 255 for other names.
+            flush_interval (float, optional): Seconds between two writes.
+        """
+        self.path = path
+        self.endpoints = {name: index for index, name in enumerate(endpoints)}
+        self.flush_interval = flush_interval
+        self.queue = deque()
+        self.records = 0
+        self.error = None
+        self.file = open(path, "wb")
+        header = json.dumps({"actions": ACTIONS, "endpoints": list(endpoints)}).encode()
+        self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(
+        self, started, action, endpoint, row, column, status, attempt, latency, size
+    ):
+        """
+        Queue the record of a request.
+
+        Args:
+            started (float): Wall time the request started, as from `time.time()`.
+            action (str): Either 'post' or 'delete'.
+            endpoint (str): The name of the endpoint, one of `endpoints`.
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+            status (int or None): The HTTP status of the response, None without one.
+            attempt (int): The attempt number, starting at 1.
+            latency (float): The latency of the request, in seconds.
+            size (int): Number of bytes of the body sent.
+        """
+        if self.error is None:
+            self.queue.append(
+                (started, action, endpoint, row, column, status, attempt, latency, size)
+            )
+
+    def close(self):
+        """
+        Write the queued records and close the trace.
+
+        Raises:
+            OSError: If the trace could not be written, in which case it is
+                truncated.
+        """
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        self.thread.join()
+        try:
+            if self.error is None:
+                self._flush()
+        finally:
+            self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while not self.stopped.wait(self.flush_interval):
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(
+                    f"Could not write the trace {self.path}, it is truncated: {e}"
+                )
+                self.error = e
+                self.queue.clear()
+                return
+
+    def _flush(self):
+        pack = RECORD.pack
+        endpoints = self.endpoints
+        chunks = []
+        while self.queue:
+            started, action, endpoint, row, column, status, attempt, latency, size = (
+                self.queue.popleft()
+            )
+            chunks.append(
+                pack(
+                    started,
+                    action != "post",
+                    endpoints.get(endpoint, 255),
+                    row,
+                    column,
+                    status or 0,
+                    min(attempt, 255),
+                    latency,
+                    size,
+                )
+            )
+        if chunks:
+            self.file.write(b"".join(chunks))
+            self.file.flush()
+            self.records += len(chunks)
+
+
+def read_header(file):
+    """
+    Read the header of a trace.
+
+    Args:
+        file (file): The trace, opened in binary mode at its start.
+
+    Returns:
+        dict: The 'actions' and 'endpoints' names of the trace.
+
+    Raises:
+        ValueError: If the file is not a trace.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{file.name} is not an operation trace")
+    (length,) = struct.unpack("<I", file.read(4))
+    return json.loads(file.read(length))
+
+
+def load_trace(path):
+    """
+    Load a trace into a structured NumPy array in one pass.
+
+    Args:
+        path (str): The trace to load.
+
+    Returns:
+        tuple: (header, records), the header dict and an array of `RECORD_DTYPE`.
+    """
+    with open(path, "rb") as file:
+        header = read_header(file)
+        records = np.fromfile(file, dtype=RECORD_DTYPE)
+    return header, records
+
+
+def trace_frame(path):
+    """
+    Load a trace into a pandas DataFrame.
+
+    The action and endpoint columns are categorical, NaN for codes the
+    header does not name (e.g. 255 for an unknown endpoint), and a 'time'
+    column holds the seconds since the first request.
+
+    Args:
+        path (str): The trace to load.
+
+    Returns:
+        pandas.DataFrame: One row per request.
+    """
+    import pandas as pd
+
+    header, records = load_trace(path)
+    frame = pd.DataFrame(records)
+    for column, names in (
+        ("action", header["actions"]),
+        ("endpoint", header["endpoints"]),
+    ):
+        codes = frame[column].to_numpy().astype(np.int64)
+        codes[codes >= len(names)] = -1
+        frame[column] = pd.Categorical.from_codes(codes, names)
+    frame["time"] = frame["timestamp"] - frame["timestamp"].min()
+    return frame
@@ -0,0 +1,195 @@
+import gzip
+import json
+import time
+import threading
+
+from http import HTTPStatus
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+from .lean import LeanResponse
+from .transport import Transport
+
+
+CASSETTE_VERSION = 1
+
+
+def exchange_key(method, url, payload):
+    """
+    Build the key matching a request to its recorded exchanges.
+
+    The candidate id is left out of the body, so a cassette can be replayed
+    by another candidate on the write endpoints.
+
+    Args:
+        method (str): The lowercase HTTP method.
+        url (str): The absolute URL of the request.
+        payload (dict or None): The JSON body of the request.
+
+    Returns:
+        tuple: (method, path, canonical body).
+    """
+    if payload:
+        payload = {key: value for key, value in payload.items() if key != "candidateId"}
+        body = json.dumps(payload, sort_keys=True)
+    else:
+        body = ""
+    return method, urlsplit(url).path, body
+
+
+class RecordingTransport(Transport):
+    """
+    Transport recording every exchange of another transport into a cassette.
+
+    A cassette is a gzip-compressed file of JSON lines: a header followed by
+    one line per exchange with its start offset, method, path, body, status,
+    latency and response body.
+    """
+
+    def __init__(self, inner, path):
+        """
+        Initializes a RecordingTransport instance.
+
+        Args:
+            inner (Transport): The transport actually sending the requests.
+            path (str): Where the cassette is written.
+        """
+        self.inner = inner
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.file.write(
+            json.dumps({"version": CASSETTE_VERSION, "recorded": time.time()}) + "\n"
+        )
+        self.started = time.monotonic()
+        self.exchanges = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, payload=None):
+        """
+        Send a request through the inner transport and record the exchange.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the inner transport.
+        """
+        return self._record(method, url, payload, self.inner.request, payload)
+
+    def send(self, method, url, body):
+        """
+        Send a pre-encoded request through the inner transport and record the exchange.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the inner transport.
+        """
+        return self._record(method, url, json.loads(body), self.inner.send, body)
+
+    def close(self):
+        """
+        Finish writing the cassette.
+        """
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def _record(self, method, url, payload, send, data):
+        started = time.monotonic()
+        response = send(method, url, data)
+        latency = time.monotonic() - started
+        _, path, body = exchange_key(method, url, payload)
+        line = json.dumps(
+            {
+                "offset": round(started - self.started, 6),
+                "method": method,
+                "path": path,
+                "body": body,
+                "status": response.status_code,
+                "latency": round(latency, 6),
+                "response": response.text,
+            }
+        )
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line + "\n")
+                self.exchanges += 1
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Transport serving the exchanges of a cassette instead of calling the API.
+
+    A request gets the recorded exchanges of the same method, path and body
+    (candidate id excepted) in the order they were recorded, the last one
+    being repeated once they run out, so a request rate-limited when it was
+    recorded is rate-limited again until the retry that succeeded. Requests
+    never recorded get the exchanges of their endpoint in recorded order,
+    reproducing its mix of statuses. Every response waits for its recorded
+    latency multiplied by `latency_scale`.
+    """
+
+    def __init__(self, path, latency_scale=1.0):
+        """
+        Initializes a ReplayTransport instance.
+
+        Args:
+            path (str): The cassette to replay.
+            latency_scale (float, optional): Factor applied to the recorded
+                latencies, 0 to answer at once.
+        """
+        self.latency_scale = latency_scale
+        self.exchanges = defaultdict(deque)
+        self.endpoints = defaultdict(list)
+        self.cursors = defaultdict(int)
+        self.lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {path}")
+            for line in file:
+                exchange = json.loads(line)
+                endpoint = (exchange["method"], exchange["path"])
+                self.exchanges[(*endpoint, exchange["body"])].append(exchange)
+                self.endpoints[endpoint].append(exchange)
+
+    def request(self, method, url, payload=None):
+        """
+        Serve a request from the cassette.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            LeanResponse: The recorded response.
+
+        Raises:
+            LookupError: If nothing was recorded for the method and path.
+        """
+        key = exchange_key(method, url, payload)
+        with self.lock:
+            recorded = self.exchanges.get(key)
+            if recorded:
+                exchange = recorded.popleft() if len(recorded) > 1 else recorded[0]
+            else:
+                endpoint = self.endpoints.get(key[:2])
+                if not endpoint:
+                    raise LookupError(f"No recorded exchange for {method} {key[1]}")
+                exchange = endpoint[self.cursors[key[:2]] % len(endpoint)]
+                self.cursors[key[:2]] += 1
+        if self.latency_scale:
+            time.sleep(exchange["latency"] * self.latency_scale)
+        status = exchange["status"]
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        return LeanResponse(status, reason, exchange["response"].encode(), url)
@@ -0,0 +1,266 @@
+import time
+import logging
+import threading
+
+from collections import deque
+from urllib.parse import urlsplit
+from .transport import Transport
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is rejected because the circuit of its endpoint is open.
+
+    Attributes:
+        endpoint (str): The endpoint whose circuit is open.
+        retry_after (float): Seconds until the circuit lets a request through.
+    """
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(
+            f"Circuit open for {endpoint}, retry in {retry_after:.1f} seconds."
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one endpoint and decides whether requests may be sent.
+
+    The breaker keeps the outcome of the last `window` requests. A request
+    fails when it raises, answers with a 5xx status, or takes longer than
+    `slow_threshold`. A 429 is left to the backoff of the caller, so a burst
+    of them does not open the circuit. Once the failure rate of a full enough window
+    reaches `error_threshold` the circuit opens and requests are rejected.
+    After `cooldown` seconds it becomes half-open: single probes, spaced by
+    `probe_interval`, are let through until one succeeds (closing the circuit)
+    or fails (opening it again).
+    """
+
+    def __init__(
+        self,
+        endpoint,
+        window=20,
+        min_requests=10,
+        error_threshold=0.5,
+        slow_threshold=None,
+        cooldown=10.0,
+        probe_interval=1.0,
+        on_transition=None,
+    ):
+        """
+        Initializes a CircuitBreaker instance.
+
+        Args:
+            endpoint (str): The endpoint guarded by the breaker.
+            window (int, optional): Number of recent outcomes considered.
+            min_requests (int, optional): Outcomes needed before the circuit may open.
+            error_threshold (float, optional): Failure rate that opens the circuit.
+            slow_threshold (float, optional): Latency in seconds above which a
+                request counts as failed, None to ignore latency.
+            cooldown (float, optional): Seconds the circuit stays open.
+            probe_interval (float, optional): Minimum seconds between half-open probes.
+            on_transition (callable, optional): Called with (endpoint, old_state, new_state).
+        """
+        self.endpoint = endpoint
+        self.outcomes = deque(maxlen=window)
+        self.min_requests = min_requests
+        self.error_threshold = error_threshold
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.on_transition = on_transition
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.last_probe = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            bool: True if the request is a half-open probe, False for a regular request.
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the request.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.cooldown:
+                    raise CircuitOpenError(
+                        self.endpoint, self.cooldown - (now - self.opened_at)
+                    )
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                wait_time = self.last_probe + self.probe_interval - now
+                if self.probing or wait_time > 0:
+                    raise CircuitOpenError(
+                        self.endpoint, max(wait_time, self.probe_interval)
+                    )
+                self.probing = True
+                self.last_probe = now
+                return True
+            return False
+
+    def record(self, success, latency, probe=False):
+        """
+        Record the outcome of a request.
+
+        Args:
+            success (bool): Whether the request got a non-failing response.
+            latency (float): The latency of the request, in seconds.
+            probe (bool, optional): Whether the request was a half-open probe.
+        """
+        if self.slow_threshold is not None and latency > self.slow_threshold:
+            success = False
+        with self.lock:
+            if probe:
+                self.probing = False
+                if success:
+                    self.outcomes.clear()
+                    self._transition(CLOSED)
+                else:
+                    self.opened_at = time.monotonic()
+                    self._transition(OPEN)
+                return
+            self.outcomes.append(success)
+            if self.state == CLOSED and len(self.outcomes) >= self.min_requests:
+                failures = self.outcomes.count(False)
+                if failures / len(self.outcomes) >= self.error_threshold:
+                    self.opened_at = time.monotonic()
+                    self._transition(OPEN)
+
+    def _transition(self, state):
+        previous, self.state = self.state, state
+        logger.warning(f"Circuit for {self.endpoint} went from {previous} to {state}")
+        if self.on_transition:
+            self.on_transition(self.endpoint, previous, state)
+
+
+class CircuitBreakerTransport(Transport):
+    """
+    Transport guarding every endpoint of the API with its own circuit breaker.
+
+    While the circuit of an endpoint is open, its requests either fail fast
+    with `CircuitOpenError` or, when `park` is set, wait until the circuit
+    lets them through.
+    """
+
+    def __init__(self, inner, park=False, metrics=None, **breaker_options):
+        """
+        Initializes a CircuitBreakerTransport instance.
+
+        Args:
+            inner (Transport): The transport actually sending the requests.
+            park (bool, optional): Wait for the circuit instead of failing fast.
+            metrics (RunMetrics, optional): Where transitions and rejections are recorded.
+            **breaker_options: Keyword arguments passed to every `CircuitBreaker`.
+        """
+        self.inner = inner
+        self.park = park
+        self.metrics = metrics
+        self.breaker_options = breaker_options
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def breaker(self, url):
+        """
+        Return the circuit breaker of the endpoint of a URL, creating it if needed.
+
+        Args:
+            url (str): The absolute URL of the request.
+
+        Returns:
+            CircuitBreaker: The breaker of the endpoint.
+        """
+        endpoint = urlsplit(url).path
+        with self.lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(
+                    endpoint, on_transition=self._on_transition, **self.breaker_options
+                )
+            return self.breakers[endpoint]
+
+    def request(self, method, url, payload=None):
+        """
+        Send a request if the circuit of its endpoint allows it.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and `park` is not set.
+        """
+        return self._guarded(url, self.inner.request, method, url, payload)
+
+    def send(self, method, url, body):
+        """
+        Send a pre-encoded request if the circuit of its endpoint allows it.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and `park` is not set.
+        """
+        return self._guarded(url, self.inner.send, method, url, body)
+
+    def states(self):
+        """
+        Return the state of every circuit.
+
+        Returns:
+            dict: A dictionary mapping endpoints to their circuit state.
+        """
+        with self.lock:
+            return {
+                endpoint: breaker.state for endpoint, breaker in self.breakers.items()
+            }
+
+    def _on_transition(self, endpoint, previous, state):
+        if self.metrics is not None:
+            self.metrics.record_event(f"circuit_{state}")
+
+    def _guarded(self, url, send, *args):
+        breaker = self.breaker(url)
+        while True:
+            try:
+                probe = breaker.allow()
+                break
+            except CircuitOpenError as e:
+                if self.metrics is not None:
+                    self.metrics.record_event("circuit_rejected")
+                if not self.park:
+                    raise
+                time.sleep(e.retry_after)
+
+        started = time.monotonic()
+        try:
+            response = send(*args)
+        except Exception:
+            breaker.record(False, time.monotonic() - started, probe)
+            raise
+        status = response.status_code
+        breaker.record(status < 500, time.monotonic() - started, probe)
+        return response
@@ -0,0 +1,157 @@
+import time
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
+from app.challenge.metrics import LatencyHistogram
+from .transport import Transport
+
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedTransport(Transport):
+    """
+    Transport sending a duplicate of slow writes and keeping the first response.
+
+    Placing or removing an object twice leaves the megaverse in the same state,
+    so when a write has not answered after the configured latency percentile
+    (taken from the live latency histogram), the same request is sent again and
+    whichever answers first wins. The number of duplicates is capped by a
+    budget relative to the number of requests sent.
+    """
+
+    def __init__(
+        self,
+        inner,
+        percentile=95,
+        budget=0.05,
+        histogram=None,
+        min_samples=20,
+        methods=("post", "delete"),
+        max_workers=64,
+    ):
+        """
+        Initializes a HedgedTransport instance.
+
+        Args:
+            inner (Transport): The transport actually sending the requests.
+            percentile (float, optional): Latency percentile after which a request is hedged.
+            budget (float, optional): Maximum ratio of hedged requests to requests.
+            histogram (LatencyHistogram, optional): The live latency histogram.
+                A new one is created when not given.
+            min_samples (int, optional): Samples needed before hedging starts.
+            methods (tuple, optional): The HTTP methods that may be hedged.
+            max_workers (int, optional): Threads available to send requests.
+        """
+        self.inner = inner
+        self.percentile = percentile
+        self.budget = budget
+        self.histogram = histogram or LatencyHistogram()
+        self.min_samples = min_samples
+        self.methods = methods
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.lock = threading.Lock()
+
+    def hedge_delay(self):
+        """
+        Return how long a request may run before it is hedged.
+
+        Returns:
+            float or None: The delay in seconds, or None while the histogram does
+                not have enough samples.
+        """
+        if self.histogram.count < self.min_samples:
+            return None
+        return self.histogram.percentile(self.percentile)
+
+    def request(self, method, url, payload=None):
+        """
+        Send a request, hedging it if it is a slow write.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            requests.Response: The first response received.
+        """
+        if method not in self.methods:
+            return self.inner.request(method, url, payload)
+        return self._hedged(method, url, self.inner.request, payload)
+
+    def send(self, method, url, body):
+        """
+        Send a pre-encoded request, hedging it if it is a slow write.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            requests.Response: The first response received.
+        """
+        if method not in self.methods:
+            return self.inner.send(method, url, body)
+        return self._hedged(method, url, self.inner.send, body)
+
+    def stats(self):
+        """
+        Summarize the hedging activity.
+
+        Returns:
+            dict: Requests seen, hedges sent and hedges that answered first.
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+    def _take_budget(self):
+        with self.lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _hedged(self, method, url, send, data):
+        with self.lock:
+            self.requests += 1
+        delay = self.hedge_delay()
+        primary = self.pool.submit(self._timed_request, send, method, url, data)
+        if delay is None:
+            return primary.result()
+        try:
+            return primary.result(timeout=delay)
+        except TimeoutError:
+            pass
+        if not self._take_budget():
+            return primary.result()
+
+        logger.info(f"Hedging {method} {url} after {delay:.3f}s")
+        hedge = self.pool.submit(self._timed_request, send, method, url, data)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self.lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _timed_request(self, send, method, url, data):
+        started = time.monotonic()
+        response = send(method, url, data)
+        self.histogram.record(time.monotonic() - started)
+        return response
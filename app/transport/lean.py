@@ -0,0 +1,363 @@
+import ssl
+import json
+import socket
+import threading
+import requests
+
+from collections import deque
+from urllib.parse import urlsplit
+from .transport import Transport, RequestsTransport
+
+
+class LeanResponse:
+    """
+    A minimal HTTP response, exposing the part of `requests.Response` the application uses.
+
+    Attributes:
+        status_code (int): The HTTP status of the response.
+        reason (str): The reason phrase of the status line.
+        content (bytes): The body of the response.
+        url (str): The URL of the request.
+    """
+
+    __slots__ = ("status_code", "reason", "content", "url")
+
+    def __init__(self, status_code, reason, content, url):
+        self.status_code = status_code
+        self.reason = reason
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        """
+        str: The body of the response, decoded as UTF-8.
+        """
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        """
+        Decode the JSON body of the response.
+
+        Returns:
+            The decoded body.
+        """
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        """
+        Raise the error `requests` would raise for a 4xx or 5xx status.
+
+        Raises:
+            requests.exceptions.HTTPError: If the status is 400 or above.
+        """
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                response=self,
+            )
+
+
+class _Slot:
+    """
+    The place where the response to one pipelined request is delivered.
+    """
+
+    __slots__ = ("url", "response", "error", "done")
+
+    def __init__(self, url):
+        self.url = url
+        self.response = None
+        self.error = None
+        self.done = False
+
+
+class _Connection:
+    """
+    A persistent HTTP/1.1 connection on which requests may be pipelined.
+
+    Requests are written in order under the write lock and their slots queued
+    in the same order. Responses arrive in that order too: whichever waiting
+    thread holds the read lock reads the response at the head of the queue
+    and hands it to its slot, until its own response has been read.
+    """
+
+    def __init__(self, host, port, tls, timeout):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        self.pending = deque()
+        self.write_lock = threading.Lock()
+        self.read_lock = threading.Lock()
+        self.in_flight = 0
+        self.broken = False
+
+    def exchange(self, data, url):
+        slot = _Slot(url)
+        with self.write_lock:
+            if self.broken:
+                raise ConnectionError("Connection closed")
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                # The threads reading this connection fail the queued requests
+                self.close()
+                raise
+            self.pending.append(slot)
+        while not slot.done:
+            with self.read_lock:
+                if slot.done:
+                    break
+                head = self.pending[0]
+                try:
+                    head.response = self._read_response(head.url)
+                except Exception as e:
+                    if not isinstance(e, OSError):
+                        e = ConnectionError(f"Invalid response: {e}")
+                    self._fail(e)
+                    break
+                self.pending.popleft()
+                head.done = True
+        if slot.error is not None:
+            raise slot.error
+        return slot.response
+
+    def close(self):
+        self.broken = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _fail(self, error):
+        # Every queued request loses its response along with the connection
+        self.close()
+        while self.pending:
+            slot = self.pending.popleft()
+            slot.error = error
+            slot.done = True
+
+    def _read_response(self, url):
+        line = self.reader.readline(65537)
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        _, status, *reason = line.split(None, 2)
+        status = int(status)
+        length = None
+        chunked = False
+        close = False
+        while True:
+            line = self.reader.readline(65537)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value.lower()
+            elif name == b"connection":
+                close = b"close" in value.lower()
+
+        if chunked:
+            content = self._read_chunked()
+        elif length is not None:
+            content = self.reader.read(length)
+        elif status in (204, 304) or 100 <= status < 200:
+            content = b""
+        else:
+            content = self.reader.read()
+            close = True
+        if close:
+            self.broken = True
+        reason = reason[0].strip().decode("latin-1") if reason else ""
+        return LeanResponse(status, reason, content, url)
+
+    def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int(self.reader.readline(65537).split(b";")[0], 16)
+            if size == 0:
+                while self.reader.readline(65537) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.reader.read(size))
+            self.reader.readline(65537)
+
+
+class LeanTransport(Transport):
+    """
+    Transport writing HTTP/1.1 directly on persistent sockets.
+
+    Writes (posts and deletes) skip `requests` entirely: the request line and
+    headers of every endpoint are built once, responses are parsed only as
+    far as the status and body, and connections are kept open between
+    requests. With `pipeline` above 1, up to that many requests are written on
+    a connection before their responses are read back, in order. Other
+    methods, such as the map reads, go through the `fallback` transport.
+    With `partition`, every endpoint gets its own pool of connections, so a
+    slow endpoint never holds a connection another endpoint is waiting for.
+
+    Responses raise `requests.exceptions.HTTPError` from `raise_for_status`,
+    like those of `requests`, so the callers handle errors the same way.
+    """
+
+    def __init__(
+        self,
+        pipeline=1,
+        max_connections=None,
+        timeout=30.0,
+        fallback=None,
+        methods=("post", "delete"),
+        partition=False,
+    ):
+        """
+        Initializes a LeanTransport instance.
+
+        Args:
+            pipeline (int, optional): Requests that may be in flight on one connection.
+            max_connections (int, optional): Connections per host, None for as many
+                as needed to keep every connection within `pipeline`.
+            timeout (float, optional): Socket timeout, in seconds.
+            fallback (Transport, optional): Transport for the other methods.
+                Defaults to a `RequestsTransport`.
+            methods (tuple, optional): The HTTP methods sent by this transport.
+            partition (bool, optional): Keep one pool of connections per endpoint
+                instead of per host; `max_connections` then applies per endpoint.
+        """
+        self.pipeline = max(1, pipeline)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.fallback = fallback or RequestsTransport()
+        self.methods = methods
+        self.partition = partition
+        self.connections = {}
+        self.opening = {}
+        self.heads = {}
+        self.lock = threading.Condition()
+
+    def request(self, method, url, payload=None):
+        """
+        Send a request, on a persistent connection if it is a write.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            LeanResponse or requests.Response: The response of the API.
+        """
+        if method not in self.methods:
+            return self.fallback.request(method, url, payload)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        return self.send(method, url, body)
+
+    def send(self, method, url, body):
+        """
+        Send a request whose JSON body is already encoded.
+
+        A request whose connection fails to open, or fails before its response
+        is read, is sent again once on another connection; writes are
+        idempotent.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            LeanResponse: The response of the API.
+        """
+        if method not in self.methods:
+            return self.fallback.send(method, url, body)
+        head, key = self._head(method, url)
+        data = head + b"%d\r\n\r\n%b" % (len(body), body)
+        for attempt in range(2):
+            connection = None
+            try:
+                connection = self._acquire(key)
+                return connection.exchange(data, url)
+            except OSError:
+                if attempt:
+                    raise
+            finally:
+                if connection is not None:
+                    self._release(key, connection)
+
+    def close(self):
+        """
+        Close every connection.
+        """
+        with self.lock:
+            for connections in self.connections.values():
+                for connection in connections:
+                    connection.close()
+            self.connections.clear()
+
+    def _head(self, method, url):
+        cached = self.heads.get((method, url))
+        if cached is None:
+            parts = urlsplit(url)
+            tls = parts.scheme == "https"
+            port = parts.port or (443 if tls else 80)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            head = (
+                f"{method.upper()} {path} HTTP/1.1\r\n"
+                f"Host: {parts.netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                "Content-Length: "
+            ).encode()
+            key = (parts.hostname, port, tls)
+            if self.partition:
+                key += (parts.path,)
+            cached = (head, key)
+            self.heads[(method, url)] = cached
+        return cached
+
+    def _acquire(self, key):
+        with self.lock:
+            while True:
+                connections = self.connections.setdefault(key, [])
+                connections[:] = [c for c in connections if not c.broken]
+                available = [c for c in connections if c.in_flight < self.pipeline]
+                if available:
+                    connection = min(available, key=lambda c: c.in_flight)
+                    connection.in_flight += 1
+                    return connection
+                opening = self.opening.get(key, 0)
+                # A connection being opened will have room for more requests
+                if not (opening and self.pipeline > 1) and (
+                    self.max_connections is None
+                    or len(connections) + opening < self.max_connections
+                ):
+                    self.opening[key] = opening + 1
+                    break
+                self.lock.wait()
+
+        # Connecting may block, so it is done without holding back the other requests
+        connection = None
+        try:
+            connection = _Connection(*key[:3], self.timeout)
+        finally:
+            with self.lock:
+                self.opening[key] -= 1
+                if connection is not None:
+                    connection.in_flight += 1
+                    self.connections.setdefault(key, []).append(connection)
+                self.lock.notify_all()
+        return connection
+
+    def _release(self, key, connection):
+        with self.lock:
+            connection.in_flight -= 1
+            if connection.broken and connection.in_flight == 0:
+                connection.close()
+            self.lock.notify()
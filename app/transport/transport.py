@@ -0,0 +1,123 @@
+import os
+import json
+import requests
+
+from abc import ABC, abstractmethod
+
+
+DEFAULT_API_URL = "https://challenge.crossmint.io/api"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def api_url(path):
+    """
+    Build the URL of an endpoint of the Crossmint API.
+
+    The base URL can be overridden with the `CROSSMINT_API_URL` environment
+    variable, e.g. to point the application to a local stand-in server.
+
+    Args:
+        path (str): The endpoint path relative to the API root (e.g. 'polyanets').
+
+    Returns:
+        str: The absolute URL of the endpoint.
+    """
+    return f"{os.getenv('CROSSMINT_API_URL', DEFAULT_API_URL).rstrip('/')}/{path}"
+
+
+class Transport(ABC):
+    """
+    Base class for the ways requests are sent to the API.
+
+    A transport sends a JSON request and returns the response without
+    checking its status, so callers keep handling errors through
+    `response.raise_for_status()`. Bodies already encoded by the caller go
+    through `send`, which transports should override to avoid decoding them.
+    """
+
+    @abstractmethod
+    def request(self, method, url, payload=None):
+        """
+        Send a request.
+
+        Abstract method to be implemented by subclasses.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API, or an object with the same
+                `status_code`, `json()` and `raise_for_status()` interface.
+        """
+        pass
+
+    def send(self, method, url, body):
+        """
+        Send a request whose JSON body is already encoded.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API.
+        """
+        return self.request(method, url, json.loads(body))
+
+
+class RequestsTransport(Transport):
+    """
+    Transport sending every request through the `requests` library.
+
+    The timeout only bounds writes: map reads are much larger than a write
+    and always wait as long as needed.
+    """
+
+    def __init__(self, write_timeout=None):
+        """
+        Initializes a RequestsTransport instance.
+
+        Args:
+            write_timeout (float, optional): Seconds a write may take, None to
+                wait as long as needed.
+        """
+        self.write_timeout = write_timeout
+        self.options = {} if write_timeout is None else {"timeout": write_timeout}
+
+    def request(self, method, url, payload=None):
+        """
+        Send a request with `requests`.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete', 'get').
+            url (str): The absolute URL of the endpoint.
+            payload (dict, optional): The JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API.
+        """
+        options = {} if method == "get" else self.options
+        if payload is None:
+            return getattr(requests, method)(url, **options)
+        return getattr(requests, method)(
+            url, json=payload, headers=JSON_HEADERS, **options
+        )
+
+    def send(self, method, url, body):
+        """
+        Send a request whose JSON body is already encoded with `requests`.
+
+        Args:
+            method (str): The lowercase HTTP method (e.g. 'post', 'delete').
+            url (str): The absolute URL of the endpoint.
+            body (bytes): The encoded JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the API.
+        """
+        return getattr(requests, method)(
+            url, data=body, headers=JSON_HEADERS, **self.options
+        )
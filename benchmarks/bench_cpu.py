@@ -0,0 +1,294 @@
+"""
+Microbenchmark the CPU cost of every stage of the per-cell path of the solver.
+
+Runs each stage of `solve_challengue_2` in isolation (row planning,
+operation building, instance lookup, validation, payload building, logging,
+a whole `execute` and a whole solve) over random goal maps, with a transport
+that sends nothing. Reports the cells actually measured, the time per
+operation and the tracemalloc peak per operation (the most memory held at
+once, not the total allocated), and saves the results under
+`benchmarks/results/` keyed by commit so runs can be compared. Maps larger
+than `--limit` cells are cropped to their first rows; `--limit 0` measures
+them whole.
+
+Usage:
+        python -m benchmarks.bench_cpu [--sizes 11 100 1000 2000] [--compare results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+import subprocess
+import contextlib
+
+from app.astral_objects.registry import REGISTRY
+from app.challenge.challenge_goal import ChallengeGoal, plan_row
+from app.challenge.executor import Operation
+from app.transport.lean import LeanResponse
+from app.transport.transport import Transport, api_url
+from benchmarks.standin_server import random_goal_map
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(ROOT, "benchmarks", "results")
+
+
+class NoopTransport(Transport):
+    """
+    Transport answering every request at once with the same 200 response.
+    """
+
+    response = LeanResponse(200, "OK", b"{}", "")
+
+    def request(self, method, url, payload=None):
+        return self.response
+
+    def send(self, method, url, body):
+        return self.response
+
+
+def descriptors(grid):
+    """
+    Resolve the cells of a grid holding an astral object, the input of the
+    stages following the planning.
+
+    Returns:
+        list: (row, column, descriptor) tuples.
+    """
+    tokens = REGISTRY.tokens
+    return [
+        (row_index, col_index, tokens[item])
+        for row_index, row in enumerate(grid)
+        for col_index, item in enumerate(row)
+        if item in tokens
+    ]
+
+
+def stage_plan(challenge, grid, cells):
+    for row_index, items in enumerate(grid):
+        for _ in plan_row(row_index, items, lambda descriptor: True):
+            pass
+    return sum(len(row) for row in grid)
+
+
+def stage_operation(challenge, grid, cells):
+    for row, column, descriptor in cells:
+        Operation("post", descriptor.name, row, column, descriptor.value)
+    return len(cells)
+
+
+def stage_instance(challenge, grid, cells):
+    for _, _, descriptor in cells:
+        challenge._get_instance(descriptor.name)
+    return len(cells)
+
+
+def stage_check_tuples(challenge, grid, cells):
+    for row, column, descriptor in cells:
+        instance = challenge._get_instance(descriptor.name)
+        args = descriptor.args(row, column)
+        instance.check_tuples(args, len(args), descriptor.cls.values)
+    return len(cells)
+
+
+def stage_validate_batch(challenge, grid, cells):
+    batches = {}
+    for row, column, descriptor in cells:
+        batches.setdefault(descriptor.name, []).append(descriptor.args(row, column))
+    for name, items in batches.items():
+        challenge._get_instance(name).validate_batch(items)
+    return len(cells)
+
+
+def stage_payload_json(challenge, grid, cells):
+    for row, column, descriptor in cells:
+        payload = {"candidateId": challenge.candidate_id, "row": row, "column": column}
+        if descriptor.value is not None:
+            payload[descriptor.field] = descriptor.value
+        api_url(descriptor.endpoint)
+        json.dumps(payload).encode()
+    return len(cells)
+
+
+def stage_payload_template(challenge, grid, cells):
+    for row, column, descriptor in cells:
+        template = challenge._get_instance(descriptor.name).template("post")
+        template.body(row, column, descriptor.value)
+    return len(cells)
+
+
+def stage_logging(challenge, grid, cells):
+    logger = logging.getLogger("app.challenge.executor")
+    for row, column, descriptor in cells:
+        operation = Operation("post", descriptor.name, row, column, descriptor.value)
+        logger.info(f"Trying to {operation.describe()}")
+    return len(cells)
+
+
+def stage_execute(challenge, grid, cells):
+    execute = challenge.executor.execute
+    for row, column, descriptor in cells:
+        execute(Operation("post", descriptor.name, row, column, descriptor.value))
+    return len(cells)
+
+
+def stage_solve(challenge, grid, cells):
+    challenge.goal_map = grid
+    challenge.solve_challengue_2()
+    return len(cells)
+
+
+STAGES = [
+    ("plan rows", stage_plan),
+    ("build operation", stage_operation),
+    ("get instance", stage_instance),
+    ("check_tuples", stage_check_tuples),
+    ("validate_batch", stage_validate_batch),
+    ("payload dict+json", stage_payload_json),
+    ("payload template", stage_payload_template),
+    ("logging", stage_logging),
+    ("execute", stage_execute),
+    ("solve", stage_solve),
+]
+
+
+def crop(grid, limit):
+    """
+    Keep the first rows of a grid, with at most about `limit` cells, or the
+    whole grid when `limit` is 0.
+    """
+    if not limit:
+        return grid
+    rows = max(1, limit // len(grid[0]))
+    return grid[:rows]
+
+
+def measure(function, challenge, grid, limit, traced_limit):
+    """
+    Measure one stage on a grid.
+
+    The time is taken on up to `limit` cells, the memory on up to
+    `traced_limit` cells since tracing slows the stage down.
+
+    Returns:
+        tuple: (cells timed, operations, nanoseconds per operation, cells
+            traced, peak traced bytes per operation).
+    """
+    timed = crop(grid, limit)
+    cells = descriptors(timed)
+    started = time.perf_counter_ns()
+    operations = function(challenge, timed, cells)
+    elapsed = time.perf_counter_ns() - started
+
+    traced = crop(grid, traced_limit)
+    traced_cells = descriptors(traced)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    traced_operations = function(challenge, traced, traced_cells)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (
+        sum(len(row) for row in timed),
+        operations,
+        elapsed / max(operations, 1),
+        sum(len(row) for row in traced),
+        (peak - baseline) / max(traced_operations, 1),
+    )
+
+
+def commit():
+    """
+    Return the short hash of the current commit, 'unknown' outside of git.
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 100, 1000, 2000])
+    parser.add_argument(
+        "--limit", type=int, default=200000, help="Cells timed per map, 0 for all."
+    )
+    parser.add_argument(
+        "--traced-limit",
+        type=int,
+        default=20000,
+        help="Cells traced per map, 0 for all.",
+    )
+    parser.add_argument("--output", help="Where the results are saved.")
+    parser.add_argument("--compare", help="Results of a previous run to compare with.")
+    args = parser.parse_args()
+
+    # Log like the command line does, without the cost of a terminal
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler], force=True)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = {
+                (result["size"], result["stage"]): result
+                for result in json.load(file)["results"]
+            }
+
+    results = []
+    print(
+        f"{'map':>9} {'stage':<18} {'cells':>8} {'ops':>8} {'ns/op':>9} "
+        f"{'peak B/op':>9} {'vs':>6}"
+    )
+    for size in args.sizes:
+        grid = random_goal_map(size, seed=size)
+        for name, function in STAGES:
+            challenge = ChallengeGoal(transport=NoopTransport())
+            challenge.candidate_id = "benchmark"
+            challenge._get_instance("polyanet")  # Load the classes
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                cells, operations, ns, traced, peak = measure(
+                    function, challenge, grid, args.limit, args.traced_limit
+                )
+            result = {
+                "size": size,
+                "stage": name,
+                "cells": cells,
+                "operations": operations,
+                "ns_per_op": round(ns, 1),
+                "traced_cells": traced,
+                "peak_bytes_per_op": round(peak, 1),
+            }
+            results.append(result)
+            before = previous.get((size, name))
+            ratio = f"{ns / before['ns_per_op']:.2f}x" if before else ""
+            print(
+                f"{f'{size}x{size}':>9} {name:<18} {cells:>8} {operations:>8} "
+                f"{ns:>9.0f} {peak:>9.0f} {ratio:>6}"
+            )
+
+    revision = commit()
+    path = args.output or os.path.join(RESULTS, f"cpu-{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "commit": revision,
+                "python": sys.version.split()[0],
+                "timestamp": time.time(),
+                "results": results,
+            },
+            file,
+            indent=1,
+        )
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
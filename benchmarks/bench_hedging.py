@@ -0,0 +1,86 @@
+"""
+Benchmark hedged writes against the stand-in server.
+
+Runs the same batch of polyanet posts with and without hedging against a
+server where a small fraction of the writes stalls, and reports the p50 and
+p99 operation latencies, the total time and the hedges sent.
+
+Usage:
+        python -m benchmarks.bench_hedging [--operations 600] [--concurrency 16]
+"""
+
+import os
+import argparse
+import contextlib
+import logging
+
+from app.astral_objects.polyanet import Polyanet
+from app.challenge.executor import Operation, OperationExecutor
+from app.challenge.metrics import RunMetrics
+from app.transport.hedging import HedgedTransport
+from app.transport.transport import RequestsTransport
+from benchmarks.standin_server import StandinServer
+
+
+def run(transport, operations, concurrency):
+    """
+    Post one polyanet per operation through the given transport.
+
+    Returns:
+        dict: The summary of the run metrics.
+    """
+    metrics = RunMetrics()
+    polyanet = Polyanet("benchmark", transport=transport)
+    executor = OperationExecutor(
+        lambda name: polyanet, concurrency=concurrency, metrics=metrics
+    )
+    size = int(operations**0.5) + 1
+    batch = (
+        Operation("post", "polyanet", index // size, index % size, None)
+        for index in range(operations)
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        executor.run(batch)
+    return metrics.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--stall-probability", type=float, default=0.02)
+    parser.add_argument("--stall", type=float, default=1.0)
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--budget", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    size = int(args.operations**0.5) + 1
+    print(
+        f"{'transport':<10} {'p50 (s)':>9} {'p99 (s)':>9} {'total (s)':>10} {'hedges':>7}"
+    )
+    for name in ("plain", "hedged"):
+        server = StandinServer(
+            [["POLYANET"] * size for _ in range(size)],
+            latency=args.latency,
+            stall_probability=args.stall_probability,
+            stall=args.stall,
+        )
+        with server:
+            os.environ["CROSSMINT_API_URL"] = server.url
+            transport = RequestsTransport()
+            if name == "hedged":
+                transport = HedgedTransport(
+                    transport, percentile=args.percentile, budget=args.budget
+                )
+            summary = run(transport, args.operations, args.concurrency)
+        hedges = transport.stats()["hedges"] if name == "hedged" else 0
+        print(
+            f"{name:<10} {summary['latency_p50']:>9.3f} {summary['latency_p99']:>9.3f} "
+            f"{summary['elapsed']:>10.2f} {hedges:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
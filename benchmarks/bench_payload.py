@@ -0,0 +1,115 @@
+"""
+Benchmark the CPU cost of building and validating write requests.
+
+Compares, per operation, the legacy path of `post` (tuple check, URL,
+payload dictionary and JSON encoding) with the request templates used by
+the executor, for valid operations and for batches that fail validation.
+No request is sent.
+
+Usage:
+        python -m benchmarks.bench_payload [--operations 100000]
+"""
+
+import json
+import random
+import argparse
+import time
+
+from app.astral_objects.soloon import Soloon
+from app.transport.transport import api_url
+
+
+def legacy(soloon, items):
+    """
+    Build every request the way `Soloon.post` does, encoding the payload.
+    """
+    for item in items:
+        soloon.check_tuples(item, 3, soloon.colors)
+        url = api_url(soloon.endpoint)
+        payload = {
+            "candidateId": soloon.candidate_id,
+            "row": item[0],
+            "column": item[1],
+            "color": item[2],
+        }
+        json.dumps(payload).encode()
+
+
+def templated(soloon, items):
+    """
+    Validate the batch once, then build every body from the request template.
+    """
+    soloon.validate_batch(items)
+    template = soloon.template("post")
+    body = template.body
+    for row, column, color in items:
+        body(row, column, color)
+
+
+def legacy_failure(soloon, items):
+    """
+    Check every tuple with `check_tuples`, counting the invalid ones.
+    """
+    invalid = 0
+    for item in items:
+        try:
+            soloon.check_tuples(item, 3, soloon.colors)
+        except AssertionError:
+            invalid += 1
+    return invalid
+
+
+def templated_failure(soloon, items):
+    """
+    Validate the batch at once with the request template.
+    """
+    try:
+        soloon.validate_batch(items)
+    except AssertionError:
+        pass
+
+
+def per_operation(function, soloon, items, repeat=5):
+    """
+    Run a function over a batch several times.
+
+    Returns:
+        float: The best time per item, in nanoseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        function(soloon, items)
+        best = min(best, time.perf_counter_ns() - started)
+    return best / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    soloon = Soloon(candidate_id="0123456789abcdef")
+    items = [
+        (rng.randrange(1000), rng.randrange(1000), rng.choice(Soloon.colors))
+        for _ in range(args.operations)
+    ]
+    # One operation in ten carries an invalid color
+    invalid = [
+        (row, column, "green") if index % 10 == 0 else (row, column, color)
+        for index, (row, column, color) in enumerate(items)
+    ]
+
+    print(f"{'case':<20}{'legacy ns/op':>14}{'template ns/op':>16}{'speedup':>9}")
+    for name, slow, fast, batch in (
+        ("valid", legacy, templated, items),
+        ("10% invalid", legacy_failure, templated_failure, invalid),
+    ):
+        before = per_operation(slow, soloon, batch)
+        after = per_operation(fast, soloon, batch)
+        print(f"{name:<20}{before:>14.0f}{after:>16.0f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the stages of the solve pipeline against the stand-in API.
+
+Solves challenge 2 on a random goal map served by the stand-in server, run in
+its own process, at several concurrencies and reports for every stage of the
+pipeline (goal source, plan, schedule, execute, record) the items it handled,
+its utilization (the fraction of the run its workers spent working) and the
+time it spent blocked on a full queue. A stage close to 100% is the bottleneck.
+
+With `--lanes`, every concurrency is also run with one lane per endpoint
+(`concurrency` writes in flight per endpoint) and the writes dispatched per
+lane are reported. `--endpoint-latency soloons=0.1` slows one endpoint down to
+show how the lanes keep the others busy.
+
+Usage:
+        python -m benchmarks.bench_pipeline [--size 60] [--concurrency 1 8 32] [--lanes] [--endpoint-latency soloons=0.1]
+"""
+
+import os
+import argparse
+import contextlib
+
+from app.challenge.challenge_goal import ChallengeGoal
+from app.transport.transport import RequestsTransport
+from benchmarks.standin_server import spawn
+
+
+def solve(concurrency, queue_size, lean, lanes):
+    """
+    Solve challenge 2 once.
+
+    Returns:
+        ChallengeGoal: The challenge, with the report of the run in `report`.
+    """
+    if lean:
+        from app.transport.lean import LeanTransport
+
+        transport = LeanTransport(partition=lanes)
+    else:
+        transport = RequestsTransport()
+    challenge = ChallengeGoal(
+        concurrency=concurrency,
+        transport=transport,
+        queue_size=queue_size,
+        lanes=[] if lanes else None,
+    )
+    challenge.candidate_id = "benchmark"
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        challenge.report = challenge.solve_challengue_2()
+    return challenge
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--endpoint-latency", action="append", default=[])
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--lean-transport", action="store_true")
+    parser.add_argument("--lanes", action="store_true")
+    args = parser.parse_args()
+
+    server, url = spawn(
+        size=args.size, latency=args.latency, endpoint_latency=args.endpoint_latency
+    )
+    os.environ["CROSSMINT_API_URL"] = url
+    try:
+        for concurrency in args.concurrency:
+            for lanes in [False, True] if args.lanes else [False]:
+                challenge = solve(
+                    concurrency, args.queue_size, args.lean_transport, lanes
+                )
+                report = challenge.report
+                print(
+                    f"concurrency {concurrency}{', lanes' if lanes else ''}: "
+                    f"{report.succeeded} objects in {report.elapsed:.2f}s "
+                    f"({report.throughput:.0f} objects/s)"
+                )
+                print(
+                    f"  {'stage':<12}{'workers':>8}{'in':>8}{'out':>8}"
+                    f"{'busy (s)':>10}{'blocked (s)':>13}{'utilization':>13}"
+                )
+                for stage in challenge.stage_stats:
+                    print(
+                        f"  {stage.name:<12}{stage.workers:>8}{stage.items_in:>8}"
+                        f"{stage.items_out:>8}{stage.busy:>10.2f}"
+                        f"{stage.blocked:>13.2f}{stage.utilization:>12.0%}"
+                    )
+                for name, stats in challenge.lane_stats.items():
+                    print(
+                        f"  lane {name:<9}{stats['dispatched']:>8} writes, "
+                        f"peak {stats['peak_in_flight']} in flight"
+                    )
+    finally:
+        server.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the solver offline by replaying a recorded cassette.
+
+Records a solve of challenge 2 against a rate-limited stand-in server into
+a cassette (unless one is given), then replays it through `ReplayTransport`
+at several concurrencies and reports the time, requests and 429 responses
+of each run. Runs of the same cassette are reproducible, so their numbers can
+be compared between commits.
+
+Usage:
+        python -m benchmarks.bench_replay [--cassette run.jsonl.gz] [--latency-scale 1]
+"""
+
+import os
+import argparse
+import tempfile
+import contextlib
+import logging
+
+from app.challenge.challenge_goal import ChallengeGoal
+from app.transport.cassette import RecordingTransport, ReplayTransport
+from app.transport.transport import RequestsTransport
+from benchmarks.standin_server import StandinServer, random_goal_map
+
+
+def solve(transport, concurrency):
+    """
+    Solve challenge 2 through the given transport.
+
+    Returns:
+        dict: The summary of the run metrics.
+    """
+    challenge = ChallengeGoal(concurrency=concurrency, transport=transport)
+    challenge.candidate_id = "benchmark"
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        challenge.get_goal_map()
+        challenge.solve_challengue_2()
+    return challenge.metrics.summary()
+
+
+def record(path, size, rate_limit, concurrency):
+    """
+    Record a solve against the stand-in server into a cassette.
+
+    Returns:
+        dict: The summary of the recorded run.
+    """
+    server = StandinServer(random_goal_map(size), latency=0.02, rate_limit=rate_limit)
+    with server:
+        os.environ["CROSSMINT_API_URL"] = server.url
+        recorder = RecordingTransport(RequestsTransport(), path)
+        try:
+            return solve(recorder, concurrency)
+        finally:
+            recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--cassette", help="Cassette to replay instead of recording one."
+    )
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--rate-limit", type=float, default=40)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    header = f"{'run':<14} {'time (s)':>9} {'requests':>9} {'429':>5} {'ops/s':>8}"
+    rows = []
+    path = args.cassette
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "cassette.jsonl.gz")
+        summary = record(path, args.size, args.rate_limit, max(args.concurrency))
+        rows.append(("recorded", summary))
+        print(f"Recorded {path}")
+    os.environ.setdefault("CROSSMINT_API_URL", "http://replay/api")
+
+    for concurrency in args.concurrency:
+        transport = ReplayTransport(path, latency_scale=args.latency_scale)
+        rows.append((f"replay x{concurrency}", solve(transport, concurrency)))
+
+    print(header)
+    for name, summary in rows:
+        print(
+            f"{name:<14} {summary['elapsed']:>9.2f} {summary['requests']:>9} "
+            f"{summary['rate_limited']:>5} {summary['operations_per_second']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark the startup latency of the command line.
+
+Runs `main.py` in fresh interpreters for cases that should answer without
+touching the network (help, an unsupported challenge and a dry run of a
+small goal file) and reports the median wall time of each, together with
+the total import time reported by `python -X importtime`.
+
+Usage:
+        python -m benchmarks.bench_startup [--runs 20]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_time(args, runs):
+    """
+    Measure the wall time of `python main.py <args>` in fresh interpreters.
+
+    Returns:
+        float: The median wall time, in milliseconds.
+    """
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py", *args],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def import_time(args):
+    """
+    Sum the self import time of every module loaded by `python main.py <args>`.
+
+    Returns:
+        tuple: (total import time in milliseconds, number of modules imported).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    lines = [line for line in result.stderr.splitlines() if "|" in line]
+    total = 0
+    for line in lines[1:]:
+        self_time = line.split("|")[0].split(":")[-1].strip()
+        if self_time.isdigit():
+            total += int(self_time)
+    return total / 1000, len(lines) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as goal:
+        json.dump({"goal": [["POLYANET", "SPACE"], ["SPACE", "RED_SOLOON"]]}, goal)
+    cases = {
+        "help": ["--help"],
+        "unsupported challenge": ["99"],
+        "dry run": ["2", "--dry-run", "--goal-file", goal.name],
+    }
+    try:
+        print(f"{'case':<22} {'wall (ms)':>10} {'imports (ms)':>13} {'modules':>8}")
+        for name, case in cases.items():
+            imports, modules = import_time(case)
+            print(
+                f"{name:<22} {wall_time(case, args.runs):>10.1f} "
+                f"{imports:>13.1f} {modules:>8}"
+            )
+    finally:
+        os.unlink(goal.name)
+
+
+if __name__ == "__main__":
+    main()
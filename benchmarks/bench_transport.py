@@ -0,0 +1,75 @@
+"""
+Benchmark the write throughput of the transports against the stand-in API.
+
+Sends the same burst of posts through `RequestsTransport` and through
+`LeanTransport` with and without pipelining, from a pool of threads, and
+reports for each the requests per second and the requests per second of
+client CPU time (i.e. per core). The stand-in server runs in its own
+process so that only the client is measured.
+
+Usage:
+        python -m benchmarks.bench_transport [--requests 5000] [--threads 16]
+"""
+
+import time
+import argparse
+
+from concurrent.futures import ThreadPoolExecutor
+from app.transport.lean import LeanTransport
+from app.transport.transport import RequestsTransport
+from benchmarks.standin_server import spawn
+
+
+def burst(transport, url, requests, threads):
+    """
+    Post a burst of polyanets through a transport.
+
+    Returns:
+        tuple: (wall time, client CPU time), in seconds.
+    """
+
+    def post(index):
+        body = b'{"candidateId": "bench", "row": %d, "column": %d}' % (
+            index % 30,
+            index // 30 % 30,
+        )
+        transport.send("post", url, body).raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(post, range(threads)))  # Warm up the connections
+        started, cpu_started = time.perf_counter(), time.process_time()
+        list(pool.map(post, range(requests)))
+        return time.perf_counter() - started, time.process_time() - cpu_started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, api = spawn(latency=args.latency)
+    url = f"{api}/polyanets"
+    cases = [
+        ("requests", RequestsTransport()),
+        ("lean", LeanTransport()),
+        ("lean, pipeline 4", LeanTransport(pipeline=4)),
+        ("lean, pipeline 16", LeanTransport(pipeline=16, max_connections=1)),
+    ]
+    try:
+        print(f"{'transport':<20}{'req/s':>10}{'req/cpu-s':>12}{'cpu us/req':>12}")
+        for name, transport in cases:
+            wall, cpu = burst(transport, url, args.requests, args.threads)
+            print(
+                f"{name:<20}{args.requests / wall:>10.0f}"
+                f"{args.requests / cpu:>12.0f}{cpu / args.requests * 1e6:>12.0f}"
+            )
+            if isinstance(transport, LeanTransport):
+                transport.close()
+    finally:
+        server.kill()
+
+
+if __name__ == "__main__":
+    main()
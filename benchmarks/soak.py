@@ -0,0 +1,194 @@
+"""
+Soak test: solve and reset the megaverse over and over, watching for leaks.
+
+Drives repeated reset/solve cycles of challenge 2 through one long-lived
+`ChallengeGoal`, the way a daemon would, against the stand-in server run in
+its own process. After every cycle it samples the resident memory, the open
+file descriptors, the live Python objects, the mean request latency and the
+throughput of the cycle. At the end the growth of each sample per hour is
+fitted by least squares, ignoring a warm-up period, and the run fails when
+memory, descriptors or latency grow faster than the given slopes.
+
+Usage:
+        python -m benchmarks.soak [--duration 600] [--max-rss-slope 20] [--output soak.json]
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import contextlib
+import numpy as np
+
+from app.challenge.challenge_goal import ChallengeGoal
+from app.transport.transport import RequestsTransport
+from benchmarks.standin_server import spawn
+
+
+def rss_mb():
+    """
+    Return the resident memory of the process, in MB.
+
+    Falls back to the peak resident memory where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def open_fds():
+    """
+    Return the number of open file descriptors, None where it cannot be counted.
+    """
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return None
+
+
+def slope_per_hour(times, values):
+    """
+    Fit the growth of a series by least squares.
+
+    Args:
+        times (list): Sample times, in seconds.
+        values (list): Sampled values.
+
+    Returns:
+        float: The growth of the values per hour, 0 with fewer than 3 samples.
+    """
+    if len(times) < 3 or None in values:
+        return 0.0
+    return float(np.polyfit(times, values, 1)[0]) * 3600
+
+
+def make_transport(name, pipeline):
+    if name == "lean":
+        from app.transport.lean import LeanTransport
+
+        return LeanTransport(pipeline=pipeline)
+    return RequestsTransport()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=600, help="Seconds to run.")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--transport", choices=["requests", "lean"], default="lean")
+    parser.add_argument("--pipeline", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument(
+        "--warmup", type=float, default=0.2, help="Fraction of the run ignored."
+    )
+    parser.add_argument("--max-rss-slope", type=float, default=20.0, help="MB/hour.")
+    parser.add_argument("--max-fd-slope", type=float, default=10.0, help="fds/hour.")
+    parser.add_argument(
+        "--max-latency-slope", type=float, default=5.0, help="ms/hour of mean latency."
+    )
+    parser.add_argument("--output", help="Where the samples are written as JSON.")
+    args = parser.parse_args()
+
+    # Log like the command line does, without filling a terminal
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler], force=True)
+
+    server, url = spawn(
+        size=args.size, latency=args.latency, rate_limit=args.rate_limit
+    )
+    os.environ["CROSSMINT_API_URL"] = url
+    challenge = ChallengeGoal(
+        concurrency=args.concurrency,
+        transport=make_transport(args.transport, args.pipeline),
+    )
+    challenge.candidate_id = "soak"
+
+    samples = []
+    started = time.monotonic()
+    print(
+        f"{'time (s)':>9} {'cycle':>6} {'ops/s':>8} {'latency (ms)':>13} "
+        f"{'rss (MB)':>9} {'fds':>5} {'objects':>9}"
+    )
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while time.monotonic() - started < args.duration:
+                before = challenge.metrics.summary()
+                cycle_started = time.monotonic()
+                challenge.reset()
+                challenge.get_goal_map()
+                challenge.solve_challengue_2()
+                elapsed = time.monotonic() - cycle_started
+                after = challenge.metrics.summary()
+
+                requests = after["requests"] - before["requests"]
+                latency = (
+                    after["latency_mean"] * after["requests"]
+                    - before["latency_mean"] * before["requests"]
+                )
+                gc.collect()
+                sample = {
+                    "time": time.monotonic() - started,
+                    "cycle": len(samples) + 1,
+                    "operations_per_second": (
+                        after["operations"] - before["operations"]
+                    )
+                    / elapsed,
+                    "latency_ms": latency / requests * 1000 if requests else 0.0,
+                    "rss_mb": rss_mb(),
+                    "fds": open_fds(),
+                    "objects": len(gc.get_objects()),
+                    "initialized": len(challenge.initialized),
+                }
+                samples.append(sample)
+                print(
+                    f"{sample['time']:>9.1f} {sample['cycle']:>6} "
+                    f"{sample['operations_per_second']:>8.1f} "
+                    f"{sample['latency_ms']:>13.2f} {sample['rss_mb']:>9.1f} "
+                    f"{sample['fds'] if sample['fds'] is not None else '-':>5} "
+                    f"{sample['objects']:>9}",
+                    file=sys.__stdout__,
+                    flush=True,
+                )
+    finally:
+        server.kill()
+
+    steady = [s for s in samples if s["time"] >= args.warmup * args.duration]
+    times = [s["time"] for s in steady]
+    slopes = {
+        "rss_mb": slope_per_hour(times, [s["rss_mb"] for s in steady]),
+        "fds": slope_per_hour(times, [s["fds"] for s in steady]),
+        "latency_ms": slope_per_hour(times, [s["latency_ms"] for s in steady]),
+        "objects": slope_per_hour(times, [s["objects"] for s in steady]),
+    }
+    limits = {
+        "rss_mb": args.max_rss_slope,
+        "fds": args.max_fd_slope,
+        "latency_ms": args.max_latency_slope,
+    }
+    print("Growth per hour after warm-up:")
+    failed = False
+    for name, slope in slopes.items():
+        limit = limits.get(name)
+        verdict = ""
+        if limit is not None:
+            verdict = "FAIL" if slope > limit else "ok"
+            failed = failed or slope > limit
+        print(f"  {name:<11} {slope:>12.2f} {verdict}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"samples": samples, "slopes": slopes}, file, indent=1)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+A local stand-in for the Crossmint challenge API, used by the benchmarks.
+
+It serves the goal and current maps and accepts posts and deletes of
+polyanets, soloons and comeths, keeping the megaverse in memory. Latency,
+stalls and rate limiting can be configured to reproduce the behaviour of
+the real service.
+
+Usage:
+        python -m benchmarks.standin_server [--port 8000] [--size 30]
+"""
+
+import sys
+import json
+import time
+import socket
+import random
+import argparse
+import threading
+import subprocess
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+ENDPOINTS = {
+    "polyanets": (0, None, "POLYANET"),
+    "soloons": (1, "color", "SOLOON"),
+    "comeths": (2, "direction", "COMETH"),
+}
+
+
+def random_goal_map(size, seed=0):
+    """
+    Build a random goal map for challenge 2.
+
+    Args:
+        size (int): Number of rows and columns of the map.
+        seed (int, optional): Seed of the random generator.
+
+    Returns:
+        list: A list of rows of goal tokens, about a third of them not 'SPACE'.
+    """
+    rng = random.Random(seed)
+    tokens = ["POLYANET", "RED_SOLOON", "BLUE_SOLOON", "UP_COMETH", "LEFT_COMETH"]
+    return [
+        [rng.choice(tokens) if rng.random() < 0.33 else "SPACE" for _ in range(size)]
+        for _ in range(size)
+    ]
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class StandinServer:
+    """
+    An in-memory Crossmint API served over HTTP/1.1 with persistent connections.
+
+    Every write waits for a latency drawn from a lognormal distribution around
+    `latency`, or around the latency of its endpoint in `endpoint_latency`; a
+    fraction `stall_probability` of them stalls for `stall` seconds instead.
+    Writes above `rate_limit` per second are answered with 429.
+    """
+
+    def __init__(
+        self,
+        goal_map,
+        port=0,
+        latency=0.02,
+        stall_probability=0.0,
+        stall=2.0,
+        rate_limit=None,
+        seed=0,
+        endpoint_latency=None,
+    ):
+        """
+        Initializes a StandinServer instance.
+
+        Args:
+            goal_map (list): The goal map served to every candidate.
+            port (int, optional): Port to listen on, 0 picks a free one.
+            latency (float, optional): Median latency of a write, in seconds.
+            stall_probability (float, optional): Fraction of writes that stall.
+            stall (float, optional): Duration of a stall, in seconds.
+            rate_limit (float, optional): Writes per second accepted before answering 429.
+            seed (int, optional): Seed of the latency generator.
+            endpoint_latency (dict, optional): Median latency of the writes of some
+                endpoints (e.g. {'soloons': 0.2}), overriding `latency`.
+        """
+        self.goal_map = goal_map
+        self.content = [[None for _ in row] for row in goal_map]
+        self.latency = latency
+        self.endpoint_latency = endpoint_latency or {}
+        self.stall_probability = stall_probability
+        self.stall = stall
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.writes = 0
+        self.httpd = _HTTPServer(("127.0.0.1", port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        """
+        str: The base URL of the API, to be used as `CROSSMINT_API_URL`.
+        """
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        """
+        Serve requests from a background thread.
+
+        Returns:
+            StandinServer: The server itself.
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving requests and close the listening socket.
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _delay(self, endpoint):
+        latency = self.endpoint_latency.get(endpoint, self.latency)
+        with self.lock:
+            if self.rng.random() < self.stall_probability:
+                return self.stall
+            return self.rng.lognormvariate(0, 0.25) * latency
+
+    def _rate_limited(self):
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1:
+                self.window_start = now
+                self.window_count = 0
+            self.window_count += 1
+            return self.window_count > self.rate_limit
+
+    def _write(self, method, endpoint, payload):
+        object_type, attribute, name = ENDPOINTS[endpoint]
+        row, column = payload["row"], payload["column"]
+        if not (0 <= row < len(self.content) and 0 <= column < len(self.content[0])):
+            return 400, {"error": "Out of bounds"}
+        with self.lock:
+            self.writes += 1
+            if method == "DELETE":
+                self.content[row][column] = None
+            else:
+                cell = {"type": object_type}
+                if attribute:
+                    cell[attribute] = payload[attribute]
+                self.content[row][column] = cell
+        return 200, {}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if parts[:2] == ["api", "map"] and parts[-1] == "goal":
+                    self._reply(200, {"goal": server.goal_map})
+                elif parts[:2] == ["api", "map"] and len(parts) == 3:
+                    with server.lock:
+                        content = [list(row) for row in server.content]
+                    self._reply(200, {"map": {"content": content}})
+                else:
+                    self._reply(404, {"error": "Not found"})
+
+            def _do_write(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                endpoint = self.path.strip("/").split("/")[-1]
+                if endpoint not in ENDPOINTS:
+                    self._reply(404, {"error": "Not found"})
+                    return
+                time.sleep(server._delay(endpoint))
+                if server._rate_limited():
+                    self._reply(429, {"error": "Too Many Requests"})
+                    return
+                self._reply(*server._write(self.command, endpoint, payload))
+
+            do_POST = _do_write
+            do_DELETE = _do_write
+
+        return Handler
+
+
+def spawn(**options):
+    """
+    Run the stand-in server in a subprocess and wait until it accepts connections.
+
+    Running it in its own process keeps its CPU time and memory out of the
+    measurements of the client.
+
+    Args:
+        **options: Command line options of the server, e.g. `latency=0.01`
+            for `--latency 0.01`; a list repeats the option.
+
+    Returns:
+        tuple: (the subprocess.Popen of the server, the base URL of its API).
+
+    Raises:
+        RuntimeError: If the server does not start.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [sys.executable, "-m", "benchmarks.standin_server", "--port", str(port)]
+    for name, value in options.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for value in values:
+            if value is not None:
+                command += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}/api"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("The stand-in server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--stall-probability", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument(
+        "--endpoint-latency",
+        action="append",
+        default=[],
+        metavar="ENDPOINT=SECONDS",
+        help="Median latency of the writes of one endpoint, e.g. soloons=0.2.",
+    )
+    args = parser.parse_args()
+    endpoint_latency = {}
+    for setting in args.endpoint_latency:
+        endpoint, seconds = setting.split("=")
+        endpoint_latency[endpoint] = float(seconds)
+    server = StandinServer(
+        random_goal_map(args.size),
+        port=args.port,
+        latency=args.latency,
+        stall_probability=args.stall_probability,
+        rate_limit=args.rate_limit,
+        endpoint_latency=endpoint_latency,
+    )
+    print(f"Serving the stand-in API at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
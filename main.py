@@ -1,10 +1,13 @@
+import argparse
 import logging
+import os
 import sys
-import inspect
-from app.challenge.challenge_goal import ChallengeGoal
-from app.astral_objects.polyanet import Polyanet
-from app.astral_objects.soloon import Soloon
-from app.astral_objects.cometh import Cometh
+import time
+from app.challenge.challenges import SUPPORTED_CHALLENGES
+
+# The network stack, numpy and the astral objects are imported inside the
+# functions using them, so `--help` and invalid arguments answer without
+# loading them.
 
 
 # Configure logging
@@ -14,23 +17,343 @@ logger = logging.getLogger(__name__)
 
 def get_supported_challenges():
     """
-    Dynamically detect all available `solve_challengue_X` methods in the ChallengeGoal class being X
-    the challenge's number.
+    Return the challenges that can be solved, being X the challenge's number of
+    every `solve_challengue_X` method of the ChallengeGoal class.
 
-    The method inspects ChallengeGoal to find all methods that start with
-    `solve_challengue_` followed by a number.
+    The challenges come from a static registry, so no module of the
+    application has to be imported to know them.
 
     Returns:
         dict: A dictionary where keys are integers representing challenge numbers
         and values are the corresponding method names as strings.
     """
-    methods = inspect.getmembers(ChallengeGoal, predicate=inspect.isfunction)
-    challenge_methods = {
-        int(name.split("_")[-1]): name
-        for name, _ in methods
-        if name.startswith("solve_challengue_") and name.split("_")[-1].isdigit()
-    }
-    return challenge_methods
+    return SUPPORTED_CHALLENGES
+
+
+def parse_lane(text):
+    """
+    Parse the settings of a lane given as NAME=CONCURRENCY[:RATE[:WEIGHT]].
+
+    Args:
+        text (str): The settings, e.g. 'soloon=4:2' for at most 4 soloon writes
+            in flight and 2 per second.
+
+    Returns:
+        tuple: (name, concurrency, rate limit or None, weight).
+
+    Raises:
+        argparse.ArgumentTypeError: If the settings are malformed or out of range.
+    """
+    try:
+        name, settings = text.split("=")
+        values = settings.split(":")
+        if not name or len(values) > 3:
+            raise ValueError
+        concurrency = int(values[0])
+        rate_limit = float(values[1]) if len(values) > 1 and values[1] else None
+        weight = float(values[2]) if len(values) > 2 else 1.0
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid lane {text!r}, expected NAME=CONCURRENCY[:RATE[:WEIGHT]]"
+        )
+    if concurrency < 1 or not (rate_limit is None or rate_limit > 0) or not weight > 0:
+        raise argparse.ArgumentTypeError(
+            f"invalid lane {text!r}, the concurrency must be at least 1 and the "
+            "rate and weight positive"
+        )
+    return name.lower(), concurrency, rate_limit, weight
+
+
+def parse_region(text):
+    """
+    Parse a rectangle of the megaverse given as ROWS[,COLUMNS].
+
+    Args:
+        text (str): The rectangle, e.g. '10:20,30:40' for rows 10 to 19 and
+            columns 30 to 39.
+
+    Returns:
+        Rectangle: The parsed rectangle.
+
+    Raises:
+        argparse.ArgumentTypeError: If the rectangle is malformed.
+    """
+    from app.challenge.region import Region
+
+    try:
+        return Region.parse(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid region {text!r}, expected ROWS[,COLUMNS] such as 10:20,30:40"
+        )
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv (list, optional): The arguments to parse. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve Crossmint's megaverse challenges.",
+        epilog="Example: python main.py 1",
+    )
+    parser.add_argument(
+        "challenge_number", type=int, help="The challenge to solve (e.g., 1 or 2)."
+    )
+    parser.add_argument(
+        "--verify-rounds",
+        type=int,
+        default=3,
+        help="Convergence rounds run after solving to repair mismatched cells "
+        "(0 disables verification).",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete every object of the current megaverse before solving.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Maximum number of requests in flight at once (default 1, or "
+        "seeded from --history).",
+    )
+    parser.add_argument(
+        "--lanes",
+        action="store_true",
+        help="Dispatch every endpoint from its own lane, with --concurrency "
+        "writes in flight per endpoint unless set with --lane.",
+    )
+    parser.add_argument(
+        "--lane",
+        type=parse_lane,
+        action="append",
+        default=[],
+        metavar="NAME=CONCURRENCY[:RATE[:WEIGHT]]",
+        help="Concurrency, rate limit and scheduling weight of the lane of an "
+        "object (e.g. soloon=4:2). Implies --lanes.",
+    )
+    parser.add_argument(
+        "--lean-transport",
+        action="store_true",
+        help="Send writes on persistent sockets instead of through requests.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        default=1,
+        help="Writes pipelined on one connection of the lean transport.",
+    )
+    parser.add_argument(
+        "--record",
+        help="Record every exchange with the API into this cassette file.",
+    )
+    parser.add_argument(
+        "--replay",
+        help="Serve the exchanges of this cassette file instead of calling the API.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=1.0,
+        help="Factor applied to the latencies of a replayed cassette, 0 for none.",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help="Send a duplicate of writes still running after this latency "
+        "percentile (e.g. 95). Hedging is disabled when not given.",
+    )
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=0.05,
+        help="Maximum ratio of duplicated writes to writes.",
+    )
+    parser.add_argument(
+        "--circuit-breaker",
+        action="store_true",
+        help="Stop sending requests to an endpoint while most of them fail.",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=float,
+        default=0.5,
+        help="Failure rate of the recent requests of an endpoint that opens its circuit.",
+    )
+    parser.add_argument(
+        "--breaker-slow",
+        type=float,
+        help="Latency in seconds above which a request counts as failed for the breaker.",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=10.0,
+        help="Seconds an open circuit waits before probing the endpoint again.",
+    )
+    parser.add_argument(
+        "--breaker-park",
+        action="store_true",
+        help="Park requests while their circuit is open instead of failing them.",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="Seconds the run may take. Work that cannot finish in time is not "
+        "started, and what remains is written to the manifest.",
+    )
+    parser.add_argument(
+        "--manifest",
+        default="remaining.json",
+        help="Where the operations left when the deadline is reached are written.",
+    )
+    parser.add_argument(
+        "--region",
+        type=parse_region,
+        action="append",
+        default=[],
+        help="Only work on a rectangle of the megaverse, given as ROWS[,COLUMNS] "
+        "slices such as 10:20,30:40. Can be repeated.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Build the operation plan and estimate its cost without sending any write.",
+    )
+    parser.add_argument(
+        "--goal-file",
+        help="Read the goal map from a JSON file instead of the API.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Where the run metrics are written. A dry run calibrates its "
+        "estimate from this file when it exists.",
+    )
+    parser.add_argument(
+        "--trace-file",
+        help="Write a binary trace of every request sent (see app/challenge/trace.py).",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.5,
+        help="Seconds per request assumed by the dry-run cost model.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Maximum requests per second sent to the API, also assumed by the "
+        "dry-run cost model.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Seconds a write may take before it fails. Map reads wait as long "
+        "as needed.",
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        help="Serve the live progress of the run as JSON on "
+        "http://127.0.0.1:PORT/status (0 picks a free port).",
+    )
+    parser.add_argument(
+        "--history",
+        help="Local run history file. Settings not given on the command line "
+        "are seeded from the recent runs recorded there, and every run is "
+        "appended to it.",
+    )
+    return parser.parse_args(argv)
+
+
+def seed_from_history(args, history, candidate_id):
+    """
+    Fill the settings not given on the command line from the run history.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments, updated in place.
+        history (RunHistory): The history of earlier runs.
+        candidate_id (str): The candidate of the run.
+
+    Returns:
+        Seed or None: The settings derived from the history, None without recent runs.
+    """
+    seed = history.seed(candidate_id)
+    if seed is None:
+        logger.info(f"No recent runs in {history.path}, using the default settings")
+    else:
+        if args.concurrency is None:
+            args.concurrency = seed.concurrency
+        if args.rate_limit is None:
+            args.rate_limit = seed.rate_limit
+        if args.timeout is None:
+            args.timeout = seed.timeout
+        logger.info(
+            f"Seeded from {seed.runs} recent runs: concurrency {args.concurrency}, "
+            f"rate limit {args.rate_limit}, timeout {args.timeout}"
+        )
+    if args.concurrency is None:
+        args.concurrency = 1
+    return seed
+
+
+def dry_run(challenge, args):
+    """
+    Print the operation plan of the goal map, the rules it breaks and its estimated cost.
+
+    Args:
+        challenge (ChallengeGoal): The challenge with its goal map loaded.
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Raises:
+        ValueError: If the goal map contains an unknown token.
+    """
+    import datetime
+    from app.challenge.metrics import RunMetrics
+    from app.challenge.planner import Plan, CostModel
+    from app.challenge.simulator import MegaverseSimulator
+
+    if challenge.region is None:
+        plan = Plan.from_goal_map(challenge.goal_map)
+    else:
+        plan = Plan.from_region(challenge.goal_map, challenge.region)
+    rows = len(challenge.goal_map)
+    simulator = MegaverseSimulator(rows, len(challenge.goal_map[0]) if rows else 0)
+    violations = simulator.apply_plan(plan)
+    if args.metrics_file and os.path.exists(args.metrics_file):
+        model = CostModel.from_metrics(
+            RunMetrics.load(args.metrics_file),
+            rate_limit=args.rate_limit,
+            concurrency=args.concurrency,
+        )
+        source = f"metrics from {args.metrics_file}"
+    else:
+        model = CostModel(
+            latency=args.latency,
+            rate_limit=args.rate_limit,
+            concurrency=args.concurrency,
+        )
+        source = f"{model.latency}s per request"
+        if model.rate_limit:
+            source += f", at most {model.rate_limit} requests per second"
+
+    seconds = model.estimate(len(plan))
+    print(f"Dry run: {len(plan)} operations")
+    for kind, count in sorted(plan.counts().items()):
+        print(f"  {kind}: {count}")
+    print(f"Rule violations: {len(violations)}")
+    for violation in violations[:10]:
+        print(
+            f"  {violation.token} at ({violation.row}, {violation.column}): {violation.rule}"
+        )
+    print(f"Estimated requests: {model.requests(len(plan))}")
+    print(f"Estimated time: {datetime.timedelta(seconds=round(seconds))} ({source})")
 
 
 def main():
@@ -39,25 +362,24 @@ def main():
 
     This function:
     1. Reads a challenge number from the command line.
-    2. Determines which challenges are supported by analyzing the
-       ChallengeGoal class.
+    2. Checks the challenge against the registry of supported challenges.
     3. Initializes a ChallengeGoal instance and try to solve the specified challenge.
+    4. Verifies the resulting megaverse and repairs mismatched cells.
+
+    With --reset, the current megaverse is cleared before solving. With --dry-run,
+    only the operation plan and its estimated cost are printed. With --deadline,
+    the run exits with status 3 and writes the operations left to --manifest
+    when they could not all be done in time. With --region, only the given
+    rectangles of the megaverse are reset, solved and verified. With --history,
+    the settings not given are seeded from recent runs and the run is recorded.
+    With --status-port, the progress of the run is served as JSON.
 
     Usage:
-        python main.py <challenge_number>
+        python main.py <challenge_number> [--reset] [--concurrency N] [--dry-run]
     """
-    # Ensure the program receives a challenge number as input
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <challenge_number>")
-        print("Example: python main.py 1")
-        sys.exit(1)
-
-    # Parse the challenge number from the command line
-    try:
-        challenge_number = int(sys.argv[1])
-    except ValueError:
-        print("Challenge number must be an integer (e.g., 1 or 2).")
-        sys.exit(1)
+    args = parse_args()
+    started = time.monotonic()
+    challenge_number = args.challenge_number
 
     supported_challenges = get_supported_challenges()
 
@@ -66,20 +388,185 @@ def main():
         print(f"Supported challenges are: {sorted(supported_challenges.keys())}")
         sys.exit(1)
 
-    challenge = ChallengeGoal()
+    from app.challenge.challenge_goal import ChallengeGoal
+    from app.challenge.metrics import RunMetrics
+    from app.transport.transport import RequestsTransport
+
+    metrics = RunMetrics()
+    history = seed = None
+    if args.history:
+        from app.challenge.history import RunHistory
+
+        history = RunHistory(args.history)
+        seed = seed_from_history(args, history, os.getenv("CANDIDATE_ID"))
+    elif args.concurrency is None:
+        args.concurrency = 1
+
+    transport = RequestsTransport(write_timeout=args.timeout)
+    recorder = None
+    if args.lean_transport:
+        from app.transport.lean import LeanTransport
+
+        options = {} if args.timeout is None else {"timeout": args.timeout}
+        transport = LeanTransport(
+            pipeline=args.pipeline,
+            fallback=transport,
+            partition=args.lanes or bool(args.lane),
+            **options,
+        )
+    if args.replay:
+        from app.transport.cassette import ReplayTransport
+
+        transport = ReplayTransport(args.replay, latency_scale=args.replay_latency)
+    elif args.record:
+        from app.transport.cassette import RecordingTransport
+
+        transport = recorder = RecordingTransport(transport, args.record)
+    if args.circuit_breaker:
+        from app.transport.circuit_breaker import CircuitBreakerTransport
+
+        transport = CircuitBreakerTransport(
+            transport,
+            park=args.breaker_park,
+            metrics=metrics,
+            error_threshold=args.breaker_threshold,
+            slow_threshold=args.breaker_slow,
+            cooldown=args.breaker_cooldown,
+        )
+    if args.hedge_percentile:
+        from app.transport.hedging import HedgedTransport
+
+        transport = HedgedTransport(
+            transport, percentile=args.hedge_percentile, budget=args.hedge_budget
+        )
+    trace = None
+    if args.trace_file and not args.dry_run:
+        from app.astral_objects.registry import REGISTRY
+        from app.challenge.trace import TraceWriter
+
+        trace = TraceWriter(args.trace_file, list(REGISTRY.types))
+    lanes = None
+    if args.lanes or args.lane:
+        from app.astral_objects.registry import REGISTRY
+        from app.challenge.lanes import Lane
+
+        unknown = sorted({name for name, *_ in args.lane} - set(REGISTRY.types))
+        if unknown:
+            print(f"Unknown lanes: {unknown}, known objects are {list(REGISTRY.types)}")
+            sys.exit(1)
+        lanes = [Lane(*settings) for settings in args.lane]
+        named = {lane.name for lane in lanes}
+        for name, rate in (seed.endpoint_rates if seed else {}).items():
+            if name not in named:
+                lanes.append(Lane(name, args.concurrency, rate))
+    region = None
+    if args.region:
+        from app.challenge.region import Region
+
+        region = Region(args.region)
+    challenge = ChallengeGoal(
+        concurrency=args.concurrency,
+        rate_limit=args.rate_limit,
+        transport=transport,
+        metrics=metrics,
+        trace=trace,
+        deadline=started + args.deadline if args.deadline else None,
+        lanes=lanes,
+        region=region,
+    )
+
+    status = None
+    if args.status_port is not None and not args.dry_run:
+        from app.challenge.status import StatusServer
+
+        status = StatusServer(challenge, port=args.status_port).start()
+        logger.info(f"Serving the run status on {status.url}")
+
+    if args.dry_run:
+        try:
+            if args.goal_file:
+                challenge.load_goal_map(args.goal_file)
+            else:
+                challenge.get_goal_map()
+            dry_run(challenge, args)
+        except Exception as e:
+            logger.error(f"Dry run of Challenge {challenge_number} failed: {e}")
+            sys.exit(1)
+        finally:
+            if recorder:
+                recorder.close()
+        return
 
     # Call the appropriate method based on the challenge number
     try:
+        if args.reset:
+            report = challenge.reset()
+            if report.failed:
+                raise Exception(f"Reset failed for {len(report.failed)} objects.")
         logger.info(f"Starting Challenge {challenge_number}...")
-        challenge.get_goal_map()
+        if args.goal_file:
+            challenge.load_goal_map(args.goal_file)
+        else:
+            challenge.get_goal_map()
         method_name = supported_challenges[challenge_number]
-        getattr(challenge, method_name)()
+        report = getattr(challenge, method_name)()
+        if challenge.deadline is not None and report.skipped:
+            report.save_manifest(args.manifest)
+            logger.warning(
+                f"Deadline reached: {report.succeeded} objects placed, "
+                f"{len(report.remaining())} operations left in {args.manifest}"
+            )
+            sys.exit(3)
+        expired = (
+            challenge.deadline is not None and time.monotonic() >= challenge.deadline
+        )
+        if report.failed and (args.verify_rounds == 0 or expired):
+            report.save_manifest(args.manifest)
+            logger.error(
+                f"Challenge {challenge_number} finished with {len(report.failed)} "
+                f"failed operations, listed in {args.manifest}."
+            )
+            sys.exit(1)
+        if args.verify_rounds > 0 and expired:
+            logger.warning("Deadline reached, skipping verification.")
+        elif args.verify_rounds > 0:
+            stubborn = challenge.converge(max_rounds=args.verify_rounds)
+            if stubborn and challenge.repairs.skipped:
+                challenge.repairs.save_manifest(args.manifest)
+                logger.warning(
+                    f"Deadline reached during verification: {len(stubborn)} "
+                    f"mismatched cells, {len(challenge.repairs.remaining())} "
+                    f"repairs left in {args.manifest}"
+                )
+                sys.exit(3)
+            if stubborn:
+                logger.error(
+                    f"Challenge {challenge_number} finished with {len(stubborn)} mismatched cells."
+                )
+                sys.exit(1)
         logger.info(f"Challenge {challenge_number} completed successfully!")
     except Exception as e:
         logger.error(
             f"An error occurred while solving Challenge {challenge_number}: {e}"
         )
         sys.exit(1)
+    finally:
+        if args.metrics_file:
+            challenge.metrics.save(args.metrics_file)
+        if history and challenge.metrics.requests:
+            history.record(
+                challenge.candidate_id,
+                challenge.metrics.summary(),
+                args.concurrency,
+                args.rate_limit,
+                args.timeout,
+            )
+        if recorder:
+            recorder.close()
+        if status:
+            status.close()
+        if trace:
+            trace.close()
 
 
 if __name__ == "__main__":
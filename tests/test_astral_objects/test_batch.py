@@ -0,0 +1,92 @@
+import unittest
+import threading
+from unittest.mock import Mock
+from app.astral_objects.polyanet import Polyanet
+from app.astral_objects.soloon import Soloon
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.transport = Mock()
+        self.transport.send.return_value = Mock(status_code=200)
+
+    def test_post_many(self):
+        soloon = Soloon(candidate_id="123", transport=self.transport)
+        result = soloon.post_many([(0, 0, "red"), (0, 1, "blue")])
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(result[0].status, 200)
+        self.assertEqual(result[0].attempts, 1)
+        template = soloon.template("post")
+        self.transport.send.assert_called_with(
+            "post", template.url, template.body(0, 1, "blue")
+        )
+
+    def test_sequence_is_validated_before_sending(self):
+        soloon = Soloon(candidate_id="123", transport=self.transport)
+        with self.assertRaises(AssertionError):
+            soloon.post_many([(0, 0, "red"), (0, 1, "green")])
+        self.transport.send.assert_not_called()
+
+    def test_generator_reports_invalid_items(self):
+        soloon = Soloon(candidate_id="123", transport=self.transport)
+        items = (item for item in [(0, 0, "red"), (0, 1, "green"), (0, 2, "white")])
+        result = soloon.post_many(items)
+
+        self.assertEqual(result.failures(), [1])
+        self.assertEqual(result[1].attempts, 0)
+        self.assertIsNone(result[1].status)
+        self.assertEqual(self.transport.send.call_count, 2)
+
+    def test_retries_rate_limited_items(self):
+        self.transport.send.side_effect = [
+            Mock(status_code=429),
+            Mock(status_code=200),
+            Mock(status_code=429),
+            Mock(status_code=429),
+        ]
+        polyanet = Polyanet(candidate_id="123", transport=self.transport)
+        result = polyanet.delete_many([(0, 0), (0, 1)], max_retries=2, backoff=0.001)
+
+        self.assertEqual(list(result.success), [1, 0])
+        self.assertEqual(list(result.attempts), [2, 2])
+        self.assertEqual(result[1].status, 429)
+
+    def test_errors_do_not_stop_the_batch(self):
+        self.transport.send.side_effect = [
+            ConnectionError("reset"),
+            Mock(status_code=200),
+        ]
+        polyanet = Polyanet(candidate_id="123", transport=self.transport)
+        result = polyanet.post_many([(0, 0), (0, 1)])
+
+        self.assertEqual(result.failures(), [0])
+        self.assertIsNone(result[0].status)
+
+    def test_concurrent_generator_is_bounded(self):
+        pulled = []
+        ahead = []
+        lock = threading.Lock()
+
+        def send(method, url, body):
+            # Items pulled from the generator but not sent yet
+            with lock:
+                ahead.append(len(pulled) - len(ahead))
+            return Mock(status_code=200)
+
+        def items():
+            for column in range(50):
+                pulled.append(column)
+                yield (0, column)
+
+        self.transport.send.side_effect = send
+        polyanet = Polyanet(candidate_id="123", transport=self.transport)
+        result = polyanet.post_many(items(), concurrency=4)
+
+        self.assertEqual(result.succeeded, 50)
+        self.assertLessEqual(max(ahead), 2 * 4 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
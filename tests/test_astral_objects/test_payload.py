@@ -0,0 +1,72 @@
+import json
+import unittest
+from unittest.mock import Mock
+from app.astral_objects.cometh import Cometh
+from app.astral_objects.polyanet import Polyanet
+from app.astral_objects.soloon import Soloon
+
+
+class TestRequestTemplate(unittest.TestCase):
+    def test_post_body_matches_payload(self):
+        template = Soloon(candidate_id="123").template("post")
+        body = template.body(1, 2, "blue")
+
+        self.assertEqual(template.method, "post")
+        self.assertTrue(template.url.endswith("/soloons"))
+        self.assertEqual(
+            body,
+            json.dumps(
+                {"candidateId": "123", "row": 1, "column": 2, "color": "blue"}
+            ).encode(),
+        )
+
+    def test_delete_body_has_no_attribute(self):
+        template = Cometh(candidate_id="123").template("delete")
+        self.assertEqual(
+            json.loads(template.body(3, 4)),
+            {"candidateId": "123", "row": 3, "column": 4},
+        )
+
+    def test_candidate_id_is_escaped(self):
+        template = Polyanet(candidate_id='a"%d').template("post")
+        self.assertEqual(json.loads(template.body(0, 1))["candidateId"], 'a"%d')
+
+    def test_body_rejects_unknown_value(self):
+        template = Soloon(candidate_id="123").template("post")
+        with self.assertRaises(AssertionError):
+            template.body(1, 2, "green")
+
+    def test_body_rejects_cells_that_are_not_integers(self):
+        template = Soloon(candidate_id="123").template("post")
+        for row, column in ((1.5, 2), ("1", 2), (1, True)):
+            with self.assertRaises(AssertionError):
+                template.body(row, column, "blue")
+
+    def test_template_is_cached(self):
+        soloon = Soloon(candidate_id="123")
+        self.assertIs(soloon.template("post"), soloon.template("post"))
+        self.assertIsNot(soloon.template("post"), soloon.template("delete"))
+
+    def test_validate_batch(self):
+        soloon = Soloon(candidate_id="123")
+        soloon.validate_batch([(0, 0, "red"), (1, 1, "white")])
+        soloon.validate_batch([(0, 0), (1, 1)], "delete")
+
+        with self.assertRaises(AssertionError) as context:
+            soloon.validate_batch([(0, 0, "red"), (1, 1, "green"), [2, 2, "red"], (3,)])
+        self.assertIn("3 invalid tuples", str(context.exception))
+
+    def test_send_prepared(self):
+        transport = Mock()
+        polyanet = Polyanet(candidate_id="123", transport=transport)
+        template = polyanet.template("post")
+        polyanet.send_prepared(template, template.body(1, 2))
+
+        transport.send.assert_called_once_with(
+            "post", template.url, b'{"candidateId": "123", "row": 1, "column": 2}'
+        )
+        transport.send.return_value.raise_for_status.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
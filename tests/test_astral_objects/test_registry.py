@@ -0,0 +1,85 @@
+import unittest
+from app.astral_objects.registry import REGISTRY, DEFAULT_TYPES, ObjectRegistry
+from app.astral_objects.astral_object import AstralObject
+from app.astral_objects.soloon import Soloon
+from app.challenge import megaverse_state
+from app.challenge.planner import Plan
+
+
+class Nebuloon(AstralObject):
+    """A dummy astral object type used to test registration."""
+
+    endpoint = "nebuloons"
+    attribute = "shade"
+    values = ["dark", "bright"]
+    map_type = 9
+
+    def post(self, rows_columns_tuple):
+        pass
+
+    def delete(self, rows_columns_tuple):
+        pass
+
+
+class TestObjectRegistry(unittest.TestCase):
+    def test_types(self):
+        self.assertEqual(list(REGISTRY.types), ["polyanet", "soloon", "cometh"])
+
+    def test_descriptor(self):
+        descriptor = REGISTRY.descriptor("RED_SOLOON")
+
+        self.assertIs(descriptor.cls, Soloon)
+        self.assertEqual(descriptor.name, "soloon")
+        self.assertEqual(descriptor.endpoint, "soloons")
+        self.assertEqual(descriptor.field, "color")
+        self.assertEqual(descriptor.value, "red")
+        self.assertEqual(descriptor.args(1, 2), (1, 2, "red"))
+        self.assertEqual(REGISTRY.descriptor("POLYANET").args(1, 2), (1, 2))
+
+    def test_token_codes_are_unique(self):
+        codes = [descriptor.code for descriptor in REGISTRY.tokens.values()]
+        self.assertEqual(len(set(codes)), len(codes))
+        self.assertNotIn(0, codes)
+
+    def test_descriptor_unknown_token(self):
+        for token in ("SPACE", "GREEN_SOLOON"):
+            with self.assertRaises(ValueError):
+                REGISTRY.descriptor(token)
+
+    def test_map_cell_token(self):
+        self.assertEqual(REGISTRY.map_cell_token(None), "SPACE")
+        self.assertEqual(REGISTRY.map_cell_token({"type": 0}), "POLYANET")
+        self.assertEqual(
+            REGISTRY.map_cell_token({"type": 2, "direction": "up"}), "UP_COMETH"
+        )
+        with self.assertRaises(ValueError):
+            REGISTRY.map_cell_token({"type": 7})
+
+    def test_dependencies(self):
+        self.assertEqual(REGISTRY.dependencies(), {"polyanet"})
+
+    def test_register(self):
+        registry = ObjectRegistry(DEFAULT_TYPES)
+        registry.register(f"{__name__}:Nebuloon")
+
+        self.assertIs(registry.types["nebuloon"], Nebuloon)
+        self.assertEqual(registry.descriptor("DARK_NEBULOON").value, "dark")
+        self.assertEqual(registry.map_cell_token({"type": 9}), "NEBULOON")
+        self.assertNotIn("nebuloon", REGISTRY.types)
+
+    def test_register_on_the_global_registry(self):
+        path = f"{__name__}:Nebuloon"
+        REGISTRY.register(path)
+        self.addCleanup(REGISTRY._reset)
+        self.addCleanup(REGISTRY.class_paths.remove, path)
+
+        codes = megaverse_state.encode_tokens([["DARK_NEBULOON", "SPACE"]])
+        plan = Plan.from_goal_map([["DARK_NEBULOON", "SPACE"]])
+
+        self.assertEqual(megaverse_state.decode(codes[0, 0]), "DARK_NEBULOON")
+        self.assertEqual(plan.counts(), {"nebuloon": 1})
+        self.assertEqual(list(plan.operations()), [(0, 0, "DARK_NEBULOON")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import time
 import unittest
+import threading
 import requests
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, call
 from app.challenge.challenge_goal import ChallengeGoal
+from app.challenge.lanes import Lane
+from app.challenge.region import Region
 
 
 class TestChallengeGoal(unittest.TestCase):
@@ -186,6 +190,195 @@ class TestChallengeGoal(unittest.TestCase):
         cometh_instance.post.assert_called_once_with((1, 0, "up"))
         soloon_instance.post.assert_called_once_with((1, 1, "purple"))
 
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_places_dependencies_first(self, mock_class_identifier):
+        # The soloon comes first in row-major order
+        goal_map = [["RED_SOLOON", "SPACE"], ["POLYANET", "SPACE"]]
+        finished = []
+
+        def post(args):
+            time.sleep(0.1)
+            finished.append(args)
+
+        instance = Mock()
+        instance.post.side_effect = post
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = {
+            "polyanet": Mock(),
+            "soloon": Mock(),
+        }
+        mock_class_instance.create_instance.return_value = instance
+        self.challenge = ChallengeGoal(concurrency=4)
+        self.challenge.goal_map = goal_map
+
+        report = self.challenge.solve_challengue_2()
+
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(finished, [(1, 0), (0, 0, "red")])
+        self.assertEqual(self.challenge.total, 2)
+        stats = {stage.name: stage for stage in self.challenge.stage_stats}
+        self.assertEqual(stats["record"].items_in, 2)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_with_deadline(self, mock_class_identifier):
+        # Two single comeths, then a polyanet with its two soloons
+        goal_map = [
+            ["UP_COMETH", "SPACE", "DOWN_COMETH", "SPACE"],
+            ["SPACE", "RED_SOLOON", "POLYANET", "BLUE_SOLOON"],
+        ]
+        posted = []
+
+        def post(args):
+            posted.append(args)
+            time.sleep(0.3)
+
+        instance = Mock()
+        instance.post.side_effect = post
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = {
+            "polyanet": Mock(),
+            "soloon": Mock(),
+            "cometh": Mock(),
+        }
+        mock_class_instance.create_instance.return_value = instance
+        self.challenge = ChallengeGoal(deadline=time.monotonic() + 0.8)
+        self.challenge.goal_map = goal_map
+
+        report = self.challenge.solve_challengue_2()
+
+        # The comeths fit, the 3 operations of the cluster do not
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(posted, [(0, 0, "up"), (0, 2, "down")])
+        self.assertEqual(
+            [(o.row, o.column) for o in report.remaining()], [(1, 2), (1, 1), (1, 3)]
+        )
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_with_lanes(self, mock_class_identifier):
+        goal_map = [
+            ["POLYANET", "RED_SOLOON", "SPACE", "UP_COMETH"],
+            ["BLUE_SOLOON", "POLYANET", "SPACE", "DOWN_COMETH"],
+        ]
+        placed = set()
+        lock = threading.Lock()
+
+        def instance(name):
+            def post(args):
+                with lock:
+                    if name == "soloon":
+                        row, column = args[:2]
+                        neighbours = {
+                            (row - 1, column),
+                            (row + 1, column),
+                            (row, column - 1),
+                            (row, column + 1),
+                        }
+                        self.assertTrue(neighbours & placed)
+                    if name == "polyanet":
+                        placed.add(args)
+                time.sleep(0.01)
+
+            return Mock(post=Mock(side_effect=post))
+
+        instances = {name: instance(name) for name in ("polyanet", "soloon", "cometh")}
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = instances
+        mock_class_instance.create_instance.side_effect = (
+            lambda name, candidate_id: instances[name]
+        )
+        self.challenge = ChallengeGoal(
+            concurrency=2, lanes=[Lane("soloon", concurrency=1, rate_limit=100)]
+        )
+        self.challenge.goal_map = goal_map
+
+        report = self.challenge.solve_challengue_2()
+
+        self.assertEqual(report.succeeded, 6)
+        self.assertEqual(
+            {
+                name: stats["dispatched"]
+                for name, stats in self.challenge.lane_stats.items()
+            },
+            {"soloon": 2, "polyanet": 2, "cometh": 2},
+        )
+        self.assertEqual(self.challenge.lane_stats["soloon"]["peak_in_flight"], 1)
+        self.assertEqual(self.challenge.stage_stats[3].workers, 5)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_reports_stages(self, mock_class_identifier):
+        self.challenge = ChallengeGoal(concurrency=4, queue_size=2)
+        self.challenge.goal_map = [["POLYANET"] * 10 for _ in range(10)]
+        polyanet_instance = Mock()
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = {"polyanet": Mock()}
+        mock_class_instance.create_instance.return_value = polyanet_instance
+
+        report = self.challenge.solve_challengue_2()
+
+        self.assertEqual(report.succeeded, 100)
+        self.assertEqual(polyanet_instance.post.call_count, 100)
+        stats = {stage.name: stage for stage in self.challenge.stage_stats}
+        self.assertEqual(
+            list(stats), ["goal source", "plan", "schedule", "execute", "record"]
+        )
+        self.assertEqual(stats["goal source"].items_out, 10)
+        self.assertEqual(stats["plan"].items_out, 100)
+        self.assertEqual(stats["execute"].workers, 4)
+        self.assertEqual(stats["record"].items_in, 100)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_in_region(self, mock_class_identifier):
+        self.challenge = ChallengeGoal(region=Region([(1, 3, 1, 3)]))
+        self.challenge.goal_map = [
+            ["POLYANET", "SPACE", "POLYANET", "SPACE"],
+            ["SPACE", "POLYANET", "BLUE_SOLOON", "SPACE"],
+            ["SPACE", "SPACE", "SPACE", "RED_SOLOON"],
+            ["SPACE", "SPACE", "SPACE", "POLYANET"],
+        ]
+        manager = Mock()
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = {
+            "polyanet": Mock(),
+            "soloon": Mock(),
+        }
+        mock_class_instance.create_instance.side_effect = (
+            lambda name, candidate_id: getattr(manager, name)
+        )
+
+        report = self.challenge.solve_challengue_2()
+
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(
+            manager.mock_calls,
+            [call.polyanet.post((1, 1)), call.soloon.post((1, 2, "blue"))],
+        )
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_solve_challengue_2_in_region_posts_boundary_supports(
+        self, mock_class_identifier
+    ):
+        self.challenge = ChallengeGoal(region=Region([(0, 2, 1, 2)]))
+        self.challenge.goal_map = [
+            ["POLYANET", "RED_SOLOON", "SPACE"],
+            ["SPACE", "SPACE", "SPACE"],
+        ]
+        manager = Mock()
+        mock_class_instance = mock_class_identifier.return_value
+        mock_class_instance.get_class_info.return_value = {
+            "polyanet": Mock(),
+            "soloon": Mock(),
+        }
+        mock_class_instance.create_instance.side_effect = (
+            lambda name, candidate_id: getattr(manager, name)
+        )
+
+        self.challenge.solve_challengue_2()
+
+        self.assertEqual(
+            manager.mock_calls,
+            [call.polyanet.post((0, 0)), call.soloon.post((0, 1, "red"))],
+        )
+
     @patch("app.challenge.challenge_goal.ClassIdentifier")
     @patch("app.challenge.challenge_goal.requests.get")
     def test_solve_challengue_2_with_retries(self, mock_get, mock_class_identifier):
@@ -260,6 +453,223 @@ class TestChallengeGoal(unittest.TestCase):
             self.challenge.solve_challengue_2()
         self.assertIn("Max retries exceeded", str(context.exception))
 
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_verify(self, mock_get):
+        self.challenge.goal_map = [["POLYANET", "SPACE"], ["SPACE", "RED_SOLOON"]]
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "map": {"content": [[{"type": 0}, None], [None, {"type": 0}]]}
+                }
+            ),
+        )
+
+        self.assertEqual(self.challenge.verify(), [(1, 1, "RED_SOLOON", "POLYANET")])
+
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_verify_in_region(self, mock_get):
+        self.challenge.region = Region([(0, 2, 1, 2)])
+        self.challenge.goal_map = [
+            ["POLYANET", "RED_SOLOON", "SPACE"],
+            ["SPACE", "SPACE", "POLYANET"],
+        ]
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"map": {"content": [[None] * 3, [None] * 3]}}),
+        )
+
+        # The polyanet outside the region is checked, the one far from it is not
+        self.assertEqual(
+            self.challenge.verify(),
+            [(0, 0, "POLYANET", "SPACE"), (0, 1, "RED_SOLOON", "SPACE")],
+        )
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_converge_requeues_mismatched_cells(self, mock_get, mock_class_identifier):
+        self.challenge.goal_map = [["POLYANET", "BLUE_SOLOON"], ["SPACE", "SPACE"]]
+        mock_get.side_effect = [
+            Mock(
+                status_code=200,
+                json=Mock(
+                    return_value={
+                        "map": {"content": [[None, None], [{"type": 0}, None]]}
+                    }
+                ),
+            ),
+            Mock(
+                status_code=200,
+                json=Mock(
+                    return_value={
+                        "map": {
+                            "content": [
+                                [{"type": 0}, {"type": 1, "color": "blue"}],
+                                [None, None],
+                            ]
+                        }
+                    }
+                ),
+            ),
+        ]
+        polyanet_instance = Mock()
+        soloon_instance = Mock()
+        manager = Mock()
+        manager.attach_mock(polyanet_instance, "polyanet")
+        manager.attach_mock(soloon_instance, "soloon")
+        mock_class_identifier.return_value.create_instance.side_effect = (
+            lambda name, candidate_id: {
+                "polyanet": polyanet_instance,
+                "soloon": soloon_instance,
+            }[name]
+        )
+
+        self.assertEqual(self.challenge.converge(), [])
+        self.assertEqual(
+            manager.mock_calls,
+            [
+                call.polyanet.delete((1, 0)),
+                call.polyanet.post((0, 0)),
+                call.soloon.post((0, 1, "blue")),
+            ],
+        )
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_converge_reports_stubborn_cells(self, mock_get, mock_class_identifier):
+        self.challenge.goal_map = [["POLYANET", "SPACE"]]
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"map": {"content": [[None, None]]}}),
+        )
+        polyanet_instance = Mock()
+        polyanet_instance.post.side_effect = requests.exceptions.HTTPError(
+            response=Mock(status_code=500)
+        )
+        mock_class_identifier.return_value.create_instance.return_value = (
+            polyanet_instance
+        )
+
+        stubborn = self.challenge.converge(max_rounds=2)
+
+        self.assertEqual(stubborn, [(0, 0, "POLYANET", "SPACE")])
+        self.assertEqual(polyanet_instance.post.call_count, 2)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_converge_starts_no_round_after_deadline(
+        self, mock_get, mock_class_identifier
+    ):
+        self.challenge.goal_map = [["POLYANET", "SPACE"]]
+        self.challenge.deadline = time.monotonic()
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"map": {"content": [[None, None]]}}),
+        )
+        polyanet_instance = Mock()
+        mock_class_identifier.return_value.create_instance.return_value = (
+            polyanet_instance
+        )
+
+        stubborn = self.challenge.converge(max_rounds=2)
+
+        self.assertEqual(stubborn, [(0, 0, "POLYANET", "SPACE")])
+        polyanet_instance.post.assert_not_called()
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_converge_skips_repairs_past_deadline(
+        self, mock_get, mock_class_identifier
+    ):
+        self.challenge.goal_map = [["POLYANET"] * 6]
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"map": {"content": [[None] * 6]}}),
+        )
+        polyanet_instance = Mock()
+        polyanet_instance.post.side_effect = lambda args: time.sleep(0.3)
+        mock_class_identifier.return_value.create_instance.return_value = (
+            polyanet_instance
+        )
+        self.challenge.deadline = time.monotonic() + 0.5
+
+        stubborn = self.challenge.converge(max_rounds=2)
+
+        # The first batch of 2 runs past the deadline, the other 4 are skipped
+        self.assertEqual(len(stubborn), 6)
+        self.assertEqual(polyanet_instance.post.call_count, 2)
+        self.assertEqual(self.challenge.repairs.succeeded, 2)
+        self.assertEqual(
+            [o.column for o in self.challenge.repairs.skipped], [2, 3, 4, 5]
+        )
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_reset_deletes_occupied_cells(self, mock_get, mock_class_identifier):
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "map": {
+                        "content": [
+                            [{"type": 0}, {"type": 1, "color": "red"}],
+                            [None, {"type": 2, "direction": "up"}],
+                        ]
+                    }
+                }
+            ),
+        )
+        manager = Mock()
+        mock_class_identifier.return_value.create_instance.side_effect = (
+            lambda name, candidate_id: getattr(manager, name)
+        )
+
+        report = self.challenge.reset()
+
+        self.assertEqual(report.succeeded, 3)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(
+            manager.mock_calls,
+            [
+                call.soloon.delete((0, 1)),
+                call.cometh.delete((1, 1)),
+                call.polyanet.delete((0, 0)),
+            ],
+        )
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    @patch("app.challenge.challenge_goal.requests.get")
+    def test_reset_in_overlapping_region(self, mock_get, mock_class_identifier):
+        self.challenge.region = Region([(0, 2, 0, 2), (0, 2, 0, 2), (1, 2, None, None)])
+        mock_get.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "map": {
+                        "content": [
+                            [{"type": 0}, None, {"type": 0}],
+                            [None, None, {"type": 0}],
+                        ]
+                    }
+                }
+            ),
+        )
+        manager = Mock()
+        mock_class_identifier.return_value.create_instance.side_effect = (
+            lambda name, candidate_id: getattr(manager, name)
+        )
+
+        report = self.challenge.reset()
+
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(
+            manager.mock_calls,
+            [call.polyanet.delete((0, 0)), call.polyanet.delete((1, 2))],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
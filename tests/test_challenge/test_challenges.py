@@ -0,0 +1,18 @@
+import inspect
+import unittest
+from app.challenge.challenge_goal import ChallengeGoal
+from app.challenge.challenges import SUPPORTED_CHALLENGES
+
+
+class TestChallenges(unittest.TestCase):
+    def test_registry_matches_challenge_goal(self):
+        methods = {
+            int(name.split("_")[-1]): name
+            for name, _ in inspect.getmembers(ChallengeGoal, inspect.isfunction)
+            if name.startswith("solve_challengue_") and name.split("_")[-1].isdigit()
+        }
+        self.assertEqual(SUPPORTED_CHALLENGES, methods)
+
+
+if __name__ == "__main__":
+    unittest.main()
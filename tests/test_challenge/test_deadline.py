@@ -0,0 +1,51 @@
+import unittest
+from app.challenge.deadline import DeadlineBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadlineBudget(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.budget = DeadlineBudget(10.0, window=5.0, clock=self.clock)
+
+    def test_admits_until_first_estimate(self):
+        self.assertIsNone(self.budget.throughput())
+        self.assertTrue(self.budget.admit(100))
+        self.assertEqual(self.budget.pending, 100)
+
+    def test_admits_what_fits_at_live_throughput(self):
+        self.assertTrue(self.budget.admit(4))
+        self.clock.now = 2.0
+        self.budget.finished(4)
+        # 2 operations per second, 8 seconds left: 16 operations fit
+        self.assertAlmostEqual(self.budget.throughput(), 2.0)
+        self.assertTrue(self.budget.admit(10))
+        self.assertFalse(self.budget.admit(7))
+        # Once refused, nothing else is admitted
+        self.assertFalse(self.budget.admit(1))
+        self.assertEqual(self.budget.pending, 10)
+
+    def test_refuses_after_deadline(self):
+        self.clock.now = 10.0
+        self.assertTrue(self.budget.expired())
+        self.assertEqual(self.budget.remaining(), 0.0)
+        self.assertFalse(self.budget.admit(1))
+
+    def test_throughput_window(self):
+        self.budget.admit(2)
+        self.clock.now = 1.0
+        self.budget.finished(2)
+        self.clock.now = 7.0
+        # The finishes fell out of the window
+        self.assertIsNone(self.budget.throughput())
+
+
+if __name__ == "__main__":
+    unittest.main()
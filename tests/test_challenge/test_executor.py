@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import tempfile
+import unittest
+import threading
+import requests
+from unittest.mock import Mock
+from app.challenge.executor import (
+    ExecutionReport,
+    Operation,
+    OperationExecutor,
+    RateLimiter,
+)
+from app.challenge.metrics import RunMetrics
+from app.astral_objects.soloon import Soloon
+from app.transport.circuit_breaker import CircuitOpenError
+
+
+class TestOperation(unittest.TestCase):
+    def test_args(self):
+        self.assertEqual(Operation("post", "soloon", 1, 2, "red").args, (1, 2, "red"))
+        self.assertEqual(Operation("delete", "soloon", 1, 2, "red").args, (1, 2))
+        self.assertEqual(Operation("post", "polyanet", 1, 2, None).args, (1, 2))
+
+
+class TestExecutionReport(unittest.TestCase):
+    def test_save_manifest(self):
+        report = ExecutionReport()
+        report.succeeded = 3
+        report.skipped.append(Operation("post", "soloon", 1, 2, "red"))
+        report.failed.append((Operation("post", "polyanet", 0, 0, None), "500"))
+        path = os.path.join(tempfile.mkdtemp(), "remaining.json")
+
+        report.save_manifest(path)
+
+        self.assertEqual(len(report.remaining()), 2)
+        with open(path) as file:
+            manifest = json.load(file)
+        self.assertEqual(
+            (manifest["succeeded"], manifest["skipped"], manifest["failed"]), (3, 1, 1)
+        )
+        self.assertEqual(
+            manifest["operations"],
+            [
+                {
+                    "action": "post",
+                    "name": "soloon",
+                    "row": 1,
+                    "column": 2,
+                    "attribute": "red",
+                    "error": None,
+                },
+                {
+                    "action": "post",
+                    "name": "polyanet",
+                    "row": 0,
+                    "column": 0,
+                    "attribute": None,
+                    "error": "500",
+                },
+            ],
+        )
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_acquire_spaces_requests(self):
+        limiter = RateLimiter(rate=20)
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_state_does_not_take_tokens(self):
+        limiter = RateLimiter(rate=10)
+        self.assertEqual(limiter.state()["tokens"], 1)
+        self.assertEqual(limiter.state()["wait"], 0.0)
+
+        limiter.acquire()
+        state = limiter.state()
+        self.assertLess(state["tokens"], 1)
+        self.assertAlmostEqual(state["wait"], 0.1, delta=0.02)
+
+
+class TestOperationExecutor(unittest.TestCase):
+    def setUp(self):
+        self.instance = Mock()
+        self.metrics = RunMetrics()
+
+    def executor(self, concurrency=1):
+        return OperationExecutor(
+            lambda name: self.instance, concurrency=concurrency, metrics=self.metrics
+        )
+
+    def operations(self, count):
+        return (Operation("delete", "polyanet", row, 0, None) for row in range(count))
+
+    def test_run_serial(self):
+        report = self.executor().run(self.operations(3))
+
+        self.assertEqual(report.succeeded, 3)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(self.instance.delete.call_count, 3)
+        self.assertEqual(self.metrics.summary()["operations"], 3)
+
+    def test_run_concurrent(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def delete(args):
+            with lock:
+                in_flight.append(args)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(args)
+
+        self.instance.delete.side_effect = delete
+        report = self.executor(concurrency=4).run(self.operations(20))
+
+        self.assertEqual(report.succeeded, 20)
+        self.assertLessEqual(max(peak), 4)
+        self.assertGreater(max(peak), 1)
+
+    def test_run_reports_failures(self):
+        self.instance.delete.side_effect = [
+            None,
+            requests.exceptions.HTTPError(response=Mock(status_code=500)),
+            None,
+        ]
+        report = self.executor().run(self.operations(3))
+
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(report.failed[0][0].row, 1)
+
+    def test_run_fail_fast(self):
+        self.instance.delete.side_effect = requests.exceptions.HTTPError(
+            response=Mock(status_code=500)
+        )
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.executor(concurrency=2).run(self.operations(5), fail_fast=True)
+
+    def test_execute_retries_rate_limited(self):
+        self.instance.delete.side_effect = [
+            requests.exceptions.HTTPError(response=Mock(status_code=429)),
+            None,
+        ]
+        self.executor().execute(Operation("delete", "polyanet", 0, 0, None))
+
+        self.assertEqual(self.instance.delete.call_count, 2)
+        self.assertEqual(self.metrics.summary()["rate_limited"], 1)
+
+    def test_execute_counts_operations_in_flight_and_backing_off(self):
+        self.instance.delete.side_effect = [
+            requests.exceptions.HTTPError(response=Mock(status_code=429)),
+            None,
+        ]
+        executor = self.executor()
+        thread = threading.Thread(
+            target=executor.execute, args=(Operation("delete", "polyanet", 0, 0, None),)
+        )
+        thread.start()
+        time.sleep(0.3)
+        self.assertEqual((executor.in_flight, executor.backing_off), (1, 1))
+        thread.join()
+        self.assertEqual((executor.in_flight, executor.backing_off), (0, 0))
+
+    def test_execute_fails_fast_on_open_circuit(self):
+        self.instance.delete.side_effect = CircuitOpenError("/api/polyanets", 5.0)
+        with self.assertRaises(CircuitOpenError):
+            self.executor().execute(Operation("delete", "polyanet", 0, 0, None))
+
+        self.assertEqual(self.instance.delete.call_count, 1)
+        self.assertEqual(self.metrics.summary()["failures"], 1)
+
+    def test_run_phases_in_order(self):
+        calls = []
+        self.instance.delete.side_effect = lambda args: calls.append(args)
+        phases = [
+            [Operation("delete", "soloon", 0, 1, None)],
+            [Operation("delete", "polyanet", 0, 0, None)],
+        ]
+        report = self.executor(concurrency=4).run_phases(phases)
+
+        self.assertEqual(report.succeeded, 2)
+        self.assertEqual(calls, [(0, 1), (0, 0)])
+
+    def test_astral_objects_use_request_templates(self):
+        transport = Mock()
+        transport.send.return_value = Mock(status_code=200)
+        soloon = Soloon(candidate_id="123", transport=transport)
+        executor = OperationExecutor(lambda name: soloon, metrics=self.metrics)
+        executor.run([Operation("post", "soloon", 1, 2, "red")])
+
+        template = soloon.template("post")
+        transport.send.assert_called_once_with(
+            "post", template.url, template.body(1, 2, "red")
+        )
+        transport.request.assert_not_called()
+
+    def test_run_validates_list_before_sending(self):
+        transport = Mock()
+        soloon = Soloon(candidate_id="123", transport=transport)
+        executor = OperationExecutor(lambda name: soloon)
+        operations = [
+            Operation("post", "soloon", 0, 0, "red"),
+            Operation("post", "soloon", 0, 1, "green"),
+        ]
+        with self.assertRaises(AssertionError):
+            executor.run(operations)
+
+        transport.send.assert_not_called()
+
+    def test_run_validates_generator_as_pulled(self):
+        transport = Mock()
+        transport.send.return_value = Mock(status_code=200)
+        soloon = Soloon(candidate_id="123", transport=transport)
+        executor = OperationExecutor(lambda name: soloon)
+        operations = (
+            Operation("post", "soloon", row, column, "red")
+            for row, column in ((0, 0), (1.5, 2), ("1", 2))
+        )
+
+        report = executor.run(operations)
+
+        self.assertEqual(report.succeeded, 1)
+        self.assertEqual(
+            [type(error) for _, error in report.failed], [AssertionError] * 2
+        )
+        transport.send.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from app.challenge.history import RunHistory
+
+DAY = 86400.0
+
+
+def summary(ceiling=None, latency_p50=0.1, latency_p99=0.5, endpoints=None):
+    return {
+        "rate_ceiling": ceiling,
+        "latency_p50": latency_p50,
+        "latency_p99": latency_p99,
+        "endpoints": endpoints or {},
+    }
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.now = [100 * DAY]
+        self.history = RunHistory(
+            os.path.join(self.directory.name, "history.jsonl"),
+            half_life=DAY,
+            max_age=7 * DAY,
+            clock=lambda: self.now[0],
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_no_history(self):
+        self.assertEqual(self.history.runs("candidate"), [])
+        self.assertIsNone(self.history.seed("candidate"))
+
+    def test_seed_from_rate_ceiling(self):
+        self.history.record(
+            "candidate",
+            summary(ceiling=20.0, endpoints={"soloon": {"rate_ceiling": 5.0}}),
+            concurrency=8,
+        )
+
+        seed = self.history.seed("candidate")
+
+        self.assertAlmostEqual(seed.rate_limit, 18.0)
+        # 18 requests per second at 0.1s each need 2 in flight
+        self.assertEqual(seed.concurrency, 2)
+        self.assertAlmostEqual(seed.timeout, 2.0)
+        self.assertEqual(seed.endpoint_rates, {"soloon": 4.5})
+        self.assertEqual(seed.runs, 1)
+
+    def test_seed_without_rate_limiting_keeps_concurrency(self):
+        self.history.record("candidate", summary(), concurrency=8)
+
+        seed = self.history.seed("candidate")
+
+        self.assertIsNone(seed.rate_limit)
+        self.assertEqual(seed.concurrency, 8)
+
+    def test_recent_runs_weigh_more(self):
+        self.history.record("candidate", summary(ceiling=10.0), concurrency=1)
+        self.now[0] += DAY
+        self.history.record("candidate", summary(ceiling=40.0), concurrency=1)
+
+        # Weights 0.5 and 1
+        self.assertAlmostEqual(self.history.seed("candidate").rate_limit, 27.0)
+        self.assertEqual(
+            [weight for weight, _ in self.history.runs("candidate")], [1.0, 0.5]
+        )
+
+    def test_stale_runs_and_other_candidates_are_ignored(self):
+        self.history.record("candidate", summary(ceiling=10.0), concurrency=1)
+        self.history.record("other", summary(ceiling=40.0), concurrency=1)
+        self.now[0] += 8 * DAY
+
+        self.assertIsNone(self.history.seed("candidate"))
+        self.history.record("candidate", summary(ceiling=40.0), concurrency=1)
+        self.assertAlmostEqual(self.history.seed("candidate").rate_limit, 36.0)
+
+    def test_unreadable_lines_are_skipped(self):
+        with open(self.history.path, "w") as file:
+            file.write("not json\n")
+        self.history.record("candidate", summary(), concurrency=3)
+
+        self.assertEqual(self.history.seed("candidate").concurrency, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
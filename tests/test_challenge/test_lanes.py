@@ -0,0 +1,88 @@
+import time
+import unittest
+import threading
+from app.challenge.executor import Operation
+from app.challenge.lanes import Lane, LaneScheduler
+
+
+def post(name, row, column):
+    return Operation("post", name, row, column, None)
+
+
+class TestLaneScheduler(unittest.TestCase):
+    def test_weighted_fair_dispatch(self):
+        scheduler = LaneScheduler(
+            [Lane("polyanet", concurrency=10, weight=2), Lane("cometh", concurrency=10)]
+        )
+        for column in range(6):
+            scheduler.put(post("polyanet", 0, column), None)
+            scheduler.put(post("cometh", 5, column), None)
+
+        names = [scheduler.take()[0].name for _ in range(6)]
+
+        self.assertEqual(names.count("polyanet"), 4)
+        self.assertEqual(names.count("cometh"), 2)
+
+    def test_lane_concurrency_does_not_block_other_lanes(self):
+        scheduler = LaneScheduler(
+            [Lane("soloon", concurrency=1), Lane("polyanet", concurrency=2)]
+        )
+        scheduler.put(post("soloon", 0, 0), None)
+        scheduler.put(post("soloon", 0, 2), None)
+        scheduler.put(post("polyanet", 5, 0), None)
+        scheduler.put(post("polyanet", 5, 1), None)
+
+        taken = [scheduler.take()[0] for _ in range(3)]
+
+        # The second soloon waits for the first one, the polyanets go through
+        self.assertEqual(
+            sorted(o.name for o in taken), ["polyanet", "polyanet", "soloon"]
+        )
+        self.assertEqual(scheduler.lanes["soloon"].in_flight, 1)
+        scheduler.done(next(o for o in taken if o.name == "soloon"))
+        self.assertEqual(scheduler.take()[0].name, "soloon")
+
+    def test_soloon_waits_for_its_polyanet(self):
+        scheduler = LaneScheduler(
+            [Lane("polyanet", concurrency=1), Lane("soloon", concurrency=1, weight=100)]
+        )
+        scheduler.put(post("polyanet", 0, 0), None)
+        scheduler.put(post("soloon", 0, 1), None)
+
+        polyanet, _ = scheduler.take()
+        self.assertEqual(polyanet.name, "polyanet")
+        taken = []
+        thread = threading.Thread(target=lambda: taken.append(scheduler.take()))
+        thread.start()
+        time.sleep(0.1)
+        self.assertEqual(taken, [])
+        scheduler.done(polyanet)
+        thread.join(1)
+        self.assertEqual(taken[0][0].name, "soloon")
+
+    def test_rate_limited_lane(self):
+        scheduler = LaneScheduler([Lane("cometh", concurrency=5, rate_limit=20)])
+        for column in range(3):
+            scheduler.put(post("cometh", 0, column), None)
+
+        started = time.monotonic()
+        for _ in range(3):
+            scheduler.take()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(
+            scheduler.stats()["cometh"], {"dispatched": 3, "peak_in_flight": 3}
+        )
+
+    def test_close_wakes_waiting_workers(self):
+        scheduler = LaneScheduler([Lane("cometh")])
+        taken = []
+        thread = threading.Thread(target=lambda: taken.append(scheduler.take()))
+        thread.start()
+        scheduler.close()
+        thread.join(1)
+        self.assertEqual(taken, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from app.challenge import megaverse_state
+
+
+class TestMegaverseState(unittest.TestCase):
+    def test_encode_tokens(self):
+        codes = megaverse_state.encode_tokens(
+            [["SPACE", "POLYANET"], ["RED_SOLOON", "UP_COMETH"]]
+        )
+        self.assertEqual(codes.shape, (2, 2))
+        self.assertEqual(codes[0, 0], megaverse_state.SPACE_CODE)
+        self.assertEqual(megaverse_state.decode(codes[1, 0]), "RED_SOLOON")
+        self.assertEqual(megaverse_state.decode(codes[1, 1]), "UP_COMETH")
+
+    def test_encode_tokens_unknown_token(self):
+        with self.assertRaises(ValueError) as context:
+            megaverse_state.encode_tokens([["SPACE", "GREEN_SOLOON"]])
+        self.assertIn("GREEN_SOLOON", str(context.exception))
+
+    def test_current_to_tokens(self):
+        content = [
+            [None, {"type": 0}],
+            [{"type": 1, "color": "blue"}, {"type": 2, "direction": "left"}],
+        ]
+        self.assertEqual(
+            megaverse_state.current_to_tokens(content),
+            [["SPACE", "POLYANET"], ["BLUE_SOLOON", "LEFT_COMETH"]],
+        )
+
+    def test_mismatches(self):
+        goal = megaverse_state.encode_tokens(
+            [["POLYANET", "SPACE"], ["SPACE", "SPACE"]]
+        )
+        current = megaverse_state.encode_current([[None, None], [None, {"type": 0}]])
+        np.testing.assert_array_equal(
+            megaverse_state.mismatches(goal, current), [[0, 0], [1, 1]]
+        )
+
+    def test_mismatches_shape_error(self):
+        goal = megaverse_state.encode_tokens([["SPACE", "SPACE"]])
+        current = megaverse_state.encode_tokens([["SPACE"]])
+        with self.assertRaises(ValueError):
+            megaverse_state.mismatches(goal, current)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from app.challenge.metrics import LatencyHistogram, RateCeiling, RunMetrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentile_empty(self):
+        self.assertIsNone(LatencyHistogram().percentile(99))
+
+    def test_percentile(self):
+        histogram = LatencyHistogram()
+        for _ in range(98):
+            histogram.record(0.05)
+        histogram.record(2.0)
+        histogram.record(2.0)
+
+        self.assertAlmostEqual(histogram.percentile(50), 0.05, delta=0.005)
+        self.assertAlmostEqual(histogram.percentile(99), 2.0, delta=0.2)
+
+    def test_record_out_of_range(self):
+        histogram = LatencyHistogram(maximum=1.0)
+        histogram.record(0.0)
+        histogram.record(500.0)
+        self.assertEqual(histogram.count, 2)
+        self.assertGreaterEqual(histogram.percentile(100), 1.0)
+
+
+class TestRateCeiling(unittest.TestCase):
+    def test_ceiling(self):
+        now = [0.0]
+        ceiling = RateCeiling(window=1.0, clock=lambda: now[0])
+        for _ in range(10):
+            now[0] += 0.25
+            ceiling.record(False)
+        self.assertIsNone(ceiling.ceiling)
+
+        now[0] += 0.25
+        ceiling.record(True)
+        # 4 requests accepted over the last second
+        self.assertAlmostEqual(ceiling.ceiling, 4.0)
+
+
+class TestRunMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = RunMetrics()
+
+    def test_summary(self):
+        self.metrics.record_request(0.2, 429)
+        self.metrics.record_request(0.4, 201)
+        self.metrics.record_operation(True)
+        self.metrics.record_operation(False)
+
+        summary = self.metrics.summary()
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["rate_limited"], 1)
+        self.assertEqual(summary["operations"], 2)
+        self.assertEqual(summary["failures"], 1)
+        self.assertAlmostEqual(summary["latency_mean"], 0.3)
+
+    def test_summary_per_endpoint(self):
+        self.metrics.record_request(0.2, 429, "soloon")
+        self.metrics.record_request(0.4, 201, "soloon")
+        self.metrics.record_request(0.1, 500, "soloon")
+        self.metrics.record_request(0.1, 201, "polyanet")
+        self.metrics.record_request(0.1)
+
+        endpoints = self.metrics.summary()["endpoints"]
+        self.assertEqual(sorted(endpoints), ["polyanet", "soloon"])
+        soloon = endpoints["soloon"]
+        self.assertEqual(
+            (soloon["requests"], soloon["rate_limited"], soloon["errors"]), (3, 1, 1)
+        )
+        self.assertAlmostEqual(soloon["error_rate"], 1 / 3)
+        self.assertIsNone(endpoints["polyanet"]["rate_ceiling"])
+        self.assertAlmostEqual(soloon["latency_p99"], 0.4, delta=0.04)
+
+    def test_save_and_load(self):
+        self.metrics.record_request(0.1)
+        self.metrics.record_operation(True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            self.metrics.save(path)
+            self.assertEqual(RunMetrics.load(path)["operations"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import time
+import unittest
+import threading
+from app.challenge.pipeline import Pipeline, Stage, StageStats
+
+
+class TestPipeline(unittest.TestCase):
+    def test_items_flow_through_every_stage(self):
+        results = []
+        pipeline = Pipeline(
+            [
+                Stage("source", lambda: range(100)),
+                Stage("double", lambda item: (item, item)),
+                Stage("square", lambda item: (item * item,), workers=4),
+                Stage("collect", results.append),
+            ],
+            queue_size=4,
+        )
+
+        stats = pipeline.run()
+
+        self.assertEqual(sorted(results), sorted([i * i for i in range(100)] * 2))
+        self.assertEqual(
+            [s.name for s in stats], ["source", "double", "square", "collect"]
+        )
+        self.assertEqual(stats[0].items_out, 100)
+        self.assertEqual((stats[1].items_in, stats[1].items_out), (100, 200))
+        self.assertEqual(stats[2].workers, 4)
+        self.assertEqual(stats[3].items_in, 200)
+
+    def test_generator_stages_may_drop_items(self):
+        results = []
+
+        def evens(item):
+            if item % 2 == 0:
+                yield item
+
+        Pipeline(
+            [
+                Stage("source", lambda: range(10)),
+                Stage("evens", evens),
+                Stage("collect", results.append),
+            ]
+        ).run()
+
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+
+    def test_queues_are_bounded(self):
+        produced = []
+        consumed = []
+        gate = threading.Event()
+
+        def source():
+            for item in range(50):
+                produced.append(item)
+                yield item
+
+        def consume(item):
+            gate.wait()
+            consumed.append(item)
+
+        thread = threading.Thread(
+            target=Pipeline(
+                [Stage("source", source), Stage("consume", consume)], queue_size=5
+            ).run
+        )
+        thread.start()
+        time.sleep(0.2)
+        # The queue holds 5 items, the consumer one, the source one blocked on put
+        self.assertLessEqual(len(produced), 7)
+        gate.set()
+        thread.join()
+        self.assertEqual(consumed, list(range(50)))
+
+    def test_first_error_stops_the_pipeline(self):
+        seen = []
+
+        def fail(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return (item,)
+
+        pipeline = Pipeline(
+            [
+                Stage("source", lambda: range(10000)),
+                Stage("fail", fail),
+                Stage("collect", seen.append),
+            ],
+            queue_size=2,
+        )
+
+        with self.assertRaises(ValueError):
+            pipeline.run()
+        self.assertLess(len(seen), 10000)
+        self.assertEqual(len(pipeline.stats), 3)
+
+    def test_utilization(self):
+        stats = StageStats("execute", 2, 10, 10, busy=1.0, blocked=0.0, elapsed=1.0)
+        self.assertAlmostEqual(stats.utilization, 0.5)
+        self.assertEqual(StageStats("x", 1, 0, 0, 0.0, 0.0, 0.0).utilization, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
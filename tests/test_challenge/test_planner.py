@@ -0,0 +1,95 @@
+import unittest
+from app.challenge.planner import Plan, CostModel
+
+
+class TestPlan(unittest.TestCase):
+    def setUp(self):
+        self.plan = Plan.from_goal_map(
+            [
+                ["POLYANET", "SPACE", "RED_SOLOON"],
+                ["SPACE", "UP_COMETH", "POLYANET"],
+            ]
+        )
+
+    def test_from_goal_map(self):
+        self.assertEqual(len(self.plan), 4)
+        self.assertEqual(
+            list(self.plan.operations()),
+            [
+                (0, 0, "POLYANET"),
+                (0, 2, "RED_SOLOON"),
+                (1, 1, "UP_COMETH"),
+                (1, 2, "POLYANET"),
+            ],
+        )
+
+    def test_counts(self):
+        self.assertEqual(self.plan.counts(), {"polyanet": 2, "soloon": 1, "cometh": 1})
+
+    def test_clusters(self):
+        plan = Plan.from_goal_map(
+            [
+                ["POLYANET", "BLUE_SOLOON", "SPACE"],
+                ["RED_SOLOON", "UP_COMETH", "POLYANET"],
+                ["SOLOON", "SPACE", "SOLOON"],
+            ]
+        )
+        cells = [
+            [(int(plan.rows[i]), int(plan.columns[i])) for i in cluster]
+            for cluster in plan.clusters()
+        ]
+
+        # Smallest clusters first, each polyanet before its soloons
+        self.assertEqual(
+            cells,
+            [
+                [(1, 1)],
+                [(2, 0)],
+                [(1, 2), (2, 2)],
+                [(0, 0), (0, 1), (1, 0)],
+            ],
+        )
+        self.assertEqual(Plan.from_goal_map([["SPACE"]]).clusters(), [])
+
+    def test_from_goal_map_invalid_token(self):
+        with self.assertRaises(ValueError):
+            Plan.from_goal_map([["POLYANET", "GREEN_COMETH"]])
+
+
+class TestCostModel(unittest.TestCase):
+    def test_estimate_latency_bound(self):
+        model = CostModel(latency=0.5, concurrency=2)
+        self.assertEqual(model.estimate(10), 2.5)
+
+    def test_estimate_rate_limit_bound(self):
+        model = CostModel(latency=0.1, rate_limit=2)
+        self.assertEqual(model.estimate(10), 5.0)
+
+    def test_from_metrics(self):
+        model = CostModel.from_metrics(
+            {"operations": 10, "requests": 20, "elapsed": 40.0}
+        )
+        self.assertEqual(model.requests(10), 20)
+        self.assertEqual(model.estimate(10), 40.0)
+
+    def test_from_metrics_scales_with_concurrency(self):
+        summary = {
+            "operations": 10,
+            "requests": 20,
+            "elapsed": 5.0,
+            "latency_mean": 0.5,
+        }
+
+        serial = CostModel.from_metrics(summary, concurrency=1)
+        concurrent = CostModel.from_metrics(summary, concurrency=8)
+
+        self.assertEqual(serial.estimate(10), 10.0)
+        self.assertEqual(concurrent.estimate(10), 1.25)
+
+    def test_from_metrics_without_requests(self):
+        with self.assertRaises(ValueError):
+            CostModel.from_metrics({"operations": 0, "requests": 0, "elapsed": 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
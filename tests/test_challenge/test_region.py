@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from app.challenge.planner import Plan
+from app.challenge.region import Rectangle, Region, boundary_supports
+
+
+class TestRegion(unittest.TestCase):
+    def setUp(self):
+        self.goal_map = [
+            ["SPACE", "POLYANET", "RED_SOLOON", "SPACE"],
+            ["SPACE", "SPACE", "SPACE", "SPACE"],
+            ["RIGHT_COMETH", "SPACE", "POLYANET", "BLUE_SOLOON"],
+        ]
+
+    def test_parse(self):
+        self.assertEqual(Region.parse("10:20,30:40"), Rectangle(10, 20, 30, 40))
+        self.assertEqual(Region.parse("5"), Rectangle(5, 6, None, None))
+        self.assertEqual(Region.parse(",:8"), Rectangle(None, None, None, 8))
+        with self.assertRaises(ValueError):
+            Region.parse("1:2,3:4,5:6")
+        with self.assertRaises(ValueError):
+            Region.parse("a:b")
+
+    def test_clip(self):
+        self.assertEqual(Rectangle(None, 50, 2, None).clip(3, 4), Rectangle(0, 3, 2, 4))
+        self.assertTrue(Rectangle(5, 8, 0, 2).clip(3, 4).empty)
+
+    def test_pieces_skip_cells_of_earlier_rectangles(self):
+        region = Region([(0, 2, 0, 2), (1, 3, 1, 3), (7, 9, 0, 1)])
+
+        pieces = list(region.pieces(3, 4))
+
+        self.assertEqual(
+            [rectangle for rectangle, _ in pieces], [(0, 2, 0, 2), (1, 3, 1, 3)]
+        )
+        self.assertTrue(pieces[0][1].all())
+        self.assertEqual(pieces[1][1].tolist(), [[False, True], [True, True]])
+
+    def test_boundary_supports(self):
+        goal = np.array([[1, 2, 0]])
+        inner = np.array([[False, True, False]])
+
+        needed = boundary_supports(goal, inner, inner.copy())
+        self.assertEqual(needed.tolist(), [[True, False, False]])
+        # A support inside the region is enough
+        needed = boundary_supports(goal, inner, np.array([[True, True, False]]))
+        self.assertFalse(needed.any())
+
+    def test_from_region_plans_supports_outside_the_region(self):
+        plan = Plan.from_region(self.goal_map, Region([(0, 1, 2, 4), (2, 3, 3, 4)]))
+
+        self.assertEqual(
+            sorted(plan.operations()),
+            [
+                (0, 1, "POLYANET"),
+                (0, 2, "RED_SOLOON"),
+                (2, 2, "POLYANET"),
+                (2, 3, "BLUE_SOLOON"),
+            ],
+        )
+
+    def test_from_region_matches_the_whole_map(self):
+        whole = Plan.from_goal_map(self.goal_map)
+        plan = Plan.from_region(self.goal_map, Region([(None, None, None, None)]))
+
+        self.assertEqual(list(plan.operations()), list(whole.operations()))
+        self.assertEqual(
+            [list(cluster) for cluster in plan.clusters()],
+            [list(cluster) for cluster in whole.clusters()],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
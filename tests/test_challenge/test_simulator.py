@@ -0,0 +1,104 @@
+import unittest
+import numpy as np
+from app.challenge.executor import Operation
+from app.challenge.planner import Plan
+from app.challenge.simulator import MegaverseSimulator, adjacent
+
+
+class TestMegaverseSimulator(unittest.TestCase):
+    def test_adjacent(self):
+        mask = np.zeros((3, 3), dtype=bool)
+        mask[1, 1] = True
+        self.assertEqual(
+            adjacent(mask).tolist(),
+            [[False, True, False], [True, False, True], [False, True, False]],
+        )
+
+    def test_apply_goal(self):
+        simulator = MegaverseSimulator(2, 3)
+        violations = simulator.apply_goal(
+            [
+                ["POLYANET", "RED_SOLOON", "SPACE"],
+                ["SPACE", "UP_COMETH", "WHITE_SOLOON"],
+            ]
+        )
+
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].token, "WHITE_SOLOON")
+        self.assertEqual((violations[0].row, violations[0].column), (1, 2))
+        self.assertEqual(simulator.tokens()[1][1], "UP_COMETH")
+
+    def test_apply_goal_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            MegaverseSimulator(1, 1).apply_goal([["SPACE", "SPACE"]])
+
+    def test_apply_plan_places_dependencies_first(self):
+        goal = [["BLUE_SOLOON", "POLYANET"]]
+        simulator = MegaverseSimulator(1, 2)
+
+        self.assertEqual(simulator.apply_plan(Plan.from_goal_map(goal)), [])
+        self.assertEqual(simulator.tokens(), goal)
+
+    def test_apply_phases_checks_each_phase(self):
+        simulator = MegaverseSimulator(2, 2)
+        violations = simulator.apply_phases(
+            [
+                [
+                    Operation("post", "polyanet", 0, 0, None),
+                    Operation("post", "soloon", 0, 1, "red"),
+                    Operation("post", "cometh", 0, 5, "up"),
+                    Operation("post", "cometh", 1, 1, "sideways"),
+                ],
+                [Operation("post", "soloon", 1, 0, "red")],
+            ]
+        )
+
+        self.assertEqual(
+            [(v.step, v.row, v.column, v.rule) for v in violations],
+            [
+                (0, 0, 5, "outside of the megaverse"),
+                (0, 1, 1, "unknown object"),
+                (0, 0, 1, "soloon must be next to polyanet"),
+            ],
+        )
+        self.assertEqual(
+            simulator.tokens(), [["POLYANET", "RED_SOLOON"], ["RED_SOLOON", "SPACE"]]
+        )
+
+    def test_objects_without_attribute(self):
+        simulator = MegaverseSimulator(1, 3)
+        violations = simulator.apply_phases([[Operation("post", "cometh", 0, 0, None)]])
+
+        self.assertEqual(
+            [(v.step, v.row, v.column, v.token, v.rule) for v in violations],
+            [(0, 0, 0, "COMETH", "cometh must have a direction")],
+        )
+
+        plan = Plan.from_goal_map([["POLYANET", "SOLOON", "COMETH"]])
+        violations = MegaverseSimulator(1, 3).apply_plan(plan)
+        self.assertEqual(
+            [(v.step, v.column, v.rule) for v in violations],
+            [
+                (1, 1, "soloon must have a color"),
+                (1, 2, "cometh must have a direction"),
+            ],
+        )
+
+    def test_from_current_and_delete(self):
+        simulator = MegaverseSimulator.from_current(
+            [[{"type": 0}, {"type": 1, "color": "red"}]]
+        )
+        self.assertEqual(simulator.check(), [])
+
+        violations = simulator.apply_phases(
+            [[Operation("delete", "polyanet", 0, 0, None)]]
+        )
+        self.assertEqual(
+            [(v.step, v.row, v.column, v.token) for v in violations],
+            [(0, 0, 1, "RED_SOLOON")],
+        )
+        self.assertEqual(len(simulator.check()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+from app.challenge.challenge_goal import ChallengeGoal
+from app.challenge.executor import ExecutionReport
+from app.challenge.status import StatusServer
+
+
+class TestStatusServer(unittest.TestCase):
+    def setUp(self):
+        self.challenge = ChallengeGoal(rate_limit=5)
+        self.server = StatusServer(self.challenge, interval=60)
+
+    def tearDown(self):
+        self.server.close()
+
+    def get(self, url):
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_sample(self):
+        self.challenge.metrics.record_request(0.2, 201)
+        self.challenge.metrics.record_operation(True)
+
+        snapshot = self.server.sample()
+
+        self.assertEqual(snapshot["operations"], 1)
+        self.assertEqual(snapshot["cells"]["planned"], 0)
+        self.assertEqual(snapshot["in_flight"], 0)
+        self.assertEqual(snapshot["retry_queue"], 0)
+        self.assertEqual(snapshot["rate_limiter"]["rate"], 5)
+        self.assertAlmostEqual(snapshot["latency"]["p50"], 0.2, delta=0.02)
+
+    @patch("app.challenge.challenge_goal.ClassIdentifier")
+    def test_serves_the_last_snapshot(self, mock_class_identifier):
+        self.challenge.goal_map = [
+            ["POLYANET", "SPACE", "POLYANET"],
+            ["SPACE", "POLYANET", "SPACE"],
+        ]
+        self.challenge.executor.rate_limiter = None
+        mock_class_identifier.return_value.get_class_info.return_value = {
+            "polyanet": None
+        }
+        self.server.start()
+        self.challenge.solve_challengue_2()
+
+        # Snapshots are only taken every interval
+        self.assertIsNone(self.get(self.server.url)["cells"]["remaining"])
+        self.server.sample()
+        status = self.get(self.server.url)
+        self.assertEqual(
+            status["cells"],
+            {
+                "total": 3,
+                "planned": 3,
+                "done": 3,
+                "failed": 0,
+                "skipped": 0,
+                "remaining": 0,
+                "solving": False,
+            },
+        )
+        self.assertIsNone(status["rate_limiter"])
+
+    def test_remaining_counts_cells_not_planned_yet(self):
+        self.challenge.total = 1000
+        self.challenge.planned = 64
+        self.challenge.report = ExecutionReport()
+        self.challenge.report.succeeded = 10
+
+        cells = self.server.sample()["cells"]
+
+        self.assertEqual((cells["planned"], cells["remaining"]), (64, 990))
+
+    def test_unknown_path(self):
+        self.server.start()
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(self.server.url.replace("status", "other"))
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import requests
+from unittest.mock import Mock
+from app.astral_objects.polyanet import Polyanet
+from app.challenge.executor import Operation, OperationExecutor
+from app.challenge.trace import TraceWriter, load_trace, trace_frame, RECORD
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "run.trace")
+
+    def test_round_trip(self):
+        trace = TraceWriter(self.path, ["polyanet", "soloon"])
+        trace.record(100.0, "post", "soloon", 3, 4, 200, 1, 0.25, 60)
+        trace.record(101.0, "delete", "polyanet", 70000, 0, None, 2, 0.5, 44)
+        trace.close()
+
+        header, records = load_trace(self.path)
+        self.assertEqual(header["endpoints"], ["polyanet", "soloon"])
+        self.assertEqual(records.dtype.itemsize, RECORD.size)
+        self.assertEqual(records["row"].tolist(), [3, 70000])
+        self.assertEqual(records["status"].tolist(), [200, 0])
+        self.assertEqual(records["attempt"].tolist(), [1, 2])
+
+        frame = trace_frame(self.path)
+        self.assertEqual(list(frame["endpoint"]), ["soloon", "polyanet"])
+        self.assertEqual(list(frame["action"]), ["post", "delete"])
+        self.assertEqual(frame["time"].tolist(), [0.0, 1.0])
+
+    def test_unknown_endpoint(self):
+        trace = TraceWriter(self.path, ["polyanet"])
+        trace.record(100.0, "post", "nebuloon", 0, 0, 200, 1, 0.1, 40)
+        trace.record(100.5, "post", "polyanet", 0, 1, 200, 1, 0.1, 40)
+        trace.close()
+
+        frame = trace_frame(self.path)
+        self.assertEqual(frame["endpoint"].isna().tolist(), [True, False])
+        self.assertEqual(frame["endpoint"][1], "polyanet")
+
+    def test_write_error_is_raised_on_close(self):
+        trace = TraceWriter(self.path, ["polyanet"], flush_interval=0.01)
+        trace.file.close()
+        trace.file = Mock(write=Mock(side_effect=OSError("No space left on device")))
+        with self.assertLogs("app.challenge.trace", level="ERROR"):
+            trace.record(100.0, "post", "polyanet", 0, 0, 200, 1, 0.1, 40)
+            trace.thread.join(5)
+
+        with self.assertRaises(OSError):
+            trace.close()
+        trace.file.close.assert_called_once()
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a trace")
+        with self.assertRaises(ValueError):
+            load_trace(self.path)
+
+    def test_executor_traces_every_attempt(self):
+        rate_limited = requests.exceptions.HTTPError(response=Mock(status_code=429))
+        transport = Mock()
+        transport.send.side_effect = [
+            Mock(status_code=429, raise_for_status=Mock(side_effect=rate_limited)),
+            Mock(status_code=200),
+        ]
+        polyanet = Polyanet(candidate_id="123", transport=transport)
+        trace = TraceWriter(self.path, ["polyanet"])
+        executor = OperationExecutor(lambda name: polyanet, trace=trace)
+        executor.execute(Operation("post", "polyanet", 1, 2, None), max_retries=2)
+        trace.close()
+
+        _, records = load_trace(self.path)
+        self.assertEqual(records["status"].tolist(), [429, 200])
+        self.assertEqual(records["attempt"].tolist(), [1, 2])
+        self.assertEqual(records["column"].tolist(), [2, 2])
+        self.assertEqual(
+            records["bytes"].tolist(), [len(polyanet.template("post").body(1, 2))] * 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
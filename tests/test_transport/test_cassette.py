@@ -0,0 +1,70 @@
+import os
+import json
+import tempfile
+import unittest
+import requests
+from unittest.mock import Mock
+from app.transport.cassette import RecordingTransport, ReplayTransport
+
+
+URL = "http://api/api/polyanets"
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "cassette.jsonl.gz")
+
+    def record(self, exchanges):
+        inner = Mock()
+        inner.request.side_effect = [
+            Mock(status_code=status, text=text) for _, _, status, text in exchanges
+        ]
+        recorder = RecordingTransport(inner, self.path)
+        for method, payload, _, _ in exchanges:
+            recorder.request(method, URL, payload)
+        recorder.close()
+        return recorder
+
+    def test_replays_exchanges_in_order(self):
+        recorder = self.record(
+            [
+                ("post", {"candidateId": "a", "row": 0, "column": 0}, 429, "{}"),
+                ("post", {"candidateId": "a", "row": 0, "column": 0}, 200, "{}"),
+            ]
+        )
+        self.assertEqual(recorder.exchanges, 2)
+
+        replay = ReplayTransport(self.path, latency_scale=0)
+        payload = {"candidateId": "b", "row": 0, "column": 0}
+        first = replay.request("post", URL, payload)
+        self.assertEqual(first.status_code, 429)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            first.raise_for_status()
+        self.assertEqual(replay.request("post", URL, payload).status_code, 200)
+        self.assertEqual(replay.request("post", URL, payload).status_code, 200)
+
+    def test_unrecorded_request_gets_endpoint_exchanges(self):
+        self.record(
+            [
+                ("delete", {"row": 0, "column": 0}, 200, "{}"),
+                ("delete", {"row": 0, "column": 1}, 500, "{}"),
+            ]
+        )
+        replay = ReplayTransport(self.path, latency_scale=0)
+        statuses = [
+            replay.request("delete", URL, {"row": 5, "column": 5}).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [200, 500, 200])
+
+    def test_send_and_response_body(self):
+        self.record([("get", None, 200, '{"goal": [["SPACE"]]}')])
+        replay = ReplayTransport(self.path, latency_scale=0)
+
+        self.assertEqual(replay.request("get", URL).json(), {"goal": [["SPACE"]]})
+        with self.assertRaises(LookupError):
+            replay.send("post", URL, json.dumps({"row": 0}).encode())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import time
+import unittest
+import requests
+from unittest.mock import Mock, patch
+from app.astral_objects.polyanet import Polyanet
+from app.challenge.executor import Operation, OperationExecutor
+from app.challenge.metrics import RunMetrics
+from app.transport.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            "/api/polyanets",
+            window=4,
+            min_requests=4,
+            error_threshold=0.5,
+            cooldown=0.05,
+            probe_interval=0.05,
+        )
+
+    def open_circuit(self):
+        for success in (True, True, False, False):
+            self.breaker.allow()
+            self.breaker.record(success, 0.01)
+
+    def test_opens_on_error_rate(self):
+        self.open_circuit()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()
+
+    def test_stays_closed_below_threshold(self):
+        for success in (True, True, True, False):
+            self.breaker.record(success, 0.01)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_slow_requests_count_as_failures(self):
+        breaker = CircuitBreaker("/api/soloons", min_requests=2, slow_threshold=0.5)
+        breaker.record(True, 1.0)
+        breaker.record(True, 1.0)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_probe_closes_circuit(self):
+        self.open_circuit()
+        time.sleep(0.06)
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()  # Only one probe at a time
+        self.breaker.record(True, 0.01, probe=True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens_circuit(self):
+        self.open_circuit()
+        time.sleep(0.06)
+
+        self.breaker.record(False, 0.01, probe=self.breaker.allow())
+        self.assertEqual(self.breaker.state, OPEN)
+
+
+class TestCircuitBreakerTransport(unittest.TestCase):
+    def setUp(self):
+        self.inner = Mock()
+        self.metrics = RunMetrics()
+
+    def transport(self, park=False):
+        return CircuitBreakerTransport(
+            self.inner,
+            park=park,
+            metrics=self.metrics,
+            window=2,
+            min_requests=2,
+            cooldown=0.05,
+            probe_interval=0.01,
+        )
+
+    def test_fails_fast_while_open(self):
+        self.inner.request.return_value = Mock(status_code=503)
+        transport = self.transport()
+        for _ in range(2):
+            transport.request("post", "http://api/polyanets", {})
+
+        with self.assertRaises(CircuitOpenError):
+            transport.request("post", "http://api/polyanets", {})
+        self.assertEqual(self.inner.request.call_count, 2)
+        self.assertEqual(transport.states(), {"/polyanets": OPEN})
+        self.assertEqual(self.metrics.summary()["events"]["circuit_rejected"], 1)
+        self.assertEqual(self.metrics.summary()["events"]["circuit_open"], 1)
+
+    def test_endpoints_are_independent(self):
+        self.inner.request.return_value = Mock(status_code=503)
+        transport = self.transport()
+        for _ in range(2):
+            transport.request("post", "http://api/polyanets", {})
+        self.inner.request.return_value = Mock(status_code=200)
+
+        transport.request("post", "http://api/soloons", {})
+        self.assertEqual(transport.states()["/soloons"], CLOSED)
+
+    def test_parks_while_open(self):
+        self.inner.request.return_value = Mock(status_code=500)
+        transport = self.transport(park=True)
+        for _ in range(2):
+            transport.request("post", "http://api/polyanets", {})
+        self.inner.request.return_value = Mock(status_code=200)
+
+        started = time.monotonic()
+        response = transport.request("post", "http://api/polyanets", {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+        self.assertEqual(transport.states()["/polyanets"], CLOSED)
+
+    def test_errors_are_recorded(self):
+        self.inner.request.side_effect = ConnectionError("refused")
+        transport = self.transport()
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                transport.request("post", "http://api/polyanets", {})
+        self.assertEqual(transport.states()["/polyanets"], OPEN)
+
+    @patch("app.challenge.executor.time.sleep")
+    def test_rate_limited_burst_is_retried(self, sleep):
+        def response(status):
+            error = requests.exceptions.HTTPError(response=Mock(status_code=status))
+            return Mock(
+                status_code=status,
+                raise_for_status=Mock(side_effect=error if status >= 400 else None),
+            )
+
+        self.inner.send.side_effect = [response(429)] * 3 + [response(200)]
+        polyanet = Polyanet(candidate_id="123", transport=self.transport())
+        executor = OperationExecutor(lambda name: polyanet, metrics=self.metrics)
+
+        report = executor.run([Operation("post", "polyanet", 0, 0, None)])
+
+        self.assertEqual(report.succeeded, 1)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(self.inner.send.call_count, 4)
+        self.assertEqual(self.metrics.summary()["events"].get("circuit_open", 0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import time
+import unittest
+import threading
+from unittest.mock import Mock
+from app.challenge.metrics import LatencyHistogram
+from app.transport.hedging import HedgedTransport
+
+
+class SlowFirstTransport:
+    """A transport whose first write stalls and later writes answer at once."""
+
+    def __init__(self, stall):
+        self.stall = stall
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, payload=None):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.stall)
+            return Mock(status_code=200, name="primary")
+        return Mock(status_code=200, name="hedge")
+
+
+class TestHedgedTransport(unittest.TestCase):
+    def warm_histogram(self, latency=0.01, samples=50):
+        histogram = LatencyHistogram()
+        for _ in range(samples):
+            histogram.record(latency)
+        return histogram
+
+    def test_no_hedging_without_samples(self):
+        inner = SlowFirstTransport(stall=0.2)
+        transport = HedgedTransport(inner, min_samples=20)
+
+        transport.request("post", "http://api/polyanets", {})
+
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(transport.stats()["hedges"], 0)
+
+    def test_hedge_wins_over_stalled_request(self):
+        inner = SlowFirstTransport(stall=1.0)
+        transport = HedgedTransport(inner, budget=1.0, histogram=self.warm_histogram())
+
+        started = time.monotonic()
+        transport.request("post", "http://api/polyanets", {})
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(
+            transport.stats(), {"requests": 1, "hedges": 1, "hedge_wins": 1}
+        )
+
+    def test_budget_caps_hedges(self):
+        inner = SlowFirstTransport(stall=0.1)
+        transport = HedgedTransport(inner, budget=0.0, histogram=self.warm_histogram())
+
+        transport.request("post", "http://api/polyanets", {})
+
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(transport.stats()["hedges"], 0)
+
+    def test_reads_are_not_hedged(self):
+        inner = Mock()
+        transport = HedgedTransport(inner, budget=1.0, histogram=self.warm_histogram())
+
+        transport.request("get", "http://api/map")
+
+        inner.request.assert_called_once_with("get", "http://api/map", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import json
+import time
+import socket
+import unittest
+import threading
+import requests
+from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+from app.transport.lean import LeanTransport
+
+
+class ScriptedServer:
+    """
+    A raw HTTP/1.1 server answering every request with `respond(body)`.
+
+    Each connection serves `per_connection` requests before being closed.
+    """
+
+    def __init__(self, respond, per_connection=None):
+        self.respond = respond
+        self.per_connection = per_connection
+        self.connections = 0
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.sock.getsockname()[1]}/api/polyanets"
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        reader = conn.makefile("rb")
+        served = 0
+        while self.per_connection is None or served < self.per_connection:
+            if not reader.readline():
+                break
+            length = 0
+            while True:
+                line = reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            conn.sendall(self.respond(reader.read(length)))
+            served += 1
+        conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def response(status, body, reason="OK"):
+    return b"HTTP/1.1 %d %s\r\nContent-Length: %d\r\n\r\n%s" % (
+        status,
+        reason.encode(),
+        len(body),
+        body,
+    )
+
+
+class TestLeanTransport(unittest.TestCase):
+    def test_pipelined_responses_match_requests(self):
+        server = ScriptedServer(lambda body: response(200, body))
+        transport = LeanTransport(pipeline=8, max_connections=1)
+
+        def post(row):
+            return transport.request("post", server.url, {"row": row}).json()["row"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            rows = list(pool.map(post, range(200)))
+
+        self.assertEqual(rows, list(range(200)))
+        self.assertEqual(server.connections, 1)
+        transport.close()
+        server.close()
+
+    def test_http_error(self):
+        server = ScriptedServer(lambda body: response(429, b"{}", "Too Many Requests"))
+        transport = LeanTransport()
+        result = transport.send("delete", server.url, b"{}")
+
+        with self.assertRaises(requests.exceptions.HTTPError) as context:
+            result.raise_for_status()
+        self.assertEqual(context.exception.response.status_code, 429)
+        self.assertIn("429 Client Error: Too Many Requests", str(context.exception))
+        transport.close()
+        server.close()
+
+    def test_chunked_response(self):
+        chunked = (
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b'4\r\n{"a"\r\n4\r\n: 1}\r\n0\r\n\r\n'
+        )
+        server = ScriptedServer(lambda body: chunked)
+        transport = LeanTransport()
+
+        self.assertEqual(transport.send("post", server.url, b"{}").json(), {"a": 1})
+        transport.close()
+        server.close()
+
+    def test_resends_when_server_closes_connection(self):
+        server = ScriptedServer(lambda body: response(200, body), per_connection=1)
+        transport = LeanTransport()
+
+        for row in range(3):
+            result = transport.send("post", server.url, json.dumps(row).encode())
+            self.assertEqual(result.json(), row)
+        self.assertEqual(server.connections, 3)
+        transport.close()
+        server.close()
+
+    def test_slow_connect_holds_back_no_other_host(self):
+        slow = ScriptedServer(lambda body: response(200, body))
+        fast = ScriptedServer(lambda body: response(200, body))
+        slow_port = slow.sock.getsockname()[1]
+        connected = threading.Event()
+        create_connection = socket.create_connection
+
+        def connect(address, timeout):
+            if address[1] == slow_port:
+                connected.wait(5)
+            return create_connection(address, timeout=timeout)
+
+        transport = LeanTransport()
+        with patch("app.transport.lean.socket.create_connection", connect):
+            pending = threading.Thread(
+                target=transport.send, args=("post", slow.url, b"{}")
+            )
+            pending.start()
+            started = time.monotonic()
+            result = transport.send("post", fast.url, b"{}")
+            self.assertLess(time.monotonic() - started, 1.0)
+            connected.set()
+            pending.join()
+
+        self.assertEqual(result.status_code, 200)
+        transport.close()
+        slow.close()
+        fast.close()
+
+    def test_resends_when_connect_fails(self):
+        server = ScriptedServer(lambda body: response(200, body))
+        transport = LeanTransport()
+        create_connection = socket.create_connection
+
+        def refuse_first(address, timeout):
+            if connect.call_count == 1:
+                raise ConnectionRefusedError("refused")
+            return create_connection(address, timeout=timeout)
+
+        connect = Mock(side_effect=refuse_first)
+
+        with patch("app.transport.lean.socket.create_connection", connect):
+            result = transport.send("post", server.url, b"{}")
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(connect.call_count, 2)
+        transport.close()
+        server.close()
+
+    def test_partition_keeps_one_pool_per_endpoint(self):
+        server = ScriptedServer(lambda body: response(200, body))
+        soloons = server.url.replace("polyanets", "soloons")
+        transport = LeanTransport(max_connections=1, partition=True)
+
+        transport.send("post", server.url, b"{}")
+        transport.send("post", soloons, b"{}")
+
+        self.assertEqual(len(transport.connections), 2)
+        self.assertEqual(server.connections, 2)
+        transport.close()
+        server.close()
+
+    def test_reads_go_through_fallback(self):
+        fallback = Mock()
+        transport = LeanTransport(fallback=fallback)
+        transport.request("get", "http://api/map")
+
+        fallback.request.assert_called_once_with("get", "http://api/map", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import json
+import unittest
+from unittest.mock import patch, Mock
+from app.transport.transport import Transport, RequestsTransport, api_url
+
+
+class TestTransport(unittest.TestCase):
+    def test_api_url_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(
+                api_url("polyanets"), "https://challenge.crossmint.io/api/polyanets"
+            )
+
+    def test_api_url_override(self):
+        with patch.dict(
+            os.environ, {"CROSSMINT_API_URL": "http://localhost:8000/api/"}
+        ):
+            self.assertEqual(api_url("soloons"), "http://localhost:8000/api/soloons")
+
+    @patch("app.transport.transport.requests.post")
+    def test_requests_transport_json(self, mock_post):
+        mock_post.return_value = Mock(status_code=200)
+        response = RequestsTransport().request("post", "http://api/x", {"row": 1})
+
+        self.assertIs(response, mock_post.return_value)
+        mock_post.assert_called_once_with(
+            "http://api/x",
+            json={"row": 1},
+            headers={"Content-Type": "application/json"},
+        )
+
+    @patch("app.transport.transport.requests.get")
+    def test_requests_transport_without_payload(self, mock_get):
+        RequestsTransport().request("get", "http://api/map")
+        mock_get.assert_called_once_with("http://api/map")
+
+    @patch("app.transport.transport.requests.get")
+    @patch("app.transport.transport.requests.post")
+    def test_requests_transport_write_timeout(self, mock_post, mock_get):
+        transport = RequestsTransport(write_timeout=2.0)
+        transport.request("post", "http://api/x", {"row": 1})
+        transport.send("post", "http://api/x", b'{"row": 1}')
+        transport.request("get", "http://api/map")
+
+        self.assertEqual(
+            [c.kwargs["timeout"] for c in mock_post.call_args_list], [2.0, 2.0]
+        )
+        mock_get.assert_called_once_with("http://api/map")
+
+    @patch("app.transport.transport.requests.delete")
+    def test_requests_transport_send_encoded(self, mock_delete):
+        RequestsTransport().send("delete", "http://api/x", b'{"row": 1}')
+        mock_delete.assert_called_once_with(
+            "http://api/x",
+            data=b'{"row": 1}',
+            headers={"Content-Type": "application/json"},
+        )
+
+    def test_default_send_decodes_body(self):
+        class Recording(Transport):
+            def request(self, method, url, payload=None):
+                return (method, url, payload)
+
+        self.assertEqual(
+            Recording().send("post", "http://api/x", json.dumps({"row": 1}).encode()),
+            ("post", "http://api/x", {"row": 1}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()